@@ -1,4 +1,7 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.utils import timezone
+
+from . import export, search
 from .models import UserProfile, ScreeningSubmission
 
 
@@ -17,8 +20,55 @@ class ScreeningSubmissionAdmin(admin.ModelAdmin):
 		"created_at",
 		"result",
 		"confidence",
+		"model_version",
+		"outcome",
+	)
+	# Pencarian lewat index (screening/search.py): nama pasien, kabupaten/kota, user
+	search_fields = ("patient_name", "district_city", "user__username")
+	search_help_text = "Cari nama pasien, kabupaten/kota atau username/email pengirim"
+	list_filter = ("is_preeclampsia", "model_version", "outcome", "created_at")
+	# COUNT(*) seluruh tabel di setiap halaman changelist mahal untuk jutaan baris
+	show_full_result_count = False
+	readonly_fields = ("created_at", "outcome_recorded_at")
+	actions = (
+		"mark_outcome_preeklampsia",
+		"mark_outcome_non_preeklampsia",
+		"export_csv",
+		"export_parquet",
 	)
-	search_fields = ("patient_name", "user__username", "result")
-	list_filter = ("result", "created_at")
-	readonly_fields = ("created_at",)
 
+	def get_search_results(self, request, queryset, search_term):
+		return search.search_submissions(queryset, search_term), False
+
+	def save_model(self, request, obj, form, change):
+		# outcome_recorded_at adalah watermark `manage.py retrain`
+		if "outcome" in form.changed_data:
+			obj.outcome_recorded_at = timezone.now() if obj.outcome else None
+		super().save_model(request, obj, form, change)
+
+	def _mark_outcome(self, request, queryset, outcome):
+		updated = queryset.update(outcome=outcome, outcome_recorded_at=timezone.now())
+		self.message_user(request, f"Outcome {outcome} dicatat untuk {updated} submission")
+
+	@admin.action(description="Catat outcome: Preeklampsia")
+	def mark_outcome_preeklampsia(self, request, queryset):
+		self._mark_outcome(request, queryset, "Preeklampsia")
+
+	@admin.action(description="Catat outcome: NonPreeklampsia")
+	def mark_outcome_non_preeklampsia(self, request, queryset):
+		self._mark_outcome(request, queryset, "NonPreeklampsia")
+
+	def _export(self, request, queryset, fmt):
+		# Streaming per chunk; "pilih semua" di admin = seluruh hasil filter
+		try:
+			return export.streaming_response(queryset.order_by("id"), fmt)
+		except ImportError:
+			self.message_user(request, "Export parquet butuh pyarrow (pip install pyarrow)", level=messages.ERROR)
+
+	@admin.action(description="Export CSV (format ALL_FINAL.csv)")
+	def export_csv(self, request, queryset):
+		return self._export(request, queryset, "csv")
+
+	@admin.action(description="Export Parquet (analitik)")
+	def export_parquet(self, request, queryset):
+		return self._export(request, queryset, "parquet")
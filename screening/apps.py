@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ScreeningConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'screening'
+
+    def ready(self):
+        # Rollup statistik dashboard (lihat stats.py)
+        from . import stats
+
+        stats.connect()
@@ -0,0 +1,197 @@
+"""
+Micro-batching untuk inferensi RandomForest.
+
+Saat banyak tenaga kesehatan submit bersamaan, setiap request biasanya
+menjalankan prediksi satu baris sendiri-sendiri. `MicroBatcher` menampung
+vector fitur dari banyak request, lalu sebuah worker thread mengumpulkan
+semua yang datang dalam jendela waktu singkat (atau sampai ukuran batch
+maksimum) dan menjalankan satu `predict_with_proba` vectorized untuk
+seluruh batch. Setiap pemanggil menerima hasilnya lewat `Future`.
+
+Metrik ukuran batch dan waktu tunggu antrean tersedia lewat `stats()`
+supaya jendela waktunya bisa di-tuning.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Dispatcher batching in-process.
+
+    predict_fn: callable(X 2D) -> (labels, proba), misalnya
+        `CompiledForest.predict_with_proba`.
+    window_ms: berapa lama worker menunggu request lain setelah request
+        pertama dalam batch masuk.
+    max_batch_size: batch langsung dijalankan jika sudah sebesar ini.
+    """
+
+    def __init__(self, predict_fn, window_ms=2.0, max_batch_size=32, name="rf"):
+        self.predict_fn = predict_fn
+        self.window = max(float(window_ms), 0.0) / 1000.0
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+        # Metrik
+        self._batches = 0
+        self._rows = 0
+        self._errors = 0
+        self._max_batch = 0
+        self._batch_sizes = {}  # ukuran batch (dibulatkan ke pangkat 2) -> jumlah batch
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits = deque(maxlen=1024)
+
+    # ==============
+    # API
+    # ==============
+
+    def submit(self, x):
+        """
+        Masukkan satu vector fitur ke antrean.
+        Return: Future yang berisi (label, proba_row).
+        """
+        future = Future()
+        x = np.asarray(x, dtype=np.float64).ravel()
+        with self._lock:
+            if not self._closed:
+                self._ensure_worker().put((x, time.monotonic(), future))
+                return future
+
+        # Batcher sudah ditutup (mis. model lama setelah hot-swap): hitung langsung
+        self._dispatch([(x, time.monotonic(), future)])
+        return future
+
+    def predict(self, x, timeout=None):
+        """Versi blocking dari `submit`: return (label, proba_row)."""
+        return self.submit(x).result(timeout=timeout)
+
+    def close(self):
+        """
+        Hentikan worker setelah semua item yang sudah masuk antrean selesai.
+        Panggilan `submit` berikutnya dihitung langsung tanpa batching.
+        """
+        with self._lock:
+            self._closed = True
+            if self._queue is not None:
+                self._queue.put(None)
+
+    def stats(self):
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            batches = self._batches
+            return {
+                "name": self.name,
+                "window_ms": self.window * 1000.0,
+                "max_batch_size": self.max_batch_size,
+                "batches": batches,
+                "rows": self._rows,
+                "errors": self._errors,
+                "mean_batch_size": (self._rows / batches) if batches else 0.0,
+                "max_observed_batch_size": self._max_batch,
+                "batch_size_histogram": {
+                    f"<={k}": v for k, v in sorted(self._batch_sizes.items())
+                },
+                "queue_wait_ms": {
+                    "mean": (self._wait_total / self._rows * 1000.0) if self._rows else 0.0,
+                    "max": self._wait_max * 1000.0,
+                    "p50": _percentile(waits, 0.50) * 1000.0,
+                    "p95": _percentile(waits, 0.95) * 1000.0,
+                },
+                "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            }
+
+    # ==============
+    # WORKER
+    # ==============
+
+    def _ensure_worker(self):
+        # Dipanggil dengan self._lock dipegang. Worker thread tidak ikut
+        # ter-fork (mis. gunicorn --preload), jadi buat ulang jika PID berubah.
+        pid = os.getpid()
+        if self._thread is None or self._pid != pid or not self._thread.is_alive():
+            self._queue = queue.Queue()
+            self._pid = pid
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._queue,),
+                name=f"micro-batcher-{self.name}",
+                daemon=True,
+            )
+            self._thread.start()
+        return self._queue
+
+    def _run(self, q):
+        while True:
+            first = q.get()
+            if first is None:
+                return
+            batch = [first]
+            stop = False
+            deadline = first[1] + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = q.get(timeout=remaining) if remaining > 0 else q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch):
+        started = time.monotonic()
+        futures = [f for _, _, f in batch]
+        try:
+            X = np.vstack([x for x, _, _ in batch])
+            labels, proba = self.predict_fn(X)
+        except Exception as e:
+            logger.exception("Micro-batch inference failed (%d rows)", len(batch))
+            with self._lock:
+                self._errors += 1
+            for f in futures:
+                f.set_exception(e)
+            return
+
+        self._record(len(batch), [started - t for _, t, _ in batch])
+        for i, f in enumerate(futures):
+            f.set_result((labels[i], proba[i]))
+
+    def _record(self, size, waits):
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        with self._lock:
+            self._batches += 1
+            self._rows += size
+            self._max_batch = max(self._max_batch, size)
+            self._batch_sizes[bucket] = self._batch_sizes.get(bucket, 0) + 1
+            self._wait_total += sum(waits)
+            self._wait_max = max(self._wait_max, max(waits))
+            self._recent_waits.extend(waits)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[idx]
@@ -0,0 +1,28 @@
+"""
+Benchmark untuk aplikasi screening.
+
+Setiap suite adalah fungsi `run(options)` (atau "modul:fungsi") di package
+ini yang mengembalikan dict hasil (siap di-dump ke JSON). Jalankan lewat:
+
+    python manage.py benchmark [suite ...] [--output hasil.json] [--compare baseline.json]
+"""
+import importlib
+
+SUITES = {
+    "n_jobs": "screening.benchmarks.n_jobs",
+    "memory": "screening.benchmarks.memory",
+    "startup": "screening.benchmarks.startup",
+    "asgi": "screening.benchmarks.asgi",
+    "inference": "screening.benchmarks.inference",
+    "submit": "screening.benchmarks.webapp:run_submit",
+    "pages": "screening.benchmarks.webapp:run_pages",
+    "pdf": "screening.benchmarks.webapp:run_pdf",
+}
+
+
+def run_suite(name, options):
+    if name not in SUITES:
+        raise ValueError(f"Suite benchmark tidak dikenal: {name}")
+    module_name, _, func = SUITES[name].partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, func or "run")(options)
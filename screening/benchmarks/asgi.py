@@ -0,0 +1,130 @@
+"""
+Benchmark throughput request bersamaan: WSGI (view sync) vs ASGI (view async).
+
+Setiap mode dijalankan di proses terpisah dengan database SQLite sementara:
+
+- wsgi: view sync, dilayani pool `workers` thread (seperti gunicorn gthread);
+- asgi: view async (SCREENING_ASYNC_VIEWS=1) di satu event loop, dengan
+  `concurrency` request aktif sekaligus.
+
+Campuran request: submit form, download laporan, dan dashboard. Request
+dijalankan in-process lewat test client Django (tanpa socket), jadi yang
+diukur adalah handler + middleware + view, bukan server HTTP-nya.
+"""
+import json
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_SCRIPT = r"""
+import asyncio, json, os, sys, tempfile, time
+mode, n_requests, concurrency, workers = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
+os.environ["SCREENING_ASYNC_VIEWS"] = "1" if mode == "asgi" else "0"
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "website.settings")
+import django
+from django.conf import settings
+tmp = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False)
+django.setup()
+settings.DATABASES["default"]["NAME"] = tmp.name
+settings.ALLOWED_HOSTS = ["*"]
+from django.core.management import call_command
+call_command("migrate", verbosity=0)
+from screening import dataset, predictor
+from screening.benchmarks.common import summarize
+model = predictor.get_model()
+predictor.warm_up(model)
+
+payload = {
+    "patient_name": "Benchmark", "patient_age": "30", "district_city": "Bojonegoro",
+    "education_level": "SMA", "marital_status": "Sah", "marriage_order": "1",
+    "parity": "Primipara", "systolic_bp": "120", "diastolic_bp": "80",
+    "map_mmhg": "93.3", "hemoglobin": "11.5",
+}
+from screening.models import ScreeningSubmission
+seed = ScreeningSubmission.objects.create(patient_name="Seed", patient_age=30, **dataset.result_fields(False, 90.0))
+
+def plan(i):
+    kind = ("submit", "download", "dashboard")[i % 3]
+    if kind == "submit":
+        return kind, "post", "/submit/", dict(payload, patient_age=str(20 + i % 20))
+    if kind == "download":
+        return kind, "get", "/download/", {"submission_id": seed.id}
+    return kind, "get", "/dashboard/", {}
+
+latencies = {"submit": [], "download": [], "dashboard": []}
+errors = 0
+
+if mode == "wsgi":
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from django.test import Client
+    local = threading.local()
+
+    def one(i):
+        client = getattr(local, "client", None) or Client()
+        local.client = client
+        kind, method, url, data = plan(i)
+        t0 = time.perf_counter()
+        status = getattr(client, method)(url, data).status_code
+        return kind, (time.perf_counter() - t0) * 1000.0, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(one, range(n_requests)))
+    wall = time.perf_counter() - started
+else:
+    from django.test import AsyncClient
+
+    async def main():
+        sem = asyncio.Semaphore(concurrency)
+        client = AsyncClient()
+
+        async def one(i):
+            async with sem:
+                kind, method, url, data = plan(i)
+                t0 = time.perf_counter()
+                response = await getattr(client, method)(url, data)
+                return kind, (time.perf_counter() - t0) * 1000.0, response.status_code
+
+        return await asyncio.gather(*(one(i) for i in range(n_requests)))
+
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    wall = time.perf_counter() - started
+
+for kind, ms, status in results:
+    latencies[kind].append(ms)
+    errors += status >= 400
+os.unlink(tmp.name)
+print(json.dumps({
+    "mode": mode,
+    "requests": n_requests,
+    "concurrency": concurrency if mode == "asgi" else workers,
+    "wall_s": wall,
+    "requests_per_s": n_requests / wall,
+    "errors": errors,
+    "latency": {k: summarize(v) for k, v in latencies.items()},
+}))
+"""
+
+
+def _run_mode(mode, n_requests, concurrency, workers):
+    proc = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, mode, str(n_requests), str(concurrency), str(workers)],
+        cwd=BASE_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(options):
+    workers = int(options.get("workers") or 4)
+    n_requests = max(int(options.get("repeat") or 50) * 6, 60)
+    results = {"wsgi": _run_mode("wsgi", n_requests, workers, workers)}
+    for concurrency in (workers, workers * 8):
+        results[f"asgi_c{concurrency}"] = _run_mode("asgi", n_requests, concurrency, workers)
+    return results
@@ -0,0 +1,70 @@
+"""Helper bersama untuk suite benchmark."""
+import csv
+import os
+import statistics
+import time
+
+ML_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ml_models")
+MODEL_PATH = os.path.join(ML_DIR, "rf_preeclampsia.joblib")
+CSV_PATH = os.path.join(ML_DIR, "ALL_FINAL.csv")
+
+
+def load_pipeline(path=MODEL_PATH):
+    import joblib
+
+    return joblib.load(path)
+
+
+def load_csv_rows(path=CSV_PATH, numeric_columns=()):
+    """
+    Baca ALL_FINAL.csv sebagai list of dict dengan header yang sudah di-strip
+    (mis. "Perokok " -> "Perokok"). Kolom di `numeric_columns` diubah ke float.
+    """
+    numeric_columns = set(numeric_columns)
+    rows = []
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh, delimiter=";")
+        header = [h.strip() for h in next(reader)]
+        for raw in reader:
+            if not raw:
+                continue
+            row = {}
+            for col, val in zip(header, raw):
+                val = val.strip()
+                if col in numeric_columns:
+                    row[col] = float(val) if val != "" else None
+                else:
+                    row[col] = val or None
+            rows.append(row)
+    return rows
+
+
+def time_call(fn, repeat=100, warmup=3):
+    """Jalankan fn berulang kali, return statistik latency dalam milidetik."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return summarize(samples)
+
+
+def summarize(samples_ms):
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"n": 0}
+
+    def pct(q):
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "min_ms": ordered[0],
+        "max_ms": ordered[-1],
+    }
@@ -0,0 +1,45 @@
+"""
+Benchmark latency inferensi untuk beberapa ukuran batch, memakai baris
+ALL_FINAL.csv terhadap rf_preeclampsia.joblib.
+
+- sklearn: jalur lama (DataFrame -> Pipeline.predict + predict_proba)
+- compiled: FeatureEncoder.transform_rows + CompiledForest.predict_with_proba
+  (jalur yang dipakai aplikasi), diukur dari dict baris mentah
+"""
+from .common import load_csv_rows, load_pipeline, time_call
+
+BATCH_SIZES = (1, 8, 32, 128, 700)
+
+
+def run(options):
+    import pandas as pd
+
+    from screening.inference import CompiledForest, FeatureEncoder, prepare_for_inference
+
+    repeat = int(options.get("repeat") or 50)
+    pipeline = prepare_for_inference(load_pipeline())
+    encoder = FeatureEncoder.from_estimator(pipeline)
+    engine = CompiledForest.from_estimator(pipeline)
+    rows = load_csv_rows(numeric_columns=[c for c, _, _ in encoder.numeric])
+    columns = encoder.columns
+
+    results = {"n_trees": engine.n_estimators, "node_count": engine.node_count, "batches": {}}
+    for size in BATCH_SIZES:
+        batch = [rows[i % len(rows)] for i in range(size)]
+        n = max(repeat // max(size // 32, 1), 3)
+
+        def sklearn_path():
+            X = pd.DataFrame(batch, columns=columns)
+            pipeline.predict(X)
+            pipeline.predict_proba(X)
+
+        def compiled_path():
+            engine.predict_with_proba(encoder.transform_rows(batch))
+
+        X_encoded = encoder.transform_rows(batch)
+        results["batches"][str(size)] = {
+            "sklearn": time_call(sklearn_path, repeat=n),
+            "compiled": time_call(compiled_path, repeat=n),
+            "compiled_engine_only": time_call(lambda: engine.predict_with_proba(X_encoded), repeat=n),
+        }
+    return results
@@ -0,0 +1,88 @@
+"""
+Benchmark memori: RSS / PSS per worker saat model di-load dengan joblib
+(setiap worker punya salinan pipeline sendiri) vs bundle mmap (array
+forest dibagi lewat page cache).
+
+PSS (proportional set size) membagi page yang di-share secara adil di antara
+proses yang memakainya, jadi jumlah PSS semua worker = memori host yang
+sebenarnya terpakai. Hanya tersedia di Linux (/proc/self/smaps_rollup).
+"""
+import multiprocessing
+import os
+
+from .common import MODEL_PATH
+
+
+def _memory_kib():
+    usage = {}
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as fh:
+            for line in fh:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss", "Shared_Clean", "Private_Dirty"):
+                    usage[key.lower()] = int(rest.split()[0])
+    except OSError:
+        import resource
+
+        usage["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage
+
+
+def _worker(mode, barrier, queue):
+    import numpy as np
+
+    baseline = _memory_kib()
+    if mode == "joblib":
+        import joblib
+
+        from screening.inference import CompiledForest, FeatureEncoder
+
+        model = joblib.load(MODEL_PATH)
+        encoder = FeatureEncoder.from_estimator(model)
+        engine = CompiledForest.from_estimator(model)
+    else:
+        from screening.model_bundle import bundle_path_for, load_bundle
+
+        encoder, engine, _ = load_bundle(bundle_path_for(MODEL_PATH), mmap=True)
+
+    # sentuh semua page model lewat prediksi sungguhan
+    engine.predict_proba(np.random.default_rng(0).normal(size=(256, encoder.n_features_out)))
+
+    # ukur setelah semua worker selesai load, supaya page yang di-share terhitung
+    barrier.wait()
+    loaded = _memory_kib()
+    barrier.wait()
+    queue.put({"baseline": baseline, "loaded": loaded})
+
+
+def _run_mode(mode, n_workers):
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(n_workers)
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(mode, barrier, queue)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    samples = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    def total(key, stage="loaded"):
+        return sum(s[stage].get(key, 0) for s in samples)
+
+    return {
+        "workers": n_workers,
+        "rss_mib_per_worker": total("rss") / n_workers / 1024.0,
+        "pss_mib_total": total("pss") / 1024.0,
+        "pss_mib_model_total": (total("pss") - total("pss", "baseline")) / 1024.0,
+        "rss_mib_model_per_worker": (total("rss") - total("rss", "baseline")) / n_workers / 1024.0,
+    }
+
+
+def run(options):
+    from screening.model_bundle import build_bundle, bundle_path_for
+
+    n_workers = int(options.get("workers") or 4)
+    if not os.path.isdir(bundle_path_for(MODEL_PATH)):
+        build_bundle(MODEL_PATH)
+
+    return {mode: _run_mode(mode, n_workers) for mode in ("joblib", "mmap_bundle")}
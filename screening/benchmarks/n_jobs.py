@@ -0,0 +1,113 @@
+"""
+Benchmark kebijakan n_jobs untuk inferensi RandomForest.
+
+Membandingkan:
+- prediksi satu baris lewat sklearn dengan n_jobs=-1 (setting artefak
+  training) vs serial (kebijakan ThreadBudget)
+- prediksi batch (seluruh ALL_FINAL.csv) dengan beberapa nilai n_jobs
+- beberapa proses "worker" yang melakukan prediksi satu baris bersamaan,
+  untuk melihat efek oversubscription CPU seperti di gunicorn
+"""
+import multiprocessing
+import os
+import time
+
+from .common import load_csv_rows, load_pipeline, summarize, time_call
+
+
+def _encoded_rows():
+    from screening.inference import FeatureEncoder
+
+    pipeline = load_pipeline()
+    encoder = FeatureEncoder.from_estimator(pipeline)
+    rows = load_csv_rows(numeric_columns=[c for c, _, _ in encoder.numeric])
+    return pipeline, encoder.transform_rows(rows)
+
+
+def _worker(n_jobs, repeat, start_event, queue):
+    pipeline, X = _encoded_rows()
+    forest = pipeline.steps[-1][1]
+    forest.n_jobs = n_jobs
+    forest.predict_proba(X[:1])
+    start_event.wait()
+    samples = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        forest.predict_proba(X[i % len(X)][None, :])
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    queue.put(samples)
+
+
+def _concurrent_workers(n_workers, n_jobs, repeat):
+    ctx = multiprocessing.get_context("spawn")
+    start_event = ctx.Event()
+    queue = ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(n_jobs, repeat, start_event, queue))
+        for _ in range(n_workers)
+    ]
+    for p in procs:
+        p.start()
+    # beri waktu semua worker selesai load model sebelum start bersamaan
+    time.sleep(max(2.0, 0.5 * n_workers))
+    t0 = time.perf_counter()
+    start_event.set()
+    samples = []
+    for _ in procs:
+        samples.extend(queue.get())
+    wall = time.perf_counter() - t0
+    for p in procs:
+        p.join()
+    result = summarize(samples)
+    result["wall_s"] = wall
+    result["throughput_rps"] = len(samples) / wall if wall else 0.0
+    return result
+
+
+def run(options):
+    from screening.inference import CompiledForest, ThreadBudget
+
+    repeat = int(options.get("repeat") or 50)
+    n_workers = int(options.get("workers") or 4)
+    cpu_count = os.cpu_count() or 1
+
+    pipeline, X = _encoded_rows()
+    forest = pipeline.steps[-1][1]
+    engine = CompiledForest.from_estimator(pipeline)
+    budget = ThreadBudget(workers=1)
+    row = X[:1]
+
+    results = {
+        "cpu_count": cpu_count,
+        "n_trees": len(forest.estimators_),
+        "batch_rows": len(X),
+        "single_row": {},
+        "batch": {},
+        "concurrent_workers": {"workers": n_workers},
+    }
+
+    for label, n_jobs in (("sklearn_n_jobs_-1", -1), ("sklearn_serial", None)):
+        forest.n_jobs = n_jobs
+        results["single_row"][label] = time_call(lambda: forest.predict_proba(row), repeat=repeat)
+    results["single_row"]["compiled"] = time_call(lambda: engine.predict_proba(row), repeat=repeat)
+
+    batch_repeat = max(repeat // 5, 3)
+    for n_jobs in sorted({1, 2, cpu_count}):
+        forest.n_jobs = n_jobs
+        results["batch"][f"sklearn_n_jobs_{n_jobs}"] = time_call(
+            lambda: forest.predict_proba(X), repeat=batch_repeat
+        )
+    policy_jobs = budget.n_jobs_for(len(X))
+    forest.n_jobs = None
+    with budget.sklearn_context(len(X)):
+        results["batch"][f"sklearn_policy_{policy_jobs}"] = time_call(
+            lambda: forest.predict_proba(X), repeat=batch_repeat
+        )
+    results["batch"][f"compiled_policy_{policy_jobs}"] = time_call(
+        lambda: engine.predict_proba(X, n_jobs=policy_jobs), repeat=batch_repeat
+    )
+
+    for label, n_jobs in (("sklearn_n_jobs_-1", -1), ("sklearn_serial", None)):
+        results["concurrent_workers"][label] = _concurrent_workers(n_workers, n_jobs, repeat)
+
+    return results
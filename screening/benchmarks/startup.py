@@ -0,0 +1,93 @@
+"""
+Benchmark waktu startup.
+
+- `manage.py check`: proses manajemen biasa, tidak boleh ikut me-load model
+- request pertama ke /submit/ pada proses baru, dalam dua skenario:
+  * cold  : tanpa warm-up, model di-load oleh request pertama
+  * warm  : warm-up background (seperti wsgi.py) ditunggu sampai siap dulu
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+from .common import summarize
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Dijalankan di proses terpisah supaya benar-benar mulai dari nol
+_FIRST_REQUEST_SCRIPT = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "website.settings")
+import django
+django.setup()
+from django.test.utils import setup_test_environment
+from django.db import connection
+setup_test_environment()
+connection.creation.create_test_db(verbosity=0)
+from screening import predictor
+startup_s = time.perf_counter() - t0
+ready_s = None
+if sys.argv[1] == "warm":
+    predictor.start_background_warmup()
+    predictor._state.ready.wait(120)
+    ready_s = time.perf_counter() - t0
+from django.test import Client
+client = Client()
+payload = {
+    "patient_name": "Benchmark", "patient_age": "30", "district_city": "Bojonegoro",
+    "education_level": "SMA", "marital_status": "Sah", "marriage_order": "1",
+    "parity": "Primipara", "systolic_bp": "120", "diastolic_bp": "80",
+    "map_mmhg": "93.3", "hemoglobin": "11.5",
+}
+t1 = time.perf_counter()
+response = client.post("/submit/", payload)
+first_ms = (time.perf_counter() - t1) * 1000.0
+t2 = time.perf_counter()
+client.post("/submit/", payload)
+second_ms = (time.perf_counter() - t2) * 1000.0
+print(json.dumps({
+    "status": response.status_code,
+    "startup_s": startup_s,
+    "ready_s": ready_s,
+    "first_request_ms": first_ms,
+    "second_request_ms": second_ms,
+    "readiness": predictor.readiness(),
+}))
+"""
+
+
+def _time_check(repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "manage.py", "check"],
+            cwd=BASE_DIR,
+            check=True,
+            capture_output=True,
+        )
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return summarize(samples)
+
+
+def _first_request(mode):
+    proc = subprocess.run(
+        [sys.executable, "-c", _FIRST_REQUEST_SCRIPT, mode],
+        cwd=BASE_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(options):
+    repeat = max(int(options.get("repeat") or 5) // 10, 3)
+    return {
+        "manage_py_check": _time_check(repeat),
+        "first_request_cold": _first_request("cold"),
+        "first_request_warm": _first_request("warm"),
+    }
@@ -0,0 +1,267 @@
+"""
+Benchmark end-to-end lewat Django test client:
+
+- submit: POST /submit/ (form -> prediksi -> simpan -> render result.html),
+  plus rata-rata per tahap dari histogram metrics.py
+- pages: /dashboard/, /my-submissions/ dan halaman pertama / tengah
+  /api/v1/submissions (keyset pagination) pada beberapa jumlah submission
+  (default 10k, 100k, 1M)
+- pdf: GET /download/ (laporan PDF, atau HTML jika xhtml2pdf tidak ada)
+
+Setiap suite berjalan di proses terpisah dengan database SQLite sementara,
+jadi tidak menyentuh db.sqlite3 dan hasilnya bisa diulang.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+FORM_PAYLOAD = {
+    "patient_name": "Benchmark", "patient_age": "30", "district_city": "Bojonegoro",
+    "education_level": "SMA", "current_occupation": "IRT", "marital_status": "Sah",
+    "marriage_order": "1", "parity": "Primipara", "smoker": "0", "planned_pregnancy": "1",
+    "pre_pregnancy_weight": "55", "height_cm": "155", "bmi": "22.9", "lila_cm": "25",
+    "systolic_bp": "120", "diastolic_bp": "80", "map_mmhg": "93.3", "hemoglobin": "11.5",
+}
+
+
+# ==============
+# PROSES INDUK
+# ==============
+
+def _in_child(name, options):
+    proc = subprocess.run(
+        [sys.executable, "-m", "screening.benchmarks.webapp", name, json.dumps(options)],
+        cwd=BASE_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _options(options):
+    sizes = options.get("sizes") or DEFAULT_SIZES
+    return {"repeat": int(options.get("repeat") or 50), "sizes": [int(s) for s in sizes]}
+
+
+def run_submit(options):
+    return _in_child("submit", _options(options))
+
+
+def run_pages(options):
+    return _in_child("pages", _options(options))
+
+
+def run_pdf(options):
+    return _in_child("pdf", _options(options))
+
+
+# ==============
+# PROSES ANAK
+# ==============
+
+def _setup():
+    import tempfile
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "website.settings")
+    import django
+    from django.conf import settings
+
+    django.setup()
+    tmp = tempfile.NamedTemporaryFile(prefix="screening-bench-", suffix=".sqlite3", delete=False)
+    settings.DATABASES["default"]["NAME"] = tmp.name
+    settings.ALLOWED_HOSTS = ["*"]
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+    from screening import predictor
+
+    predictor.warm_up(predictor.get_model())
+    return tmp.name
+
+
+def _bench_user():
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    user, _ = User.objects.get_or_create(username="bench@example.com", defaults={"email": "bench@example.com"})
+    return user
+
+
+def _seed(target, user):
+    """
+    Tambah submission sampai jumlahnya `target`, lewat executemany mentah
+    (bulk_create di SQLite terlalu lambat untuk 1M baris). Nilai diambil
+    dari baris ALL_FINAL.csv secara bergiliran.
+    """
+    import datetime
+
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    from screening import dataset, stats
+    from screening.benchmarks.common import CSV_PATH
+    from screening.models import ScreeningSubmission
+
+    existing = ScreeningSubmission.objects.count()
+    if existing >= target:
+        return 0
+
+    fields = [f for f in ScreeningSubmission._meta.concrete_fields if not f.primary_key]
+    created_field = ScreeningSubmission._meta.get_field("created_at")
+    templates = []
+    with open(CSV_PATH, newline="", encoding="utf-8") as fh:
+        for chunk in dataset.iter_csv_chunks(fh, chunk_size=1000):
+            for line, record in chunk:
+                data = dataset.submission_fields(record)
+                is_pree = dataset.normalize_label(record.get(dataset.LABEL_COLUMN)) == "Preeklampsia"
+                data.update(dataset.result_fields(is_pree, 90.0))
+                data.update(patient_name=f"Pasien {line}", user_id=user.pk, model_version="bench")
+                obj = ScreeningSubmission(**data)
+                templates.append([
+                    None if f is created_field else f.get_db_prep_save(getattr(obj, f.attname), connection)
+                    for f in fields
+                ])
+
+    table = ScreeningSubmission._meta.db_table
+    columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+    sql = f"INSERT INTO {table} ({columns}) VALUES ({', '.join(['%s'] * len(fields))})"
+    created_idx = fields.index(created_field)
+    start = timezone.now() - datetime.timedelta(days=365)
+
+    with connection.cursor() as cursor:
+        for offset in range(existing, target, 10_000):
+            params = []
+            for i in range(offset, min(offset + 10_000, target)):
+                values = list(templates[i % len(templates)])
+                values[created_idx] = created_field.get_db_prep_save(
+                    start + datetime.timedelta(seconds=i * 30), connection
+                )
+                params.append(values)
+            with transaction.atomic():
+                cursor.executemany(sql, params)
+    # INSERT mentah tidak lewat signal rollup
+    stats.rebuild()
+    return target - existing
+
+
+def _submit(options):
+    from django.test import Client
+
+    from screening import metrics
+    from screening.benchmarks.common import time_call
+
+    client = Client()
+    client.force_login(_bench_user())
+    counter = iter(range(10 ** 9))
+
+    def post():
+        # umur berbeda setiap request supaya tidak kena cache prediksi
+        response = client.post("/submit/", dict(FORM_PAYLOAD, patient_age=str(18 + next(counter) % 30)))
+        assert response.status_code == 200, response.status_code
+
+    result = {"submit": time_call(post, repeat=options["repeat"])}
+    stages = {}
+    for (view, stage), child in sorted(metrics.STAGE_SECONDS._children.items()):
+        if view == "submit" and child.count:
+            stages[stage] = {"mean_ms": child.sum / child.count * 1000.0, "n": child.count}
+    result["stages"] = stages
+    return result
+
+
+def _pages(options):
+    from django.test import Client
+
+    from screening import views
+    from screening.benchmarks.common import time_call
+    from screening.models import ScreeningSubmission
+
+    user = _bench_user()
+    # scope=all di API riwayat hanya untuk staff
+    user.is_staff = True
+    user.save(update_fields=["is_staff"])
+    client = Client()
+    client.force_login(user)
+    results = {}
+    for size in sorted(options["sizes"]):
+        t0 = time.perf_counter()
+        _seed(size, user)
+        seed_s = time.perf_counter() - t0
+        repeat = 10 if size <= 10_000 else 3
+
+        def get(url, key, params=None):
+            response = client.get(url, params or {})
+            assert response.status_code == 200, (url, response.status_code)
+            sizes[key] = len(response.content)
+
+        # Cursor di tengah tabel: biaya halaman dalam harus sama dengan halaman pertama
+        middle = ScreeningSubmission.objects.order_by("-created_at", "-id").only("id", "created_at")[size // 2]
+        deep = {"scope": "all", "cursor": views._encode_cursor(middle)}
+
+        sizes = {}
+        result = {
+            "seed_s": seed_s,
+            "dashboard": time_call(lambda: get("/dashboard/", "dashboard"), repeat=repeat, warmup=1),
+            "my_submissions": time_call(lambda: get("/my-submissions/", "my_submissions"), repeat=repeat, warmup=1),
+            "api_mine_first": time_call(
+                lambda: get("/api/v1/submissions", "api_mine_first", {"scope": "mine"}), repeat=repeat, warmup=1
+            ),
+            "api_all_first": time_call(
+                lambda: get("/api/v1/submissions", "api_all_first", {"scope": "all"}), repeat=repeat, warmup=1
+            ),
+            "api_all_middle": time_call(
+                lambda: get("/api/v1/submissions", "api_all_middle", deep), repeat=repeat, warmup=1
+            ),
+            "api_all_filtered": time_call(
+                lambda: get("/api/v1/submissions", "api_all_filtered", {"scope": "all", "result": "preeklampsia"}),
+                repeat=repeat, warmup=1,
+            ),
+        }
+        result["response_bytes"] = sizes
+        results[str(size)] = result
+    return results
+
+
+def _pdf(options):
+    from django.test import Client
+
+    from screening import metrics
+    from screening.benchmarks.common import time_call
+    from screening.models import ScreeningSubmission
+
+    client = Client()
+    client.force_login(_bench_user())
+    client.post("/submit/", FORM_PAYLOAD)
+    sub = ScreeningSubmission.objects.latest("id")
+    info = {}
+
+    def download():
+        response = client.get("/download/", {"submission_id": sub.id})
+        info["content_type"] = response["Content-Type"]
+        info["bytes"] = len(response.content)
+
+    result = {"download": time_call(download, repeat=max(options["repeat"] // 5, 5))}
+    result.update(info)
+    for (view, stage), child in sorted(metrics.STAGE_SECONDS._children.items()):
+        if view == "download" and child.count:
+            result.setdefault("stages", {})[stage] = {"mean_ms": child.sum / child.count * 1000.0}
+    return result
+
+
+_CHILD_SUITES = {"submit": _submit, "pages": _pages, "pdf": _pdf}
+
+
+if __name__ == "__main__":
+    db_path = _setup()
+    try:
+        output = _CHILD_SUITES[sys.argv[1]](json.loads(sys.argv[2]))
+    finally:
+        os.unlink(db_path)
+    print(json.dumps(output))
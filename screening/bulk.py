@@ -0,0 +1,137 @@
+"""
+Upload screening massal dari CSV berformat ALL_FINAL.csv.
+
+File dibaca secara streaming per chunk (lihat `dataset.iter_csv_chunks`).
+Setiap chunk di-encode sekali (`FeatureEncoder.transform_rows`), dinilai
+dengan satu panggilan `predict_with_proba` vectorized, lalu disimpan dengan
+`bulk_create` dalam satu transaksi. Hanya satu chunk yang ada di memori,
+berapa pun ukuran file-nya.
+
+Dipakai oleh view `bulk_upload` dan command `manage.py import_screenings`.
+"""
+import logging
+import os
+import time
+
+from django.db import transaction
+
+from . import dataset, predictor, stats
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_ERRORS = 50
+
+
+class BulkImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.chunks = 0
+        self.preeclampsia = 0
+        self.errors = []  # (nomor_baris, pesan), maks MAX_REPORTED_ERRORS
+        self.started = time.perf_counter()
+        self.elapsed_s = 0.0
+
+    def add_error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def rows_per_sec(self):
+        return (self.rows / self.elapsed_s) if self.elapsed_s else 0.0
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "failed": self.failed,
+            "preeclampsia": self.preeclampsia,
+            "chunks": self.chunks,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+            "errors": [{"line": line, "error": msg} for line, msg in self.errors],
+        }
+
+
+def score_rows(model, datas):
+    """
+    Nilai banyak pasien sekaligus. `datas` berisi dict field
+    ScreeningSubmission; return list (is_pree, conf_val) dengan urutan sama.
+    """
+    labels, proba = predictor.predict_rows(model, [dataset.feature_row(d) for d in datas])
+    classes = model.classes
+    return [dataset.interpret(labels[i], proba[i], classes) for i in range(len(datas))]
+
+
+def import_csv(fh, model, user=None, name_prefix="CSV", chunk_size=500, progress=None):
+    """
+    Import semua baris CSV dari file teks `fh`.
+
+    name_prefix: dipakai sebagai nama pasien ("<prefix> baris <n>") jika CSV
+        tidak punya kolom nama.
+    progress: callable(report) opsional, dipanggil setelah setiap chunk.
+    Return: BulkImportReport.
+    """
+    from .models import ScreeningSubmission
+
+    report = BulkImportReport()
+    for chunk in dataset.iter_csv_chunks(fh, chunk_size=chunk_size):
+        report.chunks += 1
+        report.rows += len(chunk)
+
+        datas = []
+        for line, record in chunk:
+            try:
+                data = dataset.submission_fields(record)
+                data.setdefault("patient_name", f"{name_prefix} baris {line}")
+                # Baris yang akan ditolak database (nilai di luar rentang,
+                # teks terlalu panjang) dilewati di sini, bukan membatalkan
+                # chunk setelah chunk sebelumnya sudah tersimpan
+                dataset.validate_submission(data, dataset.CSV_COLUMN_NAMES)
+            except Exception as e:
+                report.add_error(line, str(e))
+                continue
+            datas.append(data)
+
+        if datas:
+            try:
+                results = score_rows(model, datas)
+            except Exception as e:
+                logger.exception("Bulk scoring failed for chunk %d", report.chunks)
+                for data in datas:
+                    report.add_error(None, f"Prediksi gagal: {e}")
+                datas = []
+                results = []
+
+            objs = []
+            for data, (is_pree, conf_val) in zip(datas, results):
+                data.update(dataset.result_fields(is_pree, conf_val))
+                data["model_version"] = model.version
+                report.preeclampsia += int(is_pree)
+                objs.append(ScreeningSubmission(user=user, **data))
+
+            with transaction.atomic():
+                ScreeningSubmission.objects.bulk_create(objs, batch_size=chunk_size)
+                stats.record_created(objs)
+            report.created += len(objs)
+
+        report.elapsed_s = time.perf_counter() - report.started
+        if progress is not None:
+            progress(report)
+
+    report.elapsed_s = time.perf_counter() - report.started
+    logger.info(
+        "Bulk import: %d rows, %d created, %d failed in %.2fs (%.0f rows/s)",
+        report.rows,
+        report.created,
+        report.failed,
+        report.elapsed_s,
+        report.rows_per_sec,
+    )
+    return report
+
+
+def name_prefix_for(filename):
+    return os.path.splitext(os.path.basename(filename))[0] or "CSV"
@@ -0,0 +1,308 @@
+"""
+Kompresi RandomForest hasil training menjadi CompiledForest yang lebih kecil,
+ditulis sebagai bundle mmap (lihat model_bundle.py).
+
+Tiga tahap, masing-masing diverifikasi:
+
+1. `select_trees`: buang tree yang tidak dibutuhkan menurut metrik
+   out-of-bag (accuracy, recall Preeklampsia, Brier). Setiap tree hanya
+   dinilai pada sampel yang tidak ada di bootstrap-nya; tree dibuang secara
+   greedy (yang paling tidak berguna dulu) selama metrik OOB ensemble tidak
+   turun dari metrik forest penuh. Karena dipilih dengan data OOB yang
+   sama, metrik OOB sesudahnya cenderung optimistis; `min_trees` (default
+   50) menjaga forest tidak menyusut terlalu jauh.
+2. `collapse_tree`: subtree yang semua leaf-nya memberi vote kelas yang
+   sama diganti satu leaf dengan distribusi kelas node tersebut (mode
+   "vote"), atau hanya jika semua leaf-nya identik (mode "exact", lossless).
+3. `narrow_dtypes`: threshold disimpan float32 dibulatkan ke bawah (input
+   selalu float32, jadi `x <= t` tidak berubah); leaf_value memakai
+   float16/float32 jika label dan probabilitas di data evaluasi tetap sama
+   (dalam toleransi). Array index (feature, children, roots) tetap intp:
+   index int8/int16 membuat traversal lebih lambat karena harus dikonversi
+   setiap level (batch ~9 -> ~14 ms di model bawaan).
+
+Pada model bawaan, collapse "vote" tidak mengubah jumlah node (setiap
+split sudah memisahkan vote kelas); hampir semua penghematan dan seluruh
+perubahan probabilitas berasal dari seleksi tree.
+
+Hasil kompresi disimpan sebagai artefak baru (`attach_engine`): pipeline
+dengan forest yang sudah dipangkas ke tree terpilih, ditambah
+CompiledForest terkompresi sebagai atribut. Artefak ini punya hash sendiri,
+sehingga didaftarkan sebagai versi registry baru, dan load lewat joblib
+(tanpa bundle) tetap menghasilkan engine yang sama persis.
+"""
+import numpy as np
+
+from .inference import CompiledForest, tree_arrays
+
+COLLAPSE_MODES = ("vote", "exact", "none")
+
+
+# ==============
+# SELEKSI TREE (OOB)
+# ==============
+
+def oob_masks(forest, n_samples):
+    """Mask (n_trees, n_samples): True jika sampel out-of-bag untuk tree tsb."""
+    if not getattr(forest, "bootstrap", False):
+        raise ValueError("Forest dilatih tanpa bootstrap, tidak ada sampel out-of-bag")
+    fitted_n = getattr(forest, "_n_samples", n_samples)
+    if fitted_n != n_samples:
+        raise ValueError(f"Data evaluasi {n_samples} baris, forest dilatih dengan {fitted_n} baris")
+    masks = np.ones((len(forest.estimators_), n_samples), dtype=bool)
+    for t, in_bag in enumerate(forest.estimators_samples_):
+        masks[t, in_bag] = False
+    return masks
+
+
+def _oob_metrics(sums, counts, y_idx, pos_idx):
+    covered = counts > 0
+    proba = sums[covered] / counts[covered, np.newaxis]
+    y = y_idx[covered]
+    pred = np.argmax(proba, axis=1)
+    positive = y == pos_idx
+    onehot = np.zeros_like(proba)
+    onehot[np.arange(len(y)), y] = 1.0
+    return {
+        "accuracy": float(np.mean(pred == y)),
+        "recall_pree": float(np.mean(pred[positive] == pos_idx)) if positive.any() else 1.0,
+        "brier": float(np.mean(np.sum((proba - onehot) ** 2, axis=1))),
+        "coverage": float(np.mean(covered)),
+    }
+
+
+def _not_worse(metrics, base, tolerance):
+    return (
+        metrics["accuracy"] >= base["accuracy"] - tolerance
+        and metrics["recall_pree"] >= base["recall_pree"] - tolerance
+        and metrics["brier"] <= base["brier"] + tolerance
+        and metrics["coverage"] >= base["coverage"]
+    )
+
+
+def select_trees(forest, Xt, y, positive_label="Preeklampsia", tolerance=0.0, min_trees=50):
+    """
+    Index tree yang dipertahankan, plus metrik OOB sebelum/sesudah.
+
+    Xt: fitur yang sudah melewati preprocessing (input forest), y: label
+    training (urutan sama dengan saat fit).
+    """
+    classes = list(forest.classes_)
+    y_idx = np.array([classes.index(v) for v in y])
+    pos_idx = classes.index(positive_label) if positive_label in classes else len(classes) - 1
+    masks = oob_masks(forest, len(y_idx))
+
+    Xt = np.asarray(Xt, dtype=np.float32)
+    per_tree = np.stack([est.predict_proba(Xt) for est in forest.estimators_])
+    per_tree *= masks[:, :, np.newaxis]
+    sums = per_tree.sum(axis=0)
+    counts = masks.sum(axis=0).astype(np.float64)
+    base = _oob_metrics(sums, counts, y_idx, pos_idx)
+
+    # Urutan: tree yang paling tidak berguna (metrik setelah dibuang paling baik) dulu
+    def score_without(t):
+        m = _oob_metrics(sums - per_tree[t], counts - masks[t], y_idx, pos_idx)
+        return (m["accuracy"], m["recall_pree"], -m["brier"])
+
+    order = sorted(range(len(per_tree)), key=score_without, reverse=True)
+    kept = set(range(len(per_tree)))
+    for t in order:
+        if len(kept) <= min_trees:
+            break
+        new_sums, new_counts = sums - per_tree[t], counts - masks[t]
+        if _not_worse(_oob_metrics(new_sums, new_counts, y_idx, pos_idx), base, tolerance):
+            kept.discard(t)
+            sums, counts = new_sums, new_counts
+
+    return sorted(kept), {"before": base, "after": _oob_metrics(sums, counts, y_idx, pos_idx)}
+
+
+# ==============
+# COLLAPSE SUBTREE
+# ==============
+
+def collapse_tree(tree, mode="vote"):
+    """
+    Tree baru (format `tree_arrays`) dengan subtree seragam diganti leaf.
+    Node sklearn bernomor pre-order, jadi child selalu > parent dan cukup
+    satu pass dari belakang untuk menandai subtree yang seragam.
+    """
+    left, right, value = tree["children_left"], tree["children_right"], tree["value"]
+    n_nodes = len(left)
+    uniform = np.zeros(n_nodes, dtype=bool)
+    if mode != "none":
+        vote = np.argmax(value, axis=1)
+        for node in range(n_nodes - 1, -1, -1):
+            l, r = left[node], right[node]
+            if l == -1:
+                uniform[node] = True
+            elif uniform[l] and uniform[r]:
+                if mode == "vote":
+                    uniform[node] = vote[l] == vote[r]
+                else:
+                    uniform[node] = np.array_equal(value[l], value[r])
+
+    # Tulis ulang pre-order, berhenti di node seragam (jadi leaf)
+    new_ids = {}
+    order = []
+    stack = [(0, 0)]
+    max_depth = 0
+    while stack:
+        node, depth = stack.pop()
+        new_ids[node] = len(order)
+        order.append(node)
+        max_depth = max(max_depth, depth)
+        if left[node] != -1 and not uniform[node]:
+            stack.append((right[node], depth + 1))
+            stack.append((left[node], depth + 1))
+
+    order = np.array(order, dtype=np.intp)
+    is_leaf = np.array([left[n] == -1 or uniform[n] for n in order])
+    new_left = np.array([-1 if leaf else new_ids[left[n]] for n, leaf in zip(order, is_leaf)], dtype=np.intp)
+    new_right = np.array([-1 if leaf else new_ids[right[n]] for n, leaf in zip(order, is_leaf)], dtype=np.intp)
+    return {
+        "children_left": new_left,
+        "children_right": new_right,
+        "feature": np.where(is_leaf, -2, tree["feature"][order]),
+        "threshold": np.where(is_leaf, -2.0, tree["threshold"][order]),
+        "missing_go_to_left": tree["missing_go_to_left"][order],
+        # value node internal = distribusi kelas semua sampel di subtree-nya
+        "value": value[order],
+        "weight": tree["weight"][order],
+        "max_depth": max_depth,
+    }
+
+
+# ==============
+# DTYPE SEMPIT
+# ==============
+
+def _float32_floor(values):
+    """float32 terbesar yang <= nilai float64 (supaya x32 <= t tidak berubah)."""
+    narrowed = values.astype(np.float32)
+    too_big = narrowed.astype(np.float64) > values
+    narrowed[too_big] = np.nextafter(narrowed[too_big], np.float32(-np.inf))
+    return narrowed
+
+
+def _with_arrays(engine, **arrays):
+    current, meta = engine.to_arrays()
+    current.update(arrays)
+    return CompiledForest.from_arrays(current, meta)
+
+
+def narrow_dtypes(engine, X_eval, proba_tolerance=5e-4):
+    """
+    Return (engine_baru, info). Threshold dipersempit tanpa mengubah
+    traversal; leaf_value memakai dtype tersempit yang labelnya sama dan
+    selisih probabilitasnya <= proba_tolerance pada X_eval. Array index
+    tidak disentuh (tetap intp, lihat docstring modul).
+    """
+    narrowed = _with_arrays(engine, threshold=_float32_floor(np.asarray(engine.threshold, dtype=np.float64)))
+
+    reference = engine.predict_proba(X_eval)
+    ref_labels = np.argmax(reference, axis=1)
+    info = {"leaf_dtype": "float64", "max_proba_delta": 0.0}
+    for dtype in (np.float16, np.float32):
+        candidate = _with_arrays(narrowed, leaf_value=np.asarray(engine.leaf_value).astype(dtype))
+        proba = candidate.predict_proba(X_eval)
+        delta = float(np.max(np.abs(proba - reference))) if len(proba) else 0.0
+        if np.array_equal(np.argmax(proba, axis=1), ref_labels) and delta <= proba_tolerance:
+            info.update(leaf_dtype=np.dtype(dtype).name, max_proba_delta=delta)
+            return candidate, info
+    return narrowed, info
+
+
+# ==============
+# PIPELINE KOMPRESI
+# ==============
+
+def _max_delta(a, b):
+    return float(np.max(np.abs(a - b))) if len(a) else 0.0
+
+
+def compress(pipeline, X, y, tolerance=0.0, min_trees=50, collapse="vote", proba_tolerance=5e-4,
+             positive_label="Preeklampsia"):
+    """
+    Kompres pipeline (preprocess + RandomForestClassifier) yang dilatih
+    dengan (X, y). Return (engine, info): CompiledForest terkompresi dan
+    ringkasan setiap tahap, termasuk kecocokan dengan pipeline asli di X.
+    """
+    if collapse not in COLLAPSE_MODES:
+        raise ValueError(f"Mode collapse tidak dikenal: {collapse}")
+    preprocess = pipeline[:-1]
+    forest = pipeline.steps[-1][1]
+    Xt = preprocess.transform(X)
+    if hasattr(Xt, "toarray"):
+        Xt = Xt.toarray()
+    Xt = np.asarray(Xt, dtype=np.float32)
+
+    original = CompiledForest.from_estimator(pipeline)
+    kept, oob = select_trees(forest, Xt, y, positive_label=positive_label, tolerance=tolerance, min_trees=min_trees)
+
+    n_classes = int(forest.n_classes_)
+    selected_trees = [tree_arrays(forest.estimators_[t].tree_, n_classes) for t in kept]
+    selected = CompiledForest.from_trees(selected_trees, classes=forest.classes_, n_features=forest.n_features_in_)
+    trees = [collapse_tree(tree, mode=collapse) for tree in selected_trees]
+    collapsed = CompiledForest.from_trees(trees, classes=forest.classes_, n_features=forest.n_features_in_)
+    engine, dtypes = narrow_dtypes(collapsed, Xt, proba_tolerance=proba_tolerance)
+
+    ref = original.predict_proba(Xt)
+    ref_selected = selected.predict_proba(Xt)
+    ref_collapsed = collapsed.predict_proba(Xt)
+    new = engine.predict_proba(Xt)
+    info = {
+        "trees": {"before": original.n_estimators, "after": engine.n_estimators, "kept": [int(t) for t in kept]},
+        "nodes": {"before": original.node_count, "after_selection": selected.node_count, "after": engine.node_count},
+        "max_depth": {"before": original.max_depth, "after": engine.max_depth},
+        "engine_bytes": {"before": original.nbytes, "after": engine.nbytes},
+        "oob": oob,
+        "collapse": collapse,
+        "dtypes": dtypes,
+        "agreement": {
+            "rows": len(Xt),
+            "label_match": float(np.mean(np.argmax(ref, axis=1) == np.argmax(new, axis=1))),
+            "max_proba_delta": _max_delta(ref, new),
+        },
+        # Selisih probabilitas maks. yang disebabkan masing-masing tahap
+        "proba_delta_by_stage": {
+            "selection": _max_delta(ref, ref_selected),
+            "collapse": _max_delta(ref_selected, ref_collapsed),
+            "dtypes": _max_delta(ref_collapsed, new),
+        },
+    }
+    return engine, info
+
+
+# ==============
+# ARTEFAK
+# ==============
+
+ENGINE_ATTR = "compressed_engine_"
+
+
+def attach_engine(pipeline, engine, kept):
+    """
+    Pangkas forest pipeline ke tree `kept` dan simpan `engine` terkompresi
+    di pipeline (in place). Pipeline sklearn tetap bisa dipakai (retrain,
+    benchmark); prediksi aplikasi memakai engine terkompresi.
+    """
+    forest = pipeline.steps[-1][1]
+    forest.estimators_ = [forest.estimators_[t] for t in kept]
+    forest.n_estimators = len(forest.estimators_)
+    setattr(pipeline, ENGINE_ATTR, engine)
+    return pipeline
+
+
+def detach_engine(pipeline):
+    """Buang engine terkompresi (mis. sebelum forest diubah lagi oleh retrain)."""
+    pipeline.__dict__.pop(ENGINE_ATTR, None)
+    return pipeline
+
+
+def compiled_engine(pipeline):
+    """CompiledForest untuk pipeline: engine terkompresi jika ada, selain itu compile forest-nya."""
+    engine = getattr(pipeline, ENGINE_ATTR, None)
+    if engine is not None:
+        return engine
+    return CompiledForest.from_estimator(pipeline)
@@ -0,0 +1,398 @@
+"""
+Pemetaan data screening: field form / ScreeningSubmission <-> kolom dataset
+ALL_FINAL.csv (nama kolom training model), plus interpretasi hasil prediksi.
+
+Dipakai bersama oleh form (`views.submit_screening`) dan upload CSV massal
+(`bulk.py`), sehingga satu pasien menghasilkan vector fitur dan hasil yang
+sama persis lewat jalur mana pun.
+"""
+import csv
+import math
+import os
+import numbers
+
+CSV_DELIMITER = ";"
+LABEL_COLUMN = "Label"
+# Kolom opsional untuk nama pasien (ALL_FINAL.csv sendiri tidak punya)
+PATIENT_NAME_COLUMNS = ("Nama Pasien", "Nama")
+# Header di ALL_FINAL.csv yang ejaannya berbeda dari nama kolom training
+HEADER_ALIASES = {"Perkerjaan": "Pekerjaan"}
+# Ejaan ganda nilai kategori di ALL_FINAL.csv, digabung ke satu nilai baku
+# (dipakai loader training dan feature_row supaya keduanya konsisten)
+CATEGORY_ALIASES = {"Pekerjaan": {"Swastas": "Swasta", "WiraSwasta": "Wiraswasta"}}
+
+# (kolom CSV / training, field ScreeningSubmission, tipe)
+CSV_COLUMNS = [
+    ("Kabupaten/Kota", "district_city", "str"),
+    ("Umur (Tahun)", "patient_age", "int"),
+    ("Pendidikan", "education_level", "str"),
+    ("Pekerjaan", "current_occupation", "str"),
+    ("Status Nikah", "marital_status", "str"),
+    ("Pernikahan Ke", "marriage_order", "int"),
+    ("Paritas", "parity", "str"),
+    ("Hamil Pasangan Baru", "new_partner_pregnancy", "bool"),
+    ("Jarak Anak >10 tahun", "child_spacing_over_10_years", "bool"),
+    ("Bayi Tabung", "ivf_pregnancy", "bool"),
+    ("Gemelli", "multiple_pregnancy", "bool"),
+    ("Perokok", "smoker", "bool"),
+    ("Hamil Direncanakan", "planned_pregnancy", "bool"),
+    ("Riwayat Keluarga Preeklampsia", "family_history_pe", "bool"),
+    ("Riwayat Preeklampsia", "personal_history_pe", "bool"),
+    ("Hipertensi Kronis", "chronic_hypertension", "bool"),
+    ("Diabetes Melitus", "diabetes_mellitus", "bool"),
+    ("Riwayat Penyakit Ginjal", "kidney_disease", "bool"),
+    ("Penyakit Autoimune", "autoimmune_disease", "bool"),
+    ("APS", "aps_history", "bool"),
+    ("BB Sebelum Hamil (Kg)", "pre_pregnancy_weight", "float"),
+    ("TB (Cm)", "height_cm", "float"),
+    ("Indeks Massa Tubuh (IMT)", "bmi", "float"),
+    ("Lingkar Lengan Atas (Cm)", "lila_cm", "float"),
+    ("TD Sistolik I", "systolic_bp", "int"),
+    ("TD Diastolik I", "diastolic_bp", "int"),
+    ("MAP (mmHg)", "map_mmhg", "float"),
+    ("Hb (gr/dl)", "hemoglobin", "float"),
+    ("Hipertensi Keluarga", "family_history_hypertension", "bool"),
+    ("Riwayat Penyakit Ginjal Keluarga", "family_history_kidney", "bool"),
+    ("Riwayat Penyakit Jantung Keluarga", "family_history_heart", "bool"),
+]
+
+
+# ==============
+# KONVERSI NILAI
+# ==============
+
+def to_float(val, default=0.0):
+    """
+    Ubah string/angka ke float, kalau gagal pakai default.
+    Jika default=None, return None untuk missing values (akan di-handle oleh imputer).
+    """
+    if val is None or val == "":
+        return default
+    try:
+        result = float(val)
+        # Return default jika hasilnya NaN atau inf
+        if math.isnan(result) or math.isinf(result):
+            return default
+        return result
+    except Exception:
+        return default
+
+
+def to_int(val):
+    """Seperti to_float, tapi untuk field integer ("113.0" -> 113). None jika kosong/invalid."""
+    result = to_float(val, default=None)
+    return int(result) if result is not None else None
+
+
+def clean_str(val):
+    """
+    Bersihkan string dari spasi depan/belakang.
+    """
+    if val is None:
+        return None
+    return str(val).strip()
+
+
+def to_bool(val):
+    """
+    "Ya"/"Tidak" (CSV) atau "1"/"0" (form) -> True/False, kosong -> None.
+    """
+    if val is None:
+        return None
+    s = str(val).strip().lower()
+    if s == "":
+        return None
+    return s in ("1", "true", "on", "ya", "yes")
+
+
+def to_yesno(val):
+    """Konversi boolean/None ke string Ya/Tidak untuk categorical features"""
+    if val is None:
+        return "Tidak"
+    if isinstance(val, bool):
+        return "Ya" if val else "Tidak"
+    if isinstance(val, (int, float)):
+        if math.isnan(val) or math.isinf(val):
+            return "Tidak"
+        return "Ya" if int(val) == 1 else "Tidak"
+    try:
+        val_str = str(val).strip().lower()
+        if val_str in ('1', 'true', 'ya', 'yes', 'on'):
+            return "Ya"
+        return "Tidak"
+    except Exception:
+        return "Tidak"
+
+
+_CONVERTERS = {
+    "str": lambda v: clean_str(v) or "",
+    "int": to_int,
+    "float": lambda v: to_float(v, default=None),
+    "bool": to_bool,
+}
+
+
+# ==============
+# FITUR MODEL
+# ==============
+
+def normalize_category(column, value):
+    """Nilai kategori `value` untuk kolom `column` setelah CATEGORY_ALIASES."""
+    return CATEGORY_ALIASES.get(column, {}).get(value, value)
+
+
+def feature_row(data):
+    """
+    Bentuk baris dengan nama kolom yang sama persis dengan training dari
+    field ScreeningSubmission (imputation + onehot encoding dilakukan oleh
+    model.encoder / pipeline).
+    """
+    return {
+        # Numeric features (akan di-impute dengan median jika missing)
+        'Umur (Tahun)': to_float(data.get('patient_age'), default=None),
+        'Pernikahan Ke': to_float(data.get('marriage_order'), default=None),
+        'BB Sebelum Hamil (Kg)': to_float(data.get('pre_pregnancy_weight'), default=None),
+        'TB (Cm)': to_float(data.get('height_cm'), default=None),
+        'Indeks Massa Tubuh (IMT)': to_float(data.get('bmi'), default=None),
+        'Lingkar Lengan Atas (Cm)': to_float(data.get('lila_cm'), default=None),
+        'TD Sistolik I': to_float(data.get('systolic_bp'), default=None),
+        'TD Diastolik I': to_float(data.get('diastolic_bp'), default=None),
+        'MAP (mmHg)': to_float(data.get('map_mmhg'), default=None),
+        'Hb (gr/dl)': to_float(data.get('hemoglobin'), default=None),
+
+        # Categorical features (akan di-impute dengan most_frequent + onehot encoded)
+        'Kabupaten/Kota': clean_str(data.get('district_city')) or None,
+        'Pendidikan': clean_str(data.get('education_level')) or None,
+        'Pekerjaan': normalize_category('Pekerjaan', clean_str(data.get('current_occupation')) or None),
+        'Status Nikah': clean_str(data.get('marital_status')) or None,
+        'Paritas': clean_str(data.get('parity')) or None,
+        'Hamil Pasangan Baru': to_yesno(data.get('new_partner_pregnancy')),
+        'Jarak Anak >10 tahun': to_yesno(data.get('child_spacing_over_10_years')),
+        'Bayi Tabung': to_yesno(data.get('ivf_pregnancy')),
+        'Gemelli': to_yesno(data.get('multiple_pregnancy')),
+        'Perokok': to_yesno(data.get('smoker')),
+        'Hamil Direncanakan': to_yesno(data.get('planned_pregnancy')),
+        'Riwayat Keluarga Preeklampsia': to_yesno(data.get('family_history_pe')),
+        'Riwayat Preeklampsia': to_yesno(data.get('personal_history_pe')),
+        'Hipertensi Kronis': to_yesno(data.get('chronic_hypertension')),
+        'Diabetes Melitus': to_yesno(data.get('diabetes_mellitus')),
+        'Riwayat Penyakit Ginjal': to_yesno(data.get('kidney_disease')),
+        'Penyakit Autoimune': to_yesno(data.get('autoimmune_disease')),
+        'APS': to_yesno(data.get('aps_history')),
+        'Hipertensi Keluarga': to_yesno(data.get('family_history_hypertension')),
+        'Riwayat Penyakit Ginjal Keluarga': to_yesno(data.get('family_history_kidney')),
+        'Riwayat Penyakit Jantung Keluarga': to_yesno(data.get('family_history_heart')),
+    }
+
+
+# ==============
+# HASIL PREDIKSI
+# ==============
+
+def normalize_label(raw):
+    """
+    Normalize predicted label to canonical string values used elsewhere
+    ('Preeklampsia' or 'NonPreeklampsia').
+    """
+    try:
+        # numeric types -> 1 means Preeklampsia
+        if isinstance(raw, (int, float, numbers.Integral)):
+            return 'Preeklampsia' if int(raw) == 1 else 'NonPreeklampsia'
+        s = str(raw).strip()
+        key = s.lower().replace('-', '').replace(' ', '')
+        if key in ('preeklampsia', 'preeclampsia'):
+            return 'Preeklampsia'
+        if key in ('nonpreeklampsia', 'nonpreeclampsia', 'nonpreeklampsia'):
+            return 'NonPreeklampsia'
+        # if it's a numeric string
+        try:
+            if int(s) == 1:
+                return 'Preeklampsia'
+            else:
+                return 'NonPreeklampsia'
+        except Exception:
+            return s
+    except Exception:
+        return str(raw)
+
+
+def preeclampsia_index(classes):
+    """Index kelas Preeklampsia di `classes`, atau None jika tidak ditemukan."""
+    for idx, c in enumerate(classes):
+        try:
+            if isinstance(c, (int, float, numbers.Integral)) and int(c) == 1:
+                return idx
+            kc = str(c).lower().replace('-', '').replace(' ', '')
+            if kc in ('preeklampsia', 'preeclampsia'):
+                return idx
+        except Exception:
+            continue
+    return None
+
+
+def interpret(raw_label, probas, classes):
+    """
+    (is_pree, conf_val) dari label mentah model dan baris probabilitasnya.
+    Confidence = probabilitas kelas yang diprediksi (dalam persen).
+    """
+    y_pred = normalize_label(raw_label)
+    if probas is not None:
+        idx_pree = preeclampsia_index(classes)
+        if idx_pree is not None:
+            pree_proba = float(probas[idx_pree]) * 100.0
+            conf_val = pree_proba if y_pred == 'Preeklampsia' else 100.0 - pree_proba
+        else:
+            conf_val = float(max(probas) * 100.0)
+    else:
+        conf_val = 75.0
+    return y_pred == 'Preeklampsia', conf_val
+
+
+def result_fields(is_pree, conf_val):
+    """
+    Nilai field hasil prediksi ScreeningSubmission: `result` / `confidence`
+    (teks untuk tampilan) dan `is_preeclampsia` / `preeclampsia_probability`
+    (bertipe, untuk query). conf_val = probabilitas kelas yang diprediksi (%).
+    """
+    conf = float(conf_val) / 100.0
+    return {
+        "result": "Preeklampsia" if is_pree else "Non-Preeklampsia",
+        "confidence": f"{conf_val:.1f}%",
+        "is_preeclampsia": bool(is_pree),
+        "preeclampsia_probability": conf if is_pree else 1.0 - conf,
+    }
+
+
+# ==============
+# CSV (format ALL_FINAL.csv)
+# ==============
+
+def normalize_header(header):
+    names = [h.strip().lstrip("\ufeff").strip() for h in header]
+    return [HEADER_ALIASES.get(h, h) for h in names]
+
+
+def iter_csv_chunks(fh, chunk_size=500, delimiter=CSV_DELIMITER):
+    """
+    Baca CSV secara streaming dari file teks `fh` dan yield list berisi
+    paling banyak `chunk_size` tuple (nomor_baris, dict kolom -> nilai).
+    Hanya satu chunk yang ada di memori pada satu waktu.
+    """
+    reader = csv.reader(fh, delimiter=delimiter)
+    try:
+        header = normalize_header(next(reader))
+    except StopIteration:
+        return
+    missing = [col for col, _, _ in CSV_COLUMNS if col not in header]
+    if missing:
+        raise ValueError(f"Kolom CSV tidak ditemukan: {', '.join(missing)}")
+
+    chunk = []
+    for raw in reader:
+        if not raw or not any(cell.strip() for cell in raw):
+            continue
+        chunk.append((reader.line_num, dict(zip(header, raw))))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def submission_fields(record):
+    """Dict kolom CSV -> field ScreeningSubmission (tanpa hasil prediksi)."""
+    data = {field: _CONVERTERS[kind](record.get(col)) for col, field, kind in CSV_COLUMNS}
+    for col in PATIENT_NAME_COLUMNS:
+        name = clean_str(record.get(col))
+        if name:
+            data["patient_name"] = name
+            break
+    return data
+
+
+# nama kolom CSV untuk pesan error upload massal
+CSV_COLUMN_NAMES = {"patient_name": PATIENT_NAME_COLUMNS[0], **{field: col for col, field, _ in CSV_COLUMNS}}
+
+
+def validate_submission(data, names=None):
+    """
+    Cek field hasil konversi terhadap definisi ScreeningSubmission sebelum
+    disimpan: patient_age wajib, panjang maks. CharField dan rentang integer
+    database (mis. umur negatif). Tanpa ini `bulk_create` baru gagal dengan
+    IntegrityError di tengah import. `names`: field -> nama untuk pesan.
+    Raise ValueError berisi semua kesalahan.
+    """
+    from django.core.exceptions import ValidationError
+
+    from .models import ScreeningSubmission
+
+    names = names or {}
+    errors = []
+    if data.get("patient_age") is None:
+        errors.append(f"{names.get('patient_age', 'patient_age')} wajib diisi")
+    for field, value in data.items():
+        try:
+            ScreeningSubmission._meta.get_field(field).run_validators(value)
+        except ValidationError as e:
+            errors.append(f"{names.get(field, field)}: {' '.join(e.messages)}")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+
+# ==============
+# JSON (nama field ScreeningSubmission)
+# ==============
+
+# field ScreeningSubmission -> tipe, untuk input API
+FIELD_TYPES = dict([("patient_name", "str")] + [(field, kind) for _, field, kind in CSV_COLUMNS])
+
+
+_BOOL_STRINGS = ("1", "0", "true", "false", "on", "off", "ya", "tidak", "yes", "no")
+
+
+def _json_type_error(kind, value):
+    """
+    Pesan jika nilai JSON tidak cocok dengan tipe field, atau None. Converter
+    form menerima apa saja (list jadi string, "abc" jadi kosong), jadi input
+    API dicek dulu di sini supaya tidak dikonversi diam-diam.
+    """
+    if value is None or value == "":
+        return None
+    if kind == "str":
+        return None if isinstance(value, str) else "harus berupa string"
+    if kind == "bool":
+        if isinstance(value, bool) or (isinstance(value, int) and value in (0, 1)):
+            return None
+        if isinstance(value, str) and value.strip().lower() in _BOOL_STRINGS:
+            return None
+        return "harus berupa boolean"
+    if isinstance(value, bool) or not isinstance(value, (numbers.Real, str)):
+        return "harus berupa angka"
+    number = to_float(value, default=None)
+    if number is None:
+        return "harus berupa angka"
+    if kind == "int" and not number.is_integer():
+        return "harus berupa bilangan bulat"
+    return None
+
+
+def submission_from_mapping(obj):
+    """
+    Dict JSON dengan nama field ScreeningSubmission -> field yang sudah
+    dikonversi. Raise ValueError untuk input yang tidak valid.
+    """
+    if not isinstance(obj, dict):
+        raise ValueError("Data pasien harus berupa object JSON")
+    unknown = sorted(set(obj) - set(FIELD_TYPES))
+    if unknown:
+        raise ValueError(f"Field tidak dikenal: {', '.join(unknown)}")
+    errors = []
+    for field, value in obj.items():
+        message = _json_type_error(FIELD_TYPES[field], value)
+        if message:
+            errors.append(f"{field}: {message}")
+    if errors:
+        raise ValueError("; ".join(errors))
+    data = {field: _CONVERTERS[kind](obj.get(field)) for field, kind in FIELD_TYPES.items()}
+    validate_submission(data)
+    return data
@@ -0,0 +1,274 @@
+"""
+Export submission massal untuk dinas kesehatan / analitik.
+
+Baris dibaca dengan `values_list(...).iterator(chunk_size)` dan langsung
+ditulis per chunk, jadi memori tetap (satu chunk) berapa pun jumlah baris
+yang di-export. Format:
+
+- csv: layout dan header kolom ALL_FINAL.csv apa adanya (separator ';',
+  "Perkerjaan " dan spasi di belakang nama kolom ikut ditulis, kolom
+  "Label" berisi outcome yang sudah dicatat), ditambah kolom identitas dan
+  hasil prediksi di belakang. File bisa dibaca ulang oleh
+  `dataset.iter_csv_chunks`.
+- parquet: kolom sama (nama kolom yang sudah dinormalkan, tanpa spasi di
+  belakang) dengan tipe asli (bool/int/float/timestamp), satu row group
+  per chunk, terkompresi. Butuh pyarrow (opsional).
+
+Dipakai oleh action admin, view `export_submissions` dan command
+`manage.py export_screenings`.
+"""
+import csv
+import datetime
+import io
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import dataset
+
+# (kolom export, field ScreeningSubmission, tipe) setelah kolom ALL_FINAL.csv
+EXTRA_COLUMNS = [
+    ("ID", "id", "int"),
+    ("Tanggal", "created_at", "datetime"),
+    ("Nama Pasien", "patient_name", "str"),
+    ("Hasil Prediksi", "result", "str"),
+    ("Probabilitas Preeklampsia", "preeclampsia_probability", "float"),
+    ("Versi Model", "model_version", "str"),
+]
+EXPORT_COLUMNS = dataset.CSV_COLUMNS + [(dataset.LABEL_COLUMN, "outcome", "str")] + EXTRA_COLUMNS
+
+# Header CSV ALL_FINAL.csv apa adanya: ejaan "Perkerjaan" dan spasi di
+# belakang beberapa nama kolom. dataset.normalize_header menormalkannya lagi
+# saat file export dibaca ulang.
+_ALL_FINAL_TRAILING_SPACE = {
+    "Perkerjaan",
+    "Jarak Anak >10 tahun",
+    "Bayi Tabung",
+    "Perokok",
+    "Hamil Direncanakan",
+    "Hipertensi Kronis",
+    "Riwayat Penyakit Ginjal",
+    "Hipertensi Keluarga",
+    "Riwayat Penyakit Jantung Keluarga",
+}
+_ALL_FINAL_NAMES = {name: original for original, name in dataset.HEADER_ALIASES.items()}
+
+
+def _all_final_header(col):
+    name = _ALL_FINAL_NAMES.get(col, col)
+    return name + " " if name in _ALL_FINAL_TRAILING_SPACE else name
+
+
+def csv_header():
+    """Header CSV: kolom ALL_FINAL.csv dengan nama aslinya, lalu kolom tambahan."""
+    return [_all_final_header(col) for col, _, _ in EXPORT_COLUMNS]
+
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def _conf():
+    return getattr(settings, "SCREENING_EXPORT", {})
+
+
+def default_chunk_size():
+    return int(_conf().get("CHUNK_SIZE", 2000))
+
+
+# ==============
+# FILTER
+# ==============
+
+def start_of_day(value, name="date", offset_days=0):
+    """Awal hari (aware, zona waktu lokal) dari date atau string YYYY-MM-DD."""
+    if isinstance(value, str):
+        try:
+            value = datetime.date.fromisoformat(value.strip())
+        except ValueError:
+            raise ValueError(f"{name} harus berformat YYYY-MM-DD")
+    value += datetime.timedelta(days=offset_days)
+    return timezone.make_aware(datetime.datetime.combine(value, datetime.time.min))
+
+
+def filter_submissions(qs, date_from=None, date_to=None, district=None, result=None):
+    """
+    Filter bersama untuk export dan riwayat submission: date_from / date_to
+    (inklusif, zona waktu lokal), district (kabupaten/kota) dan result
+    (preeklampsia / non-preeklampsia). Rentang tanggal diubah ke batas
+    created_at supaya index (created_at, id) tetap terpakai. Raise
+    ValueError untuk nilai yang tidak valid.
+    """
+    result = (result or "").strip().lower().replace("-", "").replace(" ", "")
+    if result:
+        if result not in ("preeklampsia", "nonpreeklampsia"):
+            raise ValueError("result harus preeklampsia atau non-preeklampsia")
+        qs = qs.filter(is_preeclampsia=(result == "preeklampsia"))
+    district = (district or "").strip()
+    if district:
+        qs = qs.filter(district_city=district)
+    if date_from:
+        qs = qs.filter(created_at__gte=start_of_day(date_from, "date_from"))
+    if date_to:
+        qs = qs.filter(created_at__lt=start_of_day(date_to, "date_to", offset_days=1))
+    return qs
+
+
+def export_queryset(queryset=None, **filters):
+    """Queryset submission terfilter, urut id (urutan stabil untuk streaming)."""
+    if queryset is None:
+        from .models import ScreeningSubmission
+
+        queryset = ScreeningSubmission.objects.all()
+    return filter_submissions(queryset, **filters).order_by("id")
+
+
+# ==============
+# STREAMING
+# ==============
+
+def iter_chunks(queryset, chunk_size=None):
+    """Yield list tuple nilai (urutan EXPORT_COLUMNS), maks `chunk_size` per list."""
+    chunk_size = chunk_size or default_chunk_size()
+    rows = queryset.values_list(*[field for _, field, _ in EXPORT_COLUMNS]).iterator(chunk_size=chunk_size)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _csv_rows(chunk, tz):
+    """
+    Tuple nilai -> baris CSV. Hanya kolom bool (Ya/Tidak) dan datetime (waktu
+    lokal) yang perlu dikonversi; None ditulis kosong oleh modul csv.
+    """
+    yes_no = {True: "Ya", False: "Tidak", None: ""}
+    for row in chunk:
+        row = list(row)
+        for i in _BOOL_INDEXES:
+            row[i] = yes_no[row[i]]
+        for i in _DATETIME_INDEXES:
+            if row[i] is not None:
+                row[i] = row[i].astimezone(tz).strftime("%Y-%m-%d %H:%M:%S")
+        yield row
+
+
+_BOOL_INDEXES = [i for i, (_, _, kind) in enumerate(EXPORT_COLUMNS) if kind == "bool"]
+_DATETIME_INDEXES = [i for i, (_, _, kind) in enumerate(EXPORT_COLUMNS) if kind == "datetime"]
+
+
+def iter_csv(queryset, chunk_size=None):
+    """
+    Yield teks CSV per chunk (header dulu). String di-quote, angka tidak,
+    sama seperti ALL_FINAL.csv; BOM di depan supaya Excel membaca UTF-8.
+    """
+    tz = timezone.get_current_timezone()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=dataset.CSV_DELIMITER, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+    buffer.write("\ufeff")
+    writer.writerow(csv_header())
+    yield buffer.getvalue()
+    for chunk in iter_chunks(queryset, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_csv_rows(chunk, tz))
+        yield buffer.getvalue()
+
+
+class _ByteSink:
+    """File-like tujuan ParquetWriter; isinya diambil (dan dikosongkan) per row group."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def writable(self):
+        return True
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def iter_parquet(queryset, chunk_size=None, compression=None):
+    """
+    Yield bytes Parquet per row group (satu row group per chunk). pyarrow
+    dicek di sini, sebelum streaming dimulai: raise ImportError jika tidak
+    terpasang.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    compression = compression or _conf().get("PARQUET_COMPRESSION", "zstd")
+    types = {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+    }
+    schema = pa.schema([(col, types[kind]) for col, _, kind in EXPORT_COLUMNS])
+
+    def generate():
+        sink = _ByteSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression=compression)
+        try:
+            for chunk in iter_chunks(queryset, chunk_size):
+                columns = [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    return generate()
+
+
+def iter_export(queryset, fmt="csv", chunk_size=None):
+    """Iterator isi file export (str untuk csv, bytes untuk parquet)."""
+    if fmt == "csv":
+        return iter_csv(queryset, chunk_size)
+    if fmt == "parquet":
+        return iter_parquet(queryset, chunk_size)
+    raise ValueError(f"Format export tidak dikenal: {fmt} (pilih {', '.join(FORMATS)})")
+
+
+def filename(fmt):
+    return f"screening-submissions-{timezone.localtime().strftime('%Y%m%d-%H%M%S')}.{FORMATS[fmt][1]}"
+
+
+def streaming_response(queryset, fmt="csv", chunk_size=None):
+    """
+    StreamingHttpResponse berisi export `queryset`. Raise ValueError untuk
+    format yang tidak dikenal dan ImportError jika parquet diminta tanpa
+    pyarrow (sebelum response dibuat).
+    """
+    from django.http import StreamingHttpResponse
+
+    content = iter_export(queryset, fmt, chunk_size)
+    response = StreamingHttpResponse(content, content_type=FORMATS[fmt][0])
+    response["Content-Disposition"] = f'attachment; filename="{filename(fmt)}"'
+    return response
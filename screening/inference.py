@@ -0,0 +1,501 @@
+"""
+Mesin inferensi RandomForest yang sudah "dikompilasi" ke array NumPy.
+
+`RandomForestClassifier.predict` / `predict_proba` milik sklearn melewati
+validasi input, dispatch joblib dan pemanggilan per-tree untuk setiap
+request. Untuk satu baris pasien, overhead itu jauh lebih besar daripada
+aritmatika traversal tree-nya sendiri.
+
+`CompiledForest` meratakan semua tree di dalam forest menjadi beberapa
+array node yang kontigu (feature, threshold, children, leaf value) saat
+model di-load, lalu mengevaluasi semua tree sekaligus secara vectorized.
+Label dan probabilitas dihasilkan dari satu traversal yang sama, dan
+hasilnya identik (bit-for-bit) dengan `predict_proba` sklearn.
+
+`FeatureEncoder` melakukan hal yang sama untuk step `preprocess`
+(ColumnTransformer: SimpleImputer + OneHotEncoder): nilai imputasi dan
+mapping kategori -> kolom dihitung sekali saat load, lalu setiap submission
+ditulis langsung ke vector NumPy dengan lebar tetap, tanpa pandas.
+
+`ThreadBudget` mengatur berapa core yang boleh dipakai satu panggilan
+inferensi: prediksi satu baris selalu serial, batch / re-scoring boleh
+paralel sampai batas per worker (total core host dibagi jumlah worker).
+"""
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+
+# sklearn mengevaluasi tree dengan input float32 (sklearn.tree._tree.DTYPE)
+X_DTYPE = np.float32
+
+
+class CompiledForest:
+    """
+    Representasi flat dari RandomForestClassifier (satu output).
+
+    Semua node dari semua tree disimpan dalam satu array global. Leaf
+    menunjuk ke dirinya sendiri sebagai child kiri dan kanan, sehingga
+    traversal cukup diulang sebanyak `max_depth` kali tanpa percabangan.
+    """
+
+    def __init__(
+        self,
+        feature,
+        threshold,
+        children_left,
+        children_right,
+        missing_go_to_left,
+        leaf_value,
+        roots,
+        classes,
+        n_features,
+        max_depth,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.missing_go_to_left = missing_go_to_left
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+        self.max_depth = int(max_depth)
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    @property
+    def node_count(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        """Ukuran semua array node + leaf di memori (byte)."""
+        return sum(
+            arr.nbytes
+            for arr in (
+                self.feature,
+                self.threshold,
+                self.children_left,
+                self.children_right,
+                self.missing_go_to_left,
+                self.leaf_value,
+                self.roots,
+            )
+        )
+
+    @classmethod
+    def from_estimator(cls, model):
+        """
+        Bangun CompiledForest dari RandomForestClassifier yang sudah di-fit,
+        atau dari Pipeline yang step terakhirnya adalah RandomForestClassifier.
+        """
+        forest = model.steps[-1][1] if hasattr(model, "steps") else model
+
+        if not hasattr(forest, "estimators_"):
+            raise ValueError(f"{type(forest).__name__} belum di-fit atau bukan forest")
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("CompiledForest hanya mendukung forest dengan satu output")
+
+        n_classes = int(forest.n_classes_)
+        return cls.from_trees(
+            [tree_arrays(est.tree_, n_classes) for est in forest.estimators_],
+            classes=np.asarray(forest.classes_),
+            n_features=forest.n_features_in_,
+        )
+
+    @classmethod
+    def from_trees(cls, trees, classes, n_features):
+        """
+        Gabungkan tree-tree (dict dari `tree_arrays`, children -1 untuk leaf,
+        value sudah dinormalisasi) menjadi satu CompiledForest.
+        """
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for tree in trees:
+            n_nodes = len(tree["children_left"])
+            node_ids = np.arange(n_nodes, dtype=np.intp)
+            is_leaf = tree["children_left"] == -1
+
+            # Leaf menunjuk ke dirinya sendiri supaya traversal bisa "diam" di leaf
+            left = np.where(is_leaf, node_ids, tree["children_left"]) + offset
+            right = np.where(is_leaf, node_ids, tree["children_right"]) + offset
+
+            features.append(np.where(is_leaf, 0, tree["feature"]))
+            thresholds.append(tree["threshold"])
+            lefts.append(left)
+            rights.append(right)
+            missing.append(tree["missing_go_to_left"])
+            values.append(tree["value"])
+            roots.append(offset)
+
+            offset += n_nodes
+            max_depth = max(max_depth, tree["max_depth"])
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            children_left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            children_right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            missing_go_to_left=np.ascontiguousarray(np.concatenate(missing)),
+            leaf_value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            classes=np.asarray(classes),
+            n_features=n_features,
+            max_depth=max_depth,
+        )
+
+    # Array yang disimpan ke bundle (lihat model_bundle.py)
+    ARRAY_FIELDS = (
+        "feature",
+        "threshold",
+        "children_left",
+        "children_right",
+        "missing_go_to_left",
+        "leaf_value",
+        "roots",
+    )
+
+    def to_arrays(self):
+        """Return (arrays, meta) untuk disimpan; kebalikan dari `from_arrays`."""
+        arrays = {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+        meta = {
+            "classes": self.classes_.tolist(),
+            "n_features": self.n_features_in_,
+            "max_depth": self.max_depth,
+        }
+        return arrays, meta
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        return cls(
+            **{name: arrays[name] for name in cls.ARRAY_FIELDS},
+            classes=np.asarray(meta["classes"]),
+            n_features=meta["n_features"],
+            max_depth=meta["max_depth"],
+        )
+
+    # ==============
+    # TRAVERSAL
+    # ==============
+
+    def _validate(self, X):
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X punya {X.shape[-1]} fitur, model mengharapkan {self.n_features_in_} fitur"
+            )
+        return np.ascontiguousarray(X, dtype=X_DTYPE)
+
+    def apply(self, X):
+        """
+        Kembalikan index leaf (global) untuk setiap baris dan setiap tree,
+        shape (n_samples, n_estimators).
+        """
+        X = self._validate(X)
+        n_samples = X.shape[0]
+
+        # Offset baris di X yang sudah di-ravel: X_flat[row_offset + feature]
+        row_offset = (np.arange(n_samples, dtype=np.intp) * self.n_features_in_)[:, np.newaxis]
+        X_flat = X.ravel()
+        has_nan = bool(np.isnan(X_flat).any())
+
+        node = np.repeat(self.roots[np.newaxis, :], n_samples, axis=0)
+        for _ in range(self.max_depth):
+            x = X_flat[row_offset + self.feature[node]]
+            go_left = x <= self.threshold[node]
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_go_to_left[node]
+            node = np.where(go_left, self.children_left[node], self.children_right[node])
+        return node
+
+    def _predict_proba(self, X):
+        leaves = self.apply(X)
+        # (n_estimators, n_samples, n_classes) lalu dijumlah berurutan per tree,
+        # sama dengan akumulasi `out += prediction` di sklearn (n_jobs=1)
+        per_tree = self.leaf_value[leaves.T]
+        # Akumulasi selalu float64, juga untuk bundle dengan leaf_value float16/32
+        proba = np.add.reduce(per_tree, axis=0, dtype=np.float64)
+        proba /= self.n_estimators
+        return proba
+
+    def predict_proba(self, X, n_jobs=1):
+        """
+        Probabilitas per kelas. Dengan n_jobs > 1, baris dibagi ke beberapa
+        thread (operasi NumPy melepas GIL); hasilnya tetap identik karena
+        setiap baris dihitung independen.
+        """
+        X = self._validate(X)
+        n_jobs = min(int(n_jobs or 1), X.shape[0])
+        if n_jobs <= 1:
+            return self._predict_proba(X)
+
+        chunks = np.array_split(X, n_jobs)
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return np.concatenate(list(executor.map(self._predict_proba, chunks)))
+
+    def predict_with_proba(self, X, n_jobs=1):
+        """
+        Label dan probabilitas dari satu traversal.
+        Return: (labels, proba)
+        """
+        proba = self.predict_proba(X, n_jobs=n_jobs)
+        labels = self.classes_.take(np.argmax(proba, axis=1), axis=0)
+        return labels, proba
+
+    def predict(self, X, n_jobs=1):
+        return self.predict_with_proba(X, n_jobs=n_jobs)[0]
+
+
+def tree_arrays(tree, n_classes):
+    """
+    Array satu `sklearn.tree._tree.Tree` dengan value yang sudah dinormalisasi
+    (sama persis dengan DecisionTreeClassifier.predict_proba), plus bobot
+    sampel per node untuk kompresi (lihat compression.py).
+    """
+    value = tree.value[:, 0, :n_classes]
+    normalizer = value.sum(axis=1)[:, np.newaxis]
+    normalizer[normalizer == 0.0] = 1.0
+    n_nodes = tree.node_count
+    return {
+        "children_left": np.asarray(tree.children_left),
+        "children_right": np.asarray(tree.children_right),
+        "feature": np.asarray(tree.feature),
+        "threshold": np.asarray(tree.threshold),
+        "missing_go_to_left": np.asarray(getattr(tree, "missing_go_to_left", np.zeros(n_nodes)), dtype=bool),
+        "value": value / normalizer,
+        "weight": np.asarray(tree.weighted_n_node_samples),
+        "max_depth": int(tree.max_depth),
+    }
+
+
+# ==============
+# FEATURE ENCODER
+# ==============
+
+def _is_nan(val):
+    return isinstance(val, float) and val != val
+
+
+class FeatureEncoder:
+    """
+    Versi "compiled" dari ColumnTransformer hasil training.
+
+    Input berupa dict {nama kolom training: nilai} (sama seperti `row` di
+    views.submit_screening), output berupa vector float64 yang identik
+    dengan `preprocess.transform(pd.DataFrame([row]))`.
+
+    Perilaku imputasi mengikuti sklearn persis:
+    - kolom numerik: None / NaN diisi median hasil fit
+    - kolom kategorikal: hanya NaN yang dianggap missing (diisi most_frequent);
+      None dianggap kategori tidak dikenal -> semua kolom one-hot bernilai 0
+    """
+
+    def __init__(self, numeric, categorical, n_features_out):
+        # numeric: list of (kolom, nilai_imputasi, index_output)
+        # categorical: list of (kolom, nilai_imputasi, {kategori: index_output}, handle_unknown)
+        self.numeric = numeric
+        self.categorical = categorical
+        self.n_features_out = int(n_features_out)
+
+    @property
+    def columns(self):
+        """Kolom input yang benar-benar dipakai model."""
+        return [c[0] for c in self.numeric] + [c[0] for c in self.categorical]
+
+    @classmethod
+    def from_estimator(cls, model):
+        """
+        Bangun FeatureEncoder dari Pipeline (step pertama = ColumnTransformer)
+        atau langsung dari ColumnTransformer yang sudah di-fit.
+        """
+        preprocess = model.steps[0][1] if hasattr(model, "steps") else model
+        if not hasattr(preprocess, "transformers_"):
+            raise ValueError(f"{type(preprocess).__name__} bukan ColumnTransformer yang sudah di-fit")
+
+        numeric, categorical = [], []
+        offset = 0
+        for name, transformer, cols in preprocess.transformers_:
+            if transformer == "drop" or len(cols) == 0:
+                continue
+            if transformer == "passthrough":
+                raise ValueError(f"Transformer '{name}' (passthrough) belum didukung FeatureEncoder")
+
+            steps = [s for _, s in transformer.steps] if hasattr(transformer, "steps") else [transformer]
+            imputer = None
+            onehot = None
+            for step in steps:
+                if hasattr(step, "statistics_") and onehot is None and imputer is None:
+                    imputer = step
+                elif hasattr(step, "categories_") and onehot is None:
+                    onehot = step
+                else:
+                    raise ValueError(f"Step {type(step).__name__} di '{name}' belum didukung FeatureEncoder")
+
+            if imputer is not None and not _is_nan(imputer.missing_values):
+                raise ValueError("FeatureEncoder hanya mendukung SimpleImputer(missing_values=np.nan)")
+            if onehot is not None:
+                if onehot.drop_idx_ is not None or getattr(onehot, "_infrequent_enabled", False):
+                    raise ValueError("FeatureEncoder belum mendukung OneHotEncoder dengan drop/infrequent")
+
+            for i, col in enumerate(cols):
+                fill = imputer.statistics_[i] if imputer is not None else None
+                if onehot is None:
+                    fill = float(fill) if fill is not None else None
+                    if fill is not None and fill != fill and not imputer.keep_empty_features:
+                        # sklearn membuang kolom yang seluruhnya kosong saat fit
+                        continue
+                    numeric.append((col, fill, offset))
+                    offset += 1
+                else:
+                    categories = onehot.categories_[i]
+                    index = {cat: offset + j for j, cat in enumerate(categories.tolist())}
+                    categorical.append((col, fill, index, onehot.handle_unknown))
+                    offset += len(categories)
+
+        return cls(numeric, categorical, offset)
+
+    def to_dict(self):
+        """Spesifikasi encoder yang bisa di-serialize ke JSON."""
+        categorical = []
+        for col, fill, index, handle_unknown in self.categorical:
+            categories = sorted(index, key=index.get)
+            categorical.append({
+                "column": col,
+                "fill": fill,
+                "offset": index[categories[0]] if categories else None,
+                "categories": categories,
+                "handle_unknown": handle_unknown,
+            })
+        return {
+            "n_features_out": self.n_features_out,
+            "numeric": [{"column": c, "fill": f, "index": i} for c, f, i in self.numeric],
+            "categorical": categorical,
+        }
+
+    @classmethod
+    def from_dict(cls, spec):
+        numeric = [(n["column"], n["fill"], n["index"]) for n in spec["numeric"]]
+        categorical = [
+            (
+                c["column"],
+                c["fill"],
+                {cat: c["offset"] + j for j, cat in enumerate(c["categories"])},
+                c["handle_unknown"],
+            )
+            for c in spec["categorical"]
+        ]
+        return cls(numeric, categorical, spec["n_features_out"])
+
+    def transform_row(self, row, out=None):
+        """
+        Encode satu baris (dict) ke vector dengan lebar `n_features_out`.
+        Jika `out` diberikan, hasil ditulis langsung ke array tersebut.
+        """
+        if out is None:
+            out = np.zeros(self.n_features_out, dtype=np.float64)
+        else:
+            out[:] = 0.0
+
+        try:
+            for col, fill, idx in self.numeric:
+                val = row[col]
+                if val is None or _is_nan(val):
+                    val = fill
+                out[idx] = float(val)
+
+            for col, fill, index, handle_unknown in self.categorical:
+                val = row[col]
+                if _is_nan(val):
+                    val = fill
+                pos = index.get(val)
+                if pos is not None:
+                    out[pos] = 1.0
+                elif handle_unknown == "error":
+                    raise ValueError(f"Kategori tidak dikenal {val!r} pada kolom '{col}'")
+        except KeyError as e:
+            raise ValueError(f"Kolom input hilang: {e.args[0]!r}") from None
+        return out
+
+    def transform_rows(self, rows):
+        """Encode banyak baris (list of dict) ke matrix (n_rows, n_features_out)."""
+        out = np.zeros((len(rows), self.n_features_out), dtype=np.float64)
+        for i, row in enumerate(rows):
+            self.transform_row(row, out=out[i])
+        return out
+
+
+# ==============
+# THREAD BUDGET
+# ==============
+
+class ThreadBudget:
+    """
+    Kebijakan jumlah thread untuk inferensi.
+
+    - Prediksi kecil (< 2 * min_rows_per_job baris) selalu serial: dispatch
+      paralel joblib untuk satu baris hanya menambah biaya start-up thread.
+    - Batch / re-scoring memakai sampai `batch_n_jobs` core.
+    - Batas global: `host_max_threads` dibagi jumlah worker web di host,
+      supaya beberapa worker gunicorn tidak saling berebut CPU.
+    """
+
+    def __init__(self, batch_n_jobs=-1, host_max_threads=None, workers=None, min_rows_per_job=256):
+        cpu_count = os.cpu_count() or 1
+        self.host_max_threads = int(host_max_threads or cpu_count)
+        self.workers = max(int(workers or os.environ.get("WEB_CONCURRENCY") or 1), 1)
+        self.batch_n_jobs = cpu_count if batch_n_jobs in (None, -1) else max(int(batch_n_jobs), 1)
+        self.min_rows_per_job = max(int(min_rows_per_job), 1)
+
+    @classmethod
+    def from_settings(cls, conf):
+        conf = conf or {}
+        return cls(
+            batch_n_jobs=conf.get("BATCH_N_JOBS", -1),
+            host_max_threads=conf.get("HOST_MAX_THREADS"),
+            workers=conf.get("WORKERS"),
+            min_rows_per_job=conf.get("MIN_ROWS_PER_JOB", 256),
+        )
+
+    @property
+    def per_worker_cap(self):
+        return max(self.host_max_threads // self.workers, 1)
+
+    def n_jobs_for(self, n_rows):
+        if n_rows < 2 * self.min_rows_per_job:
+            return 1
+        by_rows = math.ceil(n_rows / self.min_rows_per_job)
+        return max(min(self.batch_n_jobs, self.per_worker_cap, by_rows), 1)
+
+    @contextmanager
+    def sklearn_context(self, n_rows):
+        """
+        Context untuk prediksi lewat sklearn. Forest harus disiapkan dengan
+        `prepare_for_inference` (n_jobs=None) supaya setting ini berlaku.
+        """
+        from joblib import parallel_config
+
+        with parallel_config(backend="threading", n_jobs=self.n_jobs_for(n_rows)):
+            yield
+
+
+def prepare_for_inference(model):
+    """
+    Model hasil training disimpan dengan n_jobs=-1. Set ke None supaya
+    jumlah thread ditentukan oleh context (default joblib: serial), bukan
+    selalu memakai semua core untuk setiap panggilan predict.
+    """
+    forest = model.steps[-1][1] if hasattr(model, "steps") else model
+    if hasattr(forest, "n_jobs"):
+        forest.n_jobs = None
+    return model
@@ -0,0 +1,308 @@
+"""
+Load generator lokal untuk perencanaan kapasitas.
+
+Pasien sintetis diambil dari distribusi empiris ALL_FINAL.csv (tidak ada
+data pasien asli yang dikirim):
+
+- label dipilih sesuai proporsi Preeklampsia / NonPreeklampsia di dataset;
+- field kategorikal/boolean diambil sebagai satu tuple dari baris acak
+  dengan label yang sama, sehingga kombinasi (kabupaten, pendidikan,
+  paritas, riwayat, ...) tetap realistis;
+- field numerik diambil dari normal multivariat (mean + kovarians per
+  label), di-clip ke rentang yang teramati, lalu IMT dan MAP dihitung ulang
+  dari BB/TB dan tekanan darah supaya konsisten.
+
+Setiap client virtual menjalankan sesi seperti petugas sungguhan:
+login -> form screening -> submit (halaman hasil) -> download PDF, dengan
+sesekali membuka dashboard, memakai urllib + cookie jar (session + CSRF).
+
+    python manage.py loadgen --url http://127.0.0.1:8000 --clients 20 --duration 60
+"""
+import http.cookiejar
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from . import dataset
+
+DEFAULT_PASSWORD = "loadgen-Passw0rd!"
+SUBMISSION_ID_RE = re.compile(rb"submission_id=(\d+)")
+
+
+# ==============
+# PASIEN SINTETIS
+# ==============
+
+class SyntheticPatients:
+    def __init__(self, records, seed=None):
+        import numpy as np
+
+        self._rng = random.Random(seed)
+        self._np_rng = np.random.default_rng(seed)
+        self.numeric = [f for _, f, kind in dataset.CSV_COLUMNS if kind in ("int", "float")]
+        self.kinds = {f: kind for _, f, kind in dataset.CSV_COLUMNS}
+        self.categorical = [f for _, f, kind in dataset.CSV_COLUMNS if kind in ("str", "bool")]
+
+        groups = {}
+        for record in records:
+            label = dataset.normalize_label(record.get(dataset.LABEL_COLUMN))
+            groups.setdefault(label, []).append(dataset.submission_fields(record))
+        if not groups:
+            raise ValueError("Dataset kosong, tidak bisa membuat pasien sintetis")
+
+        self.labels = sorted(groups)
+        self.label_weights = [len(groups[label]) for label in self.labels]
+        self.groups = {}
+        for label, rows in groups.items():
+            complete = [r for r in rows if all(r.get(f) is not None for f in self.numeric)]
+            matrix = np.array([[float(r[f]) for f in self.numeric] for r in complete or rows], dtype=float)
+            cov = np.atleast_2d(np.cov(matrix, rowvar=False)) if len(matrix) > 1 else np.zeros((len(self.numeric),) * 2)
+            self.groups[label] = {
+                "categorical": [tuple(r.get(f) for f in self.categorical) for r in rows],
+                "mean": np.nanmean(matrix, axis=0),
+                "cov": cov,
+                "low": np.nanmin(matrix, axis=0),
+                "high": np.nanmax(matrix, axis=0),
+            }
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_csv(cls, path, seed=None):
+        records = []
+        with open(path, newline="", encoding="utf-8") as fh:
+            for chunk in dataset.iter_csv_chunks(fh, chunk_size=1000):
+                records.extend(record for _, record in chunk)
+        return cls(records, seed=seed)
+
+    def sample(self):
+        """Satu pasien sintetis sebagai dict field ScreeningSubmission (+ `_label`)."""
+        import numpy as np
+
+        with self._lock:
+            self._counter += 1
+            n = self._counter
+            label = self._rng.choices(self.labels, weights=self.label_weights)[0]
+            group = self.groups[label]
+            cats = self._rng.choice(group["categorical"])
+            values = self._np_rng.multivariate_normal(group["mean"], group["cov"], check_valid="ignore")
+
+        values = np.clip(values, group["low"], group["high"])
+        data = {"patient_name": f"Pasien Sintetis {n}", "_label": label}
+        data.update(zip(self.categorical, cats))
+        for field, value in zip(self.numeric, values):
+            data[field] = int(round(value)) if self.kinds[field] == "int" else round(float(value), 1)
+
+        if data["diastolic_bp"] >= data["systolic_bp"]:
+            data["diastolic_bp"], data["systolic_bp"] = data["systolic_bp"], data["diastolic_bp"]
+        if data["height_cm"]:
+            data["bmi"] = round(data["pre_pregnancy_weight"] / (data["height_cm"] / 100.0) ** 2, 1)
+        data["map_mmhg"] = round((data["systolic_bp"] + 2 * data["diastolic_bp"]) / 3.0, 1)
+        return data
+
+
+def form_payload(patient):
+    """Field pasien -> nilai POST form /submit/ (boolean sebagai "1"/"0")."""
+    payload = {"patient_name": patient["patient_name"]}
+    for _, field, kind in dataset.CSV_COLUMNS:
+        value = patient.get(field)
+        if value is None:
+            payload[field] = ""
+        elif kind == "bool":
+            payload[field] = "1" if value else "0"
+        else:
+            payload[field] = str(value)
+    return payload
+
+
+# ==============
+# STATISTIK
+# ==============
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = {}  # endpoint -> [ms]
+        self.statuses = {}  # endpoint -> {status: n}
+        self.errors = {}  # endpoint -> n
+        self.samples = []  # contoh pesan error (maks 20)
+        self.sessions = 0
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, ms, status, error=None):
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(ms)
+            codes = self.statuses.setdefault(endpoint, {})
+            codes[status] = codes.get(status, 0) + 1
+            if error is not None:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+                if len(self.samples) < 20:
+                    self.samples.append(f"{endpoint}: {error}")
+
+    def report(self, wall_s):
+        from .benchmarks.common import summarize
+
+        endpoints = {}
+        total = errors = 0
+        for endpoint, samples in sorted(self.latencies.items()):
+            n_errors = self.errors.get(endpoint, 0)
+            total += len(samples)
+            errors += n_errors
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "errors": n_errors,
+                "error_rate": n_errors / len(samples),
+                "throughput_rps": len(samples) / wall_s if wall_s else 0.0,
+                "status": {str(k): v for k, v in sorted(self.statuses[endpoint].items(), key=lambda kv: str(kv[0]))},
+                "latency": summarize(samples),
+            }
+        return {
+            "wall_s": wall_s,
+            "sessions": self.sessions,
+            "requests": total,
+            "errors": errors,
+            "error_rate": errors / total if total else 0.0,
+            "throughput_rps": total / wall_s if wall_s else 0.0,
+            "endpoints": endpoints,
+            "error_samples": list(self.samples),
+        }
+
+
+# ==============
+# CLIENT
+# ==============
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Redirect tidak diikuti supaya setiap endpoint diukur sendiri-sendiri
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Client:
+    """Satu browser virtual: cookie jar sendiri (session + csrftoken)."""
+
+    def __init__(self, base_url, stats, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.stats = stats
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect)
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        return ""
+
+    def request(self, endpoint, path, data=None, params=None, expect=(200,)):
+        """
+        Kirim satu request dan catat latency-nya ke stats. Return
+        (status, body) atau (None, b"") jika koneksi gagal.
+        """
+        url = self.base_url + path
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        headers = {}
+        body = None
+        if data is not None:
+            data = dict(data, csrfmiddlewaretoken=self.csrf_token())
+            body = urllib.parse.urlencode(data).encode()
+            headers["Referer"] = url
+        req = urllib.request.Request(url, data=body, headers=headers)
+
+        t0 = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=self.timeout) as response:
+                status, content = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, content = e.code, e.read()
+        except (urllib.error.URLError, OSError) as e:
+            self.stats.record(endpoint, (time.perf_counter() - t0) * 1000.0, "conn", error=str(e))
+            return None, b""
+        ms = (time.perf_counter() - t0) * 1000.0
+        error = None if status in expect else f"HTTP {status} {path}"
+        self.stats.record(endpoint, ms, status, error=error)
+        return status, content
+
+
+def run_session(client, patients, email, password, submits=3, dashboard_ratio=0.1, think_s=0.0, rng=random):
+    """login -> (form -> submit -> download) x submits -> [dashboard] -> logout."""
+    client.request("login_page", "/login/")
+    status, _ = client.request("login", "/login/", {"email": email, "password": password}, expect=(302, 200))
+    if status == 200:
+        # Akun belum ada: daftar dulu, lalu login ulang
+        client.request(
+            "register",
+            "/register/",
+            {"name": "Load Generator", "email": email, "password": password, "confirm_password": password},
+            expect=(302,),
+        )
+        status, _ = client.request("login", "/login/", {"email": email, "password": password}, expect=(302,))
+    if status != 302:
+        return
+
+    for _ in range(submits):
+        client.request("screening_form", "/screening/")
+        if think_s:
+            time.sleep(rng.uniform(0, 2 * think_s))
+        patient = patients.sample()
+        status, content = client.request("submit", "/submit/", form_payload(patient))
+        match = SUBMISSION_ID_RE.search(content) if status == 200 else None
+        if match is None:
+            continue
+        client.request("download", "/download/", params={"submission_id": match.group(1).decode()})
+        if think_s:
+            time.sleep(rng.uniform(0, 2 * think_s))
+
+    if rng.random() < dashboard_ratio:
+        client.request("dashboard", "/dashboard/")
+    client.request("logout", "/logout/", expect=(302, 200))
+
+
+def run(base_url, patients, clients=10, duration=60.0, sessions=None, submits=3, dashboard_ratio=0.1,
+        think_s=0.0, users=None, password=DEFAULT_PASSWORD, email_template="loadgen-{}@example.com",
+        timeout=30, seed=None, progress=None):
+    """
+    Jalankan `clients` client paralel selama `duration` detik (atau sampai
+    total `sessions` sesi selesai). Akun dibagi bergiliran dari `users`
+    akun (default: satu akun per client). Return dict laporan.
+    """
+    stats = LoadStats()
+    users = users or clients
+    deadline = time.perf_counter() + duration if duration else None
+    remaining = [sessions]
+    lock = threading.Lock()
+
+    def take_session():
+        with lock:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if remaining[0] is not None:
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+            stats.sessions += 1
+            return True
+
+    def worker(i):
+        rng = random.Random(None if seed is None else seed + i)
+        email = email_template.format(i % users)
+        while take_session():
+            run_session(Client(base_url, stats, timeout=timeout), patients, email, password,
+                        submits=submits, dashboard_ratio=dashboard_ratio, think_s=think_s, rng=rng)
+            if progress is not None:
+                progress(stats)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    result = stats.report(time.perf_counter() - started)
+    result["clients"] = clients
+    result["base_url"] = base_url
+    return result
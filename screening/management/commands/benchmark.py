@@ -0,0 +1,111 @@
+import json
+import os
+import platform
+import subprocess
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from screening.benchmarks import SUITES, run_suite
+
+
+class Command(BaseCommand):
+    help = "Jalankan benchmark aplikasi screening dan simpan hasilnya sebagai JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "suites",
+            nargs="*",
+            help=f"Suite yang dijalankan (default: semua). Pilihan: {', '.join(SUITES)}",
+        )
+        parser.add_argument("--output", help="Path file JSON untuk hasil benchmark")
+        parser.add_argument("--repeat", type=int, default=50, help="Jumlah pengulangan per pengukuran")
+        parser.add_argument("--workers", type=int, default=4, help="Jumlah proses worker untuk suite multi-proses")
+        parser.add_argument(
+            "--sizes",
+            help="Jumlah submission untuk suite pages, dipisah koma (default: 10000,100000,1000000)",
+        )
+        parser.add_argument("--compare", help="File JSON hasil sebelumnya; tampilkan selisih latency terhadapnya")
+
+    def handle(self, *args, **options):
+        suites = options["suites"] or list(SUITES)
+        unknown = [s for s in suites if s not in SUITES]
+        if unknown:
+            raise CommandError(f"Suite tidak dikenal: {', '.join(unknown)}")
+        if options["sizes"]:
+            try:
+                options["sizes"] = [int(s) for s in options["sizes"].split(",") if s.strip()]
+            except ValueError:
+                raise CommandError("--sizes harus berupa daftar angka dipisah koma")
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"], encoding="utf-8") as fh:
+                    baseline = json.load(fh)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Gagal membaca baseline {options['compare']}: {e}")
+
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git": _git_info(),
+            "suites": {},
+        }
+        for name in suites:
+            self.stdout.write(f"== {name}")
+            started = time.perf_counter()
+            report["suites"][name] = run_suite(name, options)
+            self.stdout.write(json.dumps(report["suites"][name], indent=2))
+            self.stdout.write(f"   ({time.perf_counter() - started:.1f}s)")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Hasil disimpan ke {options['output']}"))
+
+        if baseline is not None:
+            base_git = (baseline.get("git") or {}).get("commit") or "?"
+            self.stdout.write(f"== perbandingan dengan {options['compare']} (commit {base_git[:12]})")
+            for path, old, new in _diff(baseline.get("suites", {}), report["suites"]):
+                change = (new - old) / old * 100.0 if old else float("inf")
+                line = f"{path:<70} {old:>11.3f} -> {new:>11.3f}  {change:+7.1f}%"
+                if change > 10:
+                    line = self.style.WARNING(line)
+                elif change < -10:
+                    line = self.style.SUCCESS(line)
+                self.stdout.write(line)
+
+
+def _git_info():
+    """Commit yang sedang diukur, supaya hasil antar-commit bisa dibandingkan."""
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {"commit": commit, "dirty": bool(dirty)}
+
+
+def _diff(old, new, prefix=""):
+    """
+    Pasangan (path, nilai_lama, nilai_baru) untuk setiap angka berakhiran
+    _ms / _s yang ada di kedua hasil.
+    """
+    for key, value in new.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if key not in old:
+            continue
+        if isinstance(value, dict) and isinstance(old[key], dict):
+            yield from _diff(old[key], value, path)
+        elif (
+            key.endswith(("_ms", "_s"))
+            and isinstance(value, (int, float))
+            and isinstance(old[key], (int, float))
+        ):
+            yield path, float(old[key]), float(value)
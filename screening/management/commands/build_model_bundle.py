@@ -0,0 +1,32 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from screening.model_bundle import build_bundle, bundle_path_for
+
+
+class Command(BaseCommand):
+    help = "Compile pipeline joblib menjadi bundle .npy yang bisa di-mmap oleh semua worker."
+
+    def add_arguments(self, parser):
+        from screening import views
+
+        parser.add_argument("--model", default=views.MODEL_PATH, help="Path file pipeline .joblib")
+        parser.add_argument("--out", help="Direktori bundle (default: <model>.bundle)")
+
+    def handle(self, *args, **options):
+        model_path = options["model"]
+        if not os.path.exists(model_path):
+            raise CommandError(f"File model tidak ditemukan: {model_path}")
+
+        out = options["out"] or bundle_path_for(model_path)
+        meta = build_bundle(model_path, out)
+        size = sum(
+            os.path.getsize(os.path.join(out, name)) for name in os.listdir(out)
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Bundle ditulis ke {out} ({size / 1024:.0f} KiB, "
+                f"{meta['arrays']['roots']['shape'][0]} trees, sha256 sumber {meta['source_sha256'][:12]})"
+            )
+        )
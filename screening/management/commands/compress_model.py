@@ -0,0 +1,281 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from screening import compression, predictor, training
+from screening.inference import CompiledForest, FeatureEncoder
+from screening.model_bundle import bundle_path_for, load_bundle, save_bundle
+from screening.registry import RegistryError
+
+# (label, key laporan): latency yang lebih besar sesudah kompresi diberi peringatan
+LATENCY_KEYS = (
+    ("1 baris p50", "single_p50_ms"),
+    ("1 baris p99", "single_p99_ms"),
+    ("batch per baris", "batch_per_row_us"),
+)
+
+
+def _dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+class Command(BaseCommand):
+    help = (
+        "Kompres RandomForest hasil training (buang tree menurut metrik OOB, collapse subtree "
+        "seragam, dtype sempit) lalu tulis sebagai artefak baru (joblib + bundle mmap) yang "
+        "didaftarkan di registry tanpa diaktifkan, dengan laporan ukuran, waktu load dan "
+        "latency sebelum/sesudah."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", help="Path file pipeline .joblib (default: versi aktif di registry)")
+        parser.add_argument("--dataset", default=training.DEFAULT_CSV, help="CSV training model tersebut")
+        parser.add_argument(
+            "--out", help="Path artefak .joblib baru (wajib kecuali --dry-run; bundle ditulis ke <out>.bundle)"
+        )
+        parser.add_argument("--model-version", help="Nama versi registry (default: <versi sumber>-compressed-<timestamp>)")
+        parser.add_argument("--no-register", action="store_true", help="Tulis artefak tanpa mendaftarkannya di registry")
+        parser.add_argument(
+            "--allow-slower",
+            action="store_true",
+            help="Tetap daftarkan di registry walaupun latency sesudah kompresi lebih buruk",
+        )
+        parser.add_argument("--min-trees", type=int, default=50, help="Jumlah tree minimal yang dipertahankan")
+        parser.add_argument("--tolerance", type=float, default=0.0, help="Penurunan metrik OOB yang masih diterima")
+        parser.add_argument("--collapse", choices=compression.COLLAPSE_MODES, default="vote")
+        parser.add_argument(
+            "--proba-tolerance", type=float, default=5e-4, help="Selisih probabilitas maks. untuk leaf float16/32"
+        )
+        parser.add_argument("--report", help="Path file JSON untuk laporan")
+        parser.add_argument("--dry-run", action="store_true", help="Hanya laporan, artefak tidak ditulis")
+
+    def _source(self, reg, model_path):
+        """(path, versi, sha256) model sumber: --model, versi aktif registry, atau MODEL_PATH."""
+        if model_path:
+            return model_path, None, None
+        entry = reg.active() if reg.exists() else None
+        if entry is None:
+            return predictor.MODEL_PATH, predictor.UNVERSIONED, None
+        try:
+            return reg.verify(entry), entry["version"], entry["sha256"]
+        except RegistryError as e:
+            raise CommandError(str(e))
+
+    def _check_out(self, reg, out, model_path):
+        """
+        Artefak kompresi selalu file baru: tidak boleh menimpa model sumber,
+        model default, artefak yang terdaftar, atau bundle yang sedang dipakai.
+        """
+        out = os.path.abspath(out)
+        protected = {os.path.abspath(model_path), os.path.abspath(predictor.MODEL_PATH)}
+        if reg.exists():
+            protected.update(os.path.abspath(reg.artifact_path(e)) for e in reg.versions())
+        protected.update(bundle_path_for(p) for p in list(protected))
+        if out in protected or bundle_path_for(out) in protected:
+            raise CommandError(f"--out tidak boleh menimpa model atau bundle yang sudah ada: {out}")
+        for path in (out, bundle_path_for(out)):
+            if os.path.exists(path):
+                raise CommandError(f"Sudah ada, pilih --out lain: {path}")
+        return out
+
+    def handle(self, *args, **options):
+        import joblib
+
+        reg = predictor.registry()
+        model_path, parent_version, parent_sha = self._source(reg, options["model"])
+        if not os.path.exists(model_path):
+            raise CommandError(f"File model tidak ditemukan: {model_path}")
+        if not os.path.exists(options["dataset"]):
+            raise CommandError(f"File dataset tidak ditemukan: {options['dataset']}")
+        out = None
+        if not options["dry_run"]:
+            if not options["out"]:
+                raise CommandError("--out wajib diisi: hasil kompresi ditulis sebagai artefak baru")
+            out = self._check_out(reg, options["out"], model_path)
+
+        started = time.perf_counter()
+        pipeline = joblib.load(model_path)
+        encoder = FeatureEncoder.from_estimator(pipeline)
+        original = CompiledForest.from_estimator(pipeline)
+        joblib_load_s = time.perf_counter() - started
+
+        X, y = training.load_training_frame(options["dataset"])
+        try:
+            engine, info = compression.compress(
+                pipeline,
+                X,
+                y,
+                tolerance=options["tolerance"],
+                min_trees=options["min_trees"],
+                collapse=options["collapse"],
+                proba_tolerance=options["proba_tolerance"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        rows = X.to_dict("records")
+        tmp = tempfile.mkdtemp(prefix="compress-")
+        try:
+            before_dir = os.path.join(tmp, "before.bundle")
+            after_dir = os.path.join(tmp, "after.bundle")
+            save_bundle(encoder, original, before_dir, source_path=model_path)
+            save_bundle(encoder, engine, after_dir, extra_meta={"compression": info})
+            sides = {}
+            for name, path, eng in (("before", before_dir, original), ("after", after_dir, engine)):
+                t0 = time.perf_counter()
+                load_bundle(path, mmap=False)
+                load_s = time.perf_counter() - t0
+                sides[name] = {
+                    "bundle_bytes": _dir_bytes(path),
+                    "bundle_load_s": load_s,
+                    **training.engine_latency(encoder, eng, rows),
+                }
+            sides["before"].update(joblib_bytes=os.path.getsize(model_path), joblib_load_s=joblib_load_s)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        report = {"model": model_path, "compression": info, **sides}
+        report["regressions"] = [
+            label for label, key in LATENCY_KEYS if sides["after"][key] > sides["before"][key]
+        ]
+        self._print(report)
+        if info["agreement"]["label_match"] < 1.0:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Label berbeda dari model asli pada {1 - info['agreement']['label_match']:.2%} baris training"
+                )
+            )
+        if info["agreement"]["max_proba_delta"] > options["proba_tolerance"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Probabilitas berubah sampai {info['agreement']['max_proba_delta']:.4f} dari model asli "
+                    f"(kompresi lossy, lihat selisih per tahap di atas)"
+                )
+            )
+        if report["regressions"]:
+            self.stdout.write(
+                self.style.WARNING(f"Latency lebih buruk sesudah kompresi: {', '.join(report['regressions'])}")
+            )
+
+        if options["dry_run"]:
+            self._write_report(options, report)
+            self.stdout.write("Dry run: artefak tidak ditulis")
+            return
+
+        # Artefak baru dengan hash sendiri: pipeline dengan forest terpangkas
+        # plus engine terkompresi, lalu bundle mmap yang source_sha256-nya
+        # menunjuk ke artefak ini (bukan ke model sumber)
+        compression.attach_engine(pipeline, engine, info["trees"]["kept"])
+        joblib.dump(pipeline, out)
+        try:
+            save_bundle(encoder, engine, bundle_path_for(out), source_path=out, extra_meta={"compression": info})
+        except Exception:
+            os.unlink(out)
+            raise
+        report["out"] = out
+        self.stdout.write(self.style.SUCCESS(f"Artefak terkompresi ditulis ke {out} (+ {bundle_path_for(out)})"))
+
+        if options["no_register"]:
+            pass
+        elif report["regressions"] and not options["allow_slower"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Artefak tidak didaftarkan karena latency lebih buruk; ulangi dengan --allow-slower "
+                    "jika versi ini tetap ingin didaftarkan"
+                )
+            )
+        else:
+            report["version"] = self._register(reg, out, options, parent_version, parent_sha, info)
+        self._write_report(options, report)
+
+    def _register(self, reg, out, options, parent_version, parent_sha, info):
+        """Daftarkan artefak sebagai versi baru yang tidak aktif; return nama versi atau None."""
+        if reg.active() is None:
+            # register() langsung mengaktifkan versi pertama di registry kosong
+            self.stdout.write(
+                self.style.WARNING(
+                    "Registry belum punya versi aktif; artefak tidak didaftarkan "
+                    "(daftarkan manual dengan manage.py model_registry register)"
+                )
+            )
+            return None
+        source = parent_version or os.path.splitext(os.path.basename(options["model"]))[0]
+        version = options["model_version"] or f"{source}-compressed-{time.strftime('%Y%m%d-%H%M%S')}"
+        metadata = {
+            "description": (
+                f"Kompresi dari {source}: {info['trees']['before']} -> {info['trees']['after']} tree, "
+                f"collapse {info['collapse']}, leaf {info['dtypes']['leaf_dtype']}"
+            ),
+            "n_estimators": info["trees"]["after"],
+            "compression": {
+                "parent": parent_version,
+                "parent_sha256": parent_sha,
+                "collapse": info["collapse"],
+                "dtypes": info["dtypes"],
+                "agreement": info["agreement"],
+            },
+        }
+        try:
+            reg.register(out, version, metadata, activate=False)
+        except RegistryError as e:
+            raise CommandError(str(e))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Versi {version} terdaftar (tidak diaktifkan); aktifkan dengan "
+                f"manage.py model_registry activate {version}"
+            )
+        )
+        return version
+
+    def _write_report(self, options, report):
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+
+    def _print(self, report):
+        info, before, after = report["compression"], report["before"], report["after"]
+        oob_b, oob_a = info["oob"]["before"], info["oob"]["after"]
+        nodes, stage_delta = info["nodes"], info["proba_delta_by_stage"]
+        self.stdout.write(
+            f"seleksi tree: {info['trees']['before']} -> {info['trees']['after']} tree, node {nodes['before']} -> "
+            f"{nodes['after_selection']}, selisih probabilitas maks. {stage_delta['selection']:.4f}"
+        )
+        collapsed = nodes["after_selection"] - nodes["after"]
+        if collapsed:
+            self.stdout.write(
+                f"collapse {info['collapse']}: node {nodes['after_selection']} -> {nodes['after']} "
+                f"({collapsed} dibuang), selisih probabilitas maks. {stage_delta['collapse']:.4f}"
+            )
+        else:
+            self.stdout.write(f"collapse {info['collapse']}: tidak ada node yang dibuang")
+        self.stdout.write(
+            f"dtype: threshold float32, leaf {info['dtypes']['leaf_dtype']}, "
+            f"selisih probabilitas maks. {stage_delta['dtypes']:.4f}"
+        )
+        self.stdout.write(
+            f"OOB accuracy {oob_b['accuracy']:.4f} -> {oob_a['accuracy']:.4f}, recall Preeklampsia "
+            f"{oob_b['recall_pree']:.4f} -> {oob_a['recall_pree']:.4f}, Brier {oob_b['brier']:.4f} -> {oob_a['brier']:.4f}"
+        )
+        self.stdout.write(
+            f"cocok dengan model asli: label {info['agreement']['label_match']:.2%}, "
+            f"selisih probabilitas maks. {info['agreement']['max_proba_delta']:.4f}"
+        )
+        worse = {key for _, key in LATENCY_KEYS if after[key] > before[key]}
+        self.stdout.write(f"{'':<22}{'sebelum':>12}{'sesudah':>12}")
+        for label, key, fmt in (
+            ("ukuran bundle (KiB)", "bundle_bytes", lambda v: f"{v / 1024:.0f}"),
+            ("memori engine (KiB)", "engine_bytes", lambda v: f"{v / 1024:.0f}"),
+            ("load bundle (ms)", "bundle_load_s", lambda v: f"{v * 1000:.2f}"),
+            ("1 baris p50 (ms)", "single_p50_ms", lambda v: f"{v:.3f}"),
+            ("1 baris p99 (ms)", "single_p99_ms", lambda v: f"{v:.3f}"),
+            ("batch (us/baris)", "batch_per_row_us", lambda v: f"{v:.1f}"),
+        ):
+            mark = "  (lebih buruk)" if key in worse else ""
+            self.stdout.write(f"{label:<22}{fmt(before[key]):>12}{fmt(after[key]):>12}{mark}")
+        self.stdout.write(
+            f"joblib: {before['joblib_bytes'] / 1024:.0f} KiB, load + compile {before['joblib_load_s'] * 1000:.0f} ms"
+        )
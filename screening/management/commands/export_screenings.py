@@ -0,0 +1,61 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from screening import export
+
+
+class Command(BaseCommand):
+    help = (
+        "Export submission ke CSV (layout ALL_FINAL.csv) atau Parquet, streaming per chunk "
+        "sehingga memori tetap berapa pun jumlah barisnya."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path file tujuan (.csv atau .parquet), '-' untuk stdout (CSV)")
+        parser.add_argument("--format", choices=sorted(export.FORMATS), help="Default: dari ekstensi file output")
+        parser.add_argument("--date-from", help="Tanggal awal YYYY-MM-DD (inklusif)")
+        parser.add_argument("--date-to", help="Tanggal akhir YYYY-MM-DD (inklusif)")
+        parser.add_argument("--district", help="Kabupaten/Kota")
+        parser.add_argument("--result", help="preeklampsia / non-preeklampsia")
+        parser.add_argument(
+            "--chunk-size", type=int, default=export.default_chunk_size(), help="Jumlah baris per chunk"
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        fmt = options["format"] or ("parquet" if output.endswith(".parquet") else "csv")
+        if output == "-" and fmt != "csv":
+            raise CommandError("Output ke stdout hanya untuk format csv")
+        try:
+            qs = export.export_queryset(
+                date_from=options["date_from"],
+                date_to=options["date_to"],
+                district=options["district"],
+                result=options["result"],
+            )
+            content = export.iter_export(qs, fmt, chunk_size=options["chunk_size"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        except ImportError:
+            raise CommandError("Export parquet butuh pyarrow (pip install pyarrow)")
+
+        started = time.perf_counter()
+        if output == "-":
+            for part in content:
+                self.stdout.write(part, ending="")
+            return
+
+        tmp = f"{output}.tmp"
+        mode, encoding = ("w", "utf-8") if fmt == "csv" else ("wb", None)
+        with open(tmp, mode, encoding=encoding, newline="" if encoding else None) as fh:
+            for part in content:
+                fh.write(part)
+        os.replace(tmp, output)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Export {fmt} selesai: {output} ({os.path.getsize(output) / 1e6:.1f} MB) dalam {elapsed:.2f} detik"
+            )
+        )
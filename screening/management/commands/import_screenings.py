@@ -0,0 +1,69 @@
+import os
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from screening import bulk, predictor
+
+
+class Command(BaseCommand):
+    help = (
+        "Import + prediksi screening massal dari CSV berformat ALL_FINAL.csv "
+        "(streaming per chunk, prediksi vectorized, bulk_create)."
+    )
+
+    def add_arguments(self, parser):
+        conf = getattr(settings, "SCREENING_BULK_UPLOAD", {})
+        parser.add_argument("path", help="Path file CSV (separator ';')")
+        parser.add_argument("--user", help="Username pemilik submission (opsional)")
+        parser.add_argument(
+            "--chunk-size", type=int, default=conf.get("CHUNK_SIZE", 500), help="Jumlah baris per chunk"
+        )
+        parser.add_argument("--name-prefix", help="Prefix nama pasien jika CSV tidak punya kolom nama")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"File CSV tidak ditemukan: {path}")
+
+        user = None
+        if options["user"]:
+            User = get_user_model()
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"User tidak ditemukan: {options['user']}")
+
+        model = predictor.get_model()
+        if model is None:
+            raise CommandError("Model prediksi tidak tersedia")
+
+        def progress(report):
+            self.stdout.write(
+                f"chunk {report.chunks}: {report.rows} baris, {report.created} tersimpan, "
+                f"{report.failed} gagal ({report.rows_per_sec:.0f} baris/detik)"
+            )
+
+        with open(path, newline="", encoding="utf-8-sig") as fh:
+            try:
+                report = bulk.import_csv(
+                    fh,
+                    model,
+                    user=user,
+                    name_prefix=options["name_prefix"] or bulk.name_prefix_for(path),
+                    chunk_size=options["chunk_size"],
+                    progress=progress,
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        for line, message in report.errors:
+            self.stdout.write(self.style.WARNING(f"baris {line or '-'}: {message}"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Selesai: {report.created}/{report.rows} baris tersimpan "
+                f"({report.preeclampsia} Preeklampsia) dalam {report.elapsed_s:.2f} detik "
+                f"({report.rows_per_sec:.0f} baris/detik)"
+            )
+        )
@@ -0,0 +1,84 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from screening import loadgen
+from screening.benchmarks.common import CSV_PATH
+
+
+class Command(BaseCommand):
+    help = (
+        "Jalankan load test terhadap server lokal dengan pasien sintetis dari ALL_FINAL.csv "
+        "(login -> submit -> hasil -> download PDF), lalu laporkan throughput, "
+        "p50/p95/p99 dan error rate per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL server yang diuji")
+        parser.add_argument("--clients", type=int, default=10, help="Jumlah client paralel")
+        parser.add_argument("--duration", type=float, default=60.0, help="Lama test dalam detik (0 = pakai --sessions)")
+        parser.add_argument("--sessions", type=int, help="Batas total sesi (opsional)")
+        parser.add_argument("--submits", type=int, default=3, help="Jumlah submit per sesi login")
+        parser.add_argument("--dashboard-ratio", type=float, default=0.1, help="Peluang sesi membuka /dashboard/")
+        parser.add_argument("--think-ms", type=float, default=0.0, help="Rata-rata jeda antar langkah (ms)")
+        parser.add_argument("--users", type=int, help="Jumlah akun berbeda (default: satu per client)")
+        parser.add_argument("--password", default=loadgen.DEFAULT_PASSWORD, help="Password akun load test")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Timeout per request (detik)")
+        parser.add_argument("--seed", type=int, help="Seed RNG supaya pasien sintetis bisa diulang")
+        parser.add_argument("--dataset", default=CSV_PATH, help="CSV sumber distribusi (format ALL_FINAL.csv)")
+        parser.add_argument("--output", help="Path file JSON untuk laporan")
+
+    def handle(self, *args, **options):
+        if not options["duration"] and not options["sessions"]:
+            raise CommandError("Isi --duration atau --sessions")
+        if options["clients"] < 1:
+            raise CommandError("--clients minimal 1")
+        if not os.path.exists(options["dataset"]):
+            raise CommandError(f"File dataset tidak ditemukan: {options['dataset']}")
+
+        patients = loadgen.SyntheticPatients.from_csv(options["dataset"], seed=options["seed"])
+        self.stdout.write(
+            f"Load test {options['url']}: {options['clients']} client, "
+            f"{options['duration'] or '-'} detik, {options['sessions'] or '-'} sesi"
+        )
+
+        report = loadgen.run(
+            options["url"],
+            patients,
+            clients=options["clients"],
+            duration=options["duration"],
+            sessions=options["sessions"],
+            submits=options["submits"],
+            dashboard_ratio=options["dashboard_ratio"],
+            think_s=options["think_ms"] / 1000.0,
+            users=options["users"],
+            password=options["password"],
+            timeout=options["timeout"],
+            seed=options["seed"],
+        )
+
+        self.stdout.write(
+            f"{'endpoint':<16}{'req':>7}{'rps':>9}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)"
+        )
+        for name, ep in report["endpoints"].items():
+            lat = ep["latency"]
+            line = (
+                f"{name:<16}{ep['requests']:>7}{ep['throughput_rps']:>9.1f}{ep['error_rate'] * 100:>7.1f}"
+                f"{lat['p50_ms']:>9.1f}{lat['p95_ms']:>9.1f}{lat['p99_ms']:>9.1f}"
+            )
+            self.stdout.write(self.style.WARNING(line) if ep["errors"] else line)
+        for message in report["error_samples"]:
+            self.stdout.write(self.style.WARNING(message))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Total: {report['requests']} request dalam {report['wall_s']:.1f} detik "
+                f"({report['throughput_rps']:.1f} req/s, error {report['error_rate'] * 100:.2f}%), "
+                f"{report['sessions']} sesi"
+            )
+        )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Laporan disimpan ke {options['output']}"))
@@ -0,0 +1,88 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from screening import predictor
+from screening.registry import RegistryError
+
+
+class Command(BaseCommand):
+    help = (
+        "Kelola registry model berversi: list, register, activate, verify. "
+        "Worker yang berjalan akan hot-swap ke versi aktif baru tanpa restart."
+    )
+
+    def add_arguments(self, parser):
+        sub = parser.add_subparsers(dest="action", required=True)
+
+        sub.add_parser("list", help="Tampilkan semua versi model")
+
+        register = sub.add_parser("register", help="Daftarkan artefak model baru")
+        register.add_argument("path", help="Path file pipeline .joblib")
+        register.add_argument("--version", required=True, help="Nama versi (unik)")
+        register.add_argument("--description", default="", help="Deskripsi singkat")
+        register.add_argument("--metadata", default="{}", help="Metadata tambahan dalam format JSON")
+        register.add_argument("--activate", action="store_true", help="Langsung jadikan versi aktif")
+
+        activate = sub.add_parser("activate", help="Jadikan sebuah versi sebagai model aktif")
+        activate.add_argument("version")
+
+        sub.add_parser("verify", help="Cek hash semua artefak terhadap manifest")
+
+    def handle(self, *args, **options):
+        reg = predictor.registry()
+        try:
+            getattr(self, f"_{options['action']}")(reg, options)
+        except RegistryError as e:
+            raise CommandError(str(e))
+
+    def _list(self, reg, options):
+        manifest = reg.read()
+        if not manifest["versions"]:
+            self.stdout.write(f"Registry kosong ({reg.manifest_path})")
+            return
+        for entry in manifest["versions"]:
+            marker = "*" if entry["version"] == manifest.get("active") else " "
+            desc = entry.get("metadata", {}).get("description", "")
+            self.stdout.write(
+                f"{marker} {entry['version']:<24} {entry['path']:<32} {entry['sha256'][:12]}  {desc}"
+            )
+
+    def _register(self, reg, options):
+        try:
+            metadata = json.loads(options["metadata"])
+        except ValueError as e:
+            raise CommandError(f"--metadata bukan JSON yang valid: {e}")
+        if options["description"]:
+            metadata["description"] = options["description"]
+
+        # Pastikan artefak bisa di-load dan dipakai untuk prediksi sebelum didaftarkan
+        try:
+            model = predictor.load_model(options["path"], version=options["version"])
+            predictor.warm_up(model, n_rows=2)
+        except Exception as e:
+            raise CommandError(f"Artefak tidak bisa dipakai untuk prediksi: {e}")
+
+        metadata.setdefault("classes", [str(c) for c in model.classes])
+        if model.engine is not None:
+            metadata.setdefault("n_estimators", model.engine.n_estimators)
+            metadata.setdefault("n_features", model.engine.n_features_in_)
+
+        entry = reg.register(options["path"], options["version"], metadata, activate=options["activate"])
+        self.stdout.write(self.style.SUCCESS(f"Versi {entry['version']} terdaftar ({entry['sha256'][:12]})"))
+
+    def _activate(self, reg, options):
+        entry = reg.activate(options["version"])
+        self.stdout.write(self.style.SUCCESS(f"Versi aktif sekarang: {entry['version']}"))
+
+    def _verify(self, reg, options):
+        failed = 0
+        for entry in reg.versions():
+            try:
+                reg.verify(entry)
+                self.stdout.write(f"OK    {entry['version']}")
+            except RegistryError as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"GAGAL {e}"))
+        if failed:
+            raise CommandError(f"{failed} artefak tidak cocok dengan manifest")
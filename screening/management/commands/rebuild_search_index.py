@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from screening import search
+from screening.models import ScreeningSubmission
+
+
+class Command(BaseCommand):
+    help = (
+        "Buat ulang index pencarian submission (nama pasien, kabupaten/kota, user) dari tabel "
+        "ScreeningSubmission, untuk perbaikan jika index tidak sinkron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Alias database")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        backend, size = search.rebuild(using=options["database"])
+        elapsed = time.perf_counter() - started
+        if size is None:
+            self.stdout.write(self.style.SUCCESS(f"Backend {backend}: index dibuat dalam {elapsed:.2f} detik"))
+            return
+        total = ScreeningSubmission.objects.using(options["database"]).count()
+        if size != total:
+            self.stdout.write(self.style.WARNING(f"Index berisi {size} baris, tabel submission {total} baris"))
+        self.stdout.write(
+            self.style.SUCCESS(f"Backend {backend}: {size} submission di-index dalam {elapsed:.2f} detik")
+        )
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from screening import stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Hitung ulang rollup statistik dashboard (SubmissionDailyStat) dari tabel "
+        "ScreeningSubmission, untuk perbaikan jika rollup tidak sinkron."
+    )
+
+    def handle(self, *args, **options):
+        before = stats.totals()
+        started = time.perf_counter()
+        n_rows = stats.rebuild()
+        elapsed = time.perf_counter() - started
+        after = stats.totals()
+
+        if before != after:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Rollup tidak sinkron: total {before['total_predictions']} -> {after['total_predictions']}, "
+                    f"Preeklampsia {before['preeclampsia_count']} -> {after['preeclampsia_count']}, "
+                    f"Non-Preeklampsia {before['non_preeclampsia_count']} -> {after['non_preeclampsia_count']}"
+                )
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{n_rows} baris rollup dari {after['total_predictions']} submission dalam {elapsed:.2f} detik"
+            )
+        )
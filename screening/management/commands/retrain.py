@@ -0,0 +1,197 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from screening import compression, dataset, predictor, training
+from screening.model_bundle import file_sha256
+from screening.models import ScreeningSubmission
+from screening.registry import RegistryError
+
+FEATURE_FIELDS = [field for _, field, _ in dataset.CSV_COLUMNS]
+
+
+def _watermark(reg):
+    """
+    (outcome_recorded_at, id) submission terakhir yang sudah dipakai retrain,
+    atau None (belum pernah retrain). Disimpan di level manifest, jadi tidak
+    ikut mundur saat versi aktif di-rollback.
+    """
+    mark = reg.retrain_watermark() if reg.exists() else None
+    if not mark:
+        return None
+    return datetime.fromisoformat(mark["outcome_recorded_at"]), mark["id"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Retrain inkremental model aktif dari submission yang sudah diberi outcome: hanya "
+        "baris baru sejak watermark retrain terakhir yang dibaca (streaming per chunk), digabung "
+        "dengan CSV dasar, lalu tree baru ditambahkan dengan warm_start dan hasilnya "
+        "didaftarkan sebagai versi baru di registry."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dataset", default=training.DEFAULT_CSV, help="CSV dasar (format ALL_FINAL.csv)")
+        parser.add_argument("--trees", type=int, default=20, help="Jumlah tree baru per run")
+        parser.add_argument("--max-trees", type=int, help="Buang tree paling lama jika forest melebihi jumlah ini")
+        parser.add_argument("--min-rows", type=int, default=1, help="Minimal submission baru supaya retrain dijalankan")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Ukuran chunk query submission")
+        parser.add_argument(
+            "--settle-seconds",
+            type=int,
+            default=300,
+            help="Outcome yang dicatat kurang dari sekian detik lalu belum dibaca (menunggu transaksi yang "
+            "commit terlambat)",
+        )
+        parser.add_argument(
+            "--reset-watermark",
+            action="store_true",
+            help="Abaikan watermark dan baca ulang semua submission berlabel (mis. setelah rollback)",
+        )
+        parser.add_argument("--jobs", type=int, help="Jumlah proses paralel untuk fit tree")
+        parser.add_argument("--model-version", help="Nama versi baru (default: retrain-<timestamp>)")
+        parser.add_argument("--no-activate", action="store_true", help="Daftarkan versi baru tanpa mengaktifkannya")
+        parser.add_argument("--dry-run", action="store_true", help="Hitung data baru saja, tanpa training")
+
+    def handle(self, *args, **options):
+        import joblib
+        import numpy as np
+
+        if options["trees"] < 1:
+            raise CommandError("--trees minimal 1")
+        if not os.path.exists(options["dataset"]):
+            raise CommandError(f"File dataset tidak ditemukan: {options['dataset']}")
+
+        reg = predictor.registry()
+        parent = reg.active() if reg.exists() else None
+        if parent is not None:
+            try:
+                model_path = reg.verify(parent)
+            except RegistryError as e:
+                raise CommandError(str(e))
+            parent_version = parent["version"]
+        else:
+            model_path, parent_version = predictor.MODEL_PATH, predictor.UNVERSIONED
+        mark = None if options["reset_watermark"] else _watermark(reg)
+
+        # Hanya outcome yang dicatat sebelum `cutoff`: baris yang commit
+        # terlambat dengan outcome_recorded_at lebih awal dari baris lain tetap
+        # terbaca di run berikutnya selama commit-nya tidak lebih lambat dari
+        # --settle-seconds, bukan terlewati watermark
+        cutoff = timezone.now() - timedelta(seconds=options["settle_seconds"])
+        qs = ScreeningSubmission.objects.exclude(outcome="").filter(
+            outcome_recorded_at__isnull=False, outcome_recorded_at__lte=cutoff
+        )
+        if mark is not None:
+            recorded_at, last_id = mark
+            qs = qs.filter(Q(outcome_recorded_at__gt=recorded_at) | Q(outcome_recorded_at=recorded_at, id__gt=last_id))
+        qs = qs.order_by("outcome_recorded_at", "id")
+        since = f"sejak {mark[0].isoformat()} #{mark[1]}" if mark else "semua (belum ada watermark)"
+        self.stdout.write(f"Model dasar {parent_version} ({os.path.basename(model_path)}), submission berlabel {since}")
+
+        if options["dry_run"]:
+            self.stdout.write(f"{qs.count()} submission baru; dry run, tidak ada training")
+            return
+
+        started = time.perf_counter()
+        pipeline = joblib.load(model_path)
+        # Versi hasil compress_model membawa engine terkompresi dari forest
+        # lama; setelah tree ditambah, engine di-compile ulang dari forest
+        compression.detach_engine(pipeline)
+
+        # Submission baru di-stream per chunk dan langsung di-transform ke
+        # float32, jadi memori sebanding dengan jumlah baris baru saja
+        new_X, new_y = [], []
+        last = None
+        rows = qs.values("id", "outcome", "outcome_recorded_at", *FEATURE_FIELDS).iterator(
+            chunk_size=options["chunk_size"]
+        )
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= options["chunk_size"]:
+                last = self._consume(pipeline, chunk, new_X, new_y)
+                chunk = []
+        if chunk:
+            last = self._consume(pipeline, chunk, new_X, new_y)
+
+        n_new = sum(len(y) for y in new_y)
+        if n_new < options["min_rows"]:
+            self.stdout.write(f"{n_new} submission baru (< --min-rows {options['min_rows']}), tidak ada versi baru")
+            return
+
+        X_base, y_base = training.load_training_frame(options["dataset"])
+        Xt = np.vstack([training.transform_features(pipeline, X_base)] + new_X)
+        y = np.concatenate([y_base.to_numpy(dtype=object)] + new_y)
+        read_s = time.perf_counter() - started
+
+        Xt_new, y_new = np.vstack(new_X), np.concatenate(new_y)
+        old_acc = float(np.mean(pipeline.steps[-1][1].predict(Xt_new) == y_new))
+        t0 = time.perf_counter()
+        try:
+            before, after = training.grow_forest(
+                pipeline, Xt, y, options["trees"], max_trees=options["max_trees"], n_jobs=options["jobs"]
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        fit_s = time.perf_counter() - t0
+        new_acc = float(np.mean(pipeline.steps[-1][1].predict(Xt_new) == y_new))
+
+        version = options["model_version"] or f"retrain-{time.strftime('%Y%m%d-%H%M%S')}"
+        out = os.path.join(reg.base_dir, f"rf_preeclampsia-{version}.joblib")
+        if os.path.exists(out):
+            raise CommandError(f"File artefak sudah ada: {out}")
+        joblib.dump(pipeline, out)
+        try:
+            model = predictor.load_model(out, version=version)
+            predictor.warm_up(model, n_rows=2)
+        except Exception as e:
+            os.unlink(out)
+            raise CommandError(f"Artefak hasil retrain tidak bisa dipakai untuk prediksi: {e}")
+
+        watermark = {"outcome_recorded_at": last[0].isoformat(), "id": last[1]}
+        metadata = {
+            "description": f"Retrain warm_start dari {parent_version}: +{options['trees']} tree, {n_new} submission baru",
+            "classes": [str(c) for c in model.classes],
+            "n_estimators": after,
+            "retrain": {
+                "parent": parent_version,
+                "watermark": watermark,
+                "new_rows": n_new,
+                "base_rows": len(y_base),
+                "base_sha256": file_sha256(options["dataset"]),
+                "trees_added": options["trees"],
+                "trees_before": before,
+            },
+        }
+        if model.engine is not None:
+            metadata["n_features"] = model.engine.n_features_in_
+        try:
+            entry = reg.register(
+                out, version, metadata, activate=not options["no_activate"], retrain_watermark=dict(watermark, version=version)
+            )
+        except RegistryError as e:
+            os.unlink(out)
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{n_new} submission baru + {len(y_base)} baris CSV dasar, baca {read_s:.2f} detik, "
+            f"fit {options['trees']} tree {fit_s:.2f} detik, tree {before} -> {after}"
+        )
+        self.stdout.write(f"Akurasi di submission baru: model lama {old_acc:.4f}, model baru {new_acc:.4f} (data latih)")
+        status = "aktif" if not options["no_activate"] else "tidak diaktifkan"
+        self.stdout.write(self.style.SUCCESS(f"Versi {entry['version']} terdaftar ({status}): {out}"))
+
+    def _consume(self, pipeline, chunk, new_X, new_y):
+        """Transform satu chunk submission; return (outcome_recorded_at, id) baris terakhir."""
+        import numpy as np
+        import pandas as pd
+
+        X = pd.DataFrame([dataset.feature_row(row) for row in chunk])
+        new_X.append(training.transform_features(pipeline, X))
+        new_y.append(np.array([row["outcome"] for row in chunk], dtype=object))
+        return chunk[-1]["outcome_recorded_at"], chunk[-1]["id"]
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from screening import training
+
+
+class Command(BaseCommand):
+    help = (
+        "Search hyperparameter RandomForest (n_estimators, max_depth, min_samples_leaf, "
+        "max_features) dengan successive halving atas sampel dan jumlah tree, evaluasi ulang "
+        "finalis dengan data penuh, lalu tulis leaderboard JSON berisi skor CV, latency, "
+        "ukuran model, Pareto front recall/latency/memori dan model yang dipilih."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dataset", default=training.DEFAULT_CSV, help="CSV training (format ALL_FINAL.csv)")
+        parser.add_argument(
+            "--output",
+            default=os.path.join(os.path.dirname(training.DEFAULT_CSV), "leaderboard.json"),
+            help="Path file leaderboard JSON",
+        )
+        parser.add_argument("--candidates", type=int, help="Ambil acak N kandidat dari grid (default: semua)")
+        parser.add_argument("--factor", type=int, default=3, help="Faktor eliminasi per rung")
+        parser.add_argument("--cv", type=int, default=5, help="Jumlah fold CV per kandidat")
+        parser.add_argument("--jobs", type=int, help="Jumlah proses paralel (default: semua core)")
+        parser.add_argument("--cache-dir", help="Direktori cache preprocessing (default: direktori sementara)")
+        parser.add_argument("--latency-repeat", type=int, default=200, help="Pengulangan pengukuran latency")
+        parser.add_argument("--finalists", type=int, default=8, help="Jumlah kandidat teratas yang dievaluasi penuh")
+        parser.add_argument("--final-cv", type=int, default=10, help="Jumlah fold CV untuk evaluasi finalis")
+        parser.add_argument(
+            "--recall-tolerance",
+            type=float,
+            default=0.01,
+            help="Pilih model tercepat dengan recall Preeklampsia >= recall terbaik - toleransi",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options["dataset"]):
+            raise CommandError(f"File dataset tidak ditemukan: {options['dataset']}")
+        if options["factor"] < 2:
+            raise CommandError("--factor minimal 2")
+
+        X, y = training.load_training_frame(options["dataset"])
+        candidates = training.candidate_grid(n_candidates=options["candidates"], seed=options["seed"])
+        self.stdout.write(f"{len(candidates)} kandidat, {len(y)} baris, factor {options['factor']}")
+
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="rf-search-") as tmp:
+            cache_dir = options["cache_dir"] or tmp
+            rungs, results = training.successive_halving(
+                X,
+                y,
+                candidates,
+                factor=options["factor"],
+                cv=options["cv"],
+                n_jobs=options["jobs"],
+                cache_dir=cache_dir,
+                seed=options["seed"],
+                log=self.stdout.write,
+            )
+            search_s = time.perf_counter() - started
+            ranked = training.leaderboard(
+                X, y, rungs, results, seed=options["seed"], repeat=options["latency_repeat"], log=self.stdout.write
+            )
+
+            finalists = []
+            for entry in ranked[: options["finalists"]] + [{"params": training.BASELINE_PARAMS}]:
+                if entry["params"] not in finalists:
+                    finalists.append(dict(entry["params"]))
+            evaluated = training.evaluate_finalists(
+                X,
+                y,
+                finalists,
+                cv=options["final_cv"],
+                n_jobs=options["jobs"],
+                cache_dir=cache_dir,
+                seed=options["seed"],
+                repeat=max(options["latency_repeat"], 500),
+                log=self.stdout.write,
+            )
+        front = training.pareto_front(evaluated)
+        selected = training.select_fastest(evaluated, options["recall_tolerance"])
+
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "dataset": {"path": options["dataset"], "rows": len(y), "columns": list(X.columns)},
+            "config": {
+                "search_space": training.SEARCH_SPACE,
+                "factor": options["factor"],
+                "cv": options["cv"],
+                "seed": options["seed"],
+                "latency_batch": training.LATENCY_BATCH,
+            },
+            "search_s": search_s,
+            "rungs": rungs,
+            "candidates": ranked,
+            "pareto": {
+                "objectives": [list(o) for o in training.PARETO_OBJECTIVES],
+                "recall_tolerance": options["recall_tolerance"],
+                "evaluated": evaluated,
+                "front": [p["id"] for p in front],
+            },
+            "selected": selected,
+        }
+        with open(options["output"], "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+        self.stdout.write(
+            f"{'#':>3} {'f1_macro':>9} {'acc':>7} {'p50 ms':>8} {'us/row':>8} {'trees':>6}  params"
+        )
+        for entry in ranked[:10]:
+            lat = entry["latency"]
+            self.stdout.write(
+                f"{entry['rank']:>3} {entry['f1_macro']:>9.4f} {entry['accuracy']:>7.4f} "
+                f"{lat['single_p50_ms']:>8.3f} {lat['batch_per_row_us']:>8.1f} {entry['n_estimators_fit']:>6}  "
+                f"{entry['params']}"
+            )
+
+        self.stdout.write("Pareto front (recall Preeklampsia vs p99 latency vs memori):")
+        self.stdout.write(f"{'id':>3} {'recall':>7} {'f1':>7} {'p99 ms':>8} {'batch p99':>10} {'KiB':>7}  params")
+        for p in front:
+            marker = "*" if p is selected else " "
+            self.stdout.write(
+                f"{p['id']:>3}{marker}{p['recall_pree']:>7.4f} {p['f1_macro']:>7.4f} {p['single_p99_ms']:>8.3f} "
+                f"{p['batch_p99_ms']:>10.3f} {p['engine_bytes'] / 1024:>7.0f}  {p['params']}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Dipilih (*): {selected['params']} - recall {selected['recall_pree']:.4f}, "
+                f"p99 {selected['single_p99_ms']:.3f} ms, {selected['engine_bytes'] / 1024:.0f} KiB"
+            )
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Leaderboard ({len(ranked)} kandidat) disimpan ke {options['output']}")
+        )
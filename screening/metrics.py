@@ -0,0 +1,189 @@
+"""
+Metrik per-proses untuk hot path screening, diekspos dalam format teks
+Prometheus di /metrics.
+
+    with metrics.timer("submit", "predict"):
+        ...
+
+`timer` memakai `time.perf_counter` (monotonic) dan mencatat durasi ke
+histogram `screening_stage_seconds{view, stage}`. Satu observasi hanya
+berupa bisect + penambahan di bawah lock; tidak ada yang dikerjakan saat
+scrape selain memformat angka, dan jika SCREENING_METRICS['ENABLED']
+dimatikan timer menjadi no-op.
+
+Nilai dari komponen lain (micro-batcher, cache prediksi, status model)
+dibaca saat scrape lewat collector (`register_collector`).
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+ROWS_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count", "lock")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # slot terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[idx] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, _HistogramChild(self.buckets))
+        return child
+
+    def observe(self, value, *labelvalues):
+        self.labels(*labelvalues).observe(value)
+
+    def collect(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for values, child in sorted(self._children.items()):
+            with child.lock:
+                counts = list(child.counts)
+                total, count = child.sum, child.count
+            base = _labels(self.labelnames, values)
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _fmt(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames + ('le',), values + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{base} {_fmt(total)}")
+            lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+
+REGISTRY = []
+_collectors = []
+
+STAGE_SECONDS = Histogram(
+    "screening_stage_seconds",
+    "Durasi setiap tahap request (detik).",
+    labelnames=("view", "stage"),
+)
+INFERENCE_ROWS = Histogram(
+    "screening_inference_batch_rows",
+    "Jumlah baris per panggilan inferensi vectorized.",
+    buckets=ROWS_BUCKETS,
+    labelnames=("path",),
+)
+INFERENCE_SECONDS = Histogram(
+    "screening_inference_seconds",
+    "Durasi satu panggilan inferensi vectorized (detik).",
+    labelnames=("path",),
+)
+PDF_BYTES = Histogram(
+    "screening_report_bytes",
+    "Ukuran laporan yang dikirim (byte).",
+    buckets=BYTES_BUCKETS,
+    labelnames=("format",),
+)
+
+_enabled = None
+
+
+def enabled():
+    global _enabled
+    if _enabled is None:
+        _enabled = bool(getattr(settings, "SCREENING_METRICS", {}).get("ENABLED", True))
+    return _enabled
+
+
+@contextmanager
+def timer(view, stage):
+    if not enabled():
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(view, stage).observe(time.perf_counter() - started)
+
+
+def observe_inference(path, n_rows, seconds):
+    if enabled():
+        INFERENCE_ROWS.labels(path).observe(n_rows)
+        INFERENCE_SECONDS.labels(path).observe(seconds)
+
+
+def observe_report(fmt, n_bytes):
+    if enabled():
+        PDF_BYTES.labels(fmt).observe(n_bytes)
+
+
+def register_collector(fn):
+    """
+    fn() -> iterable (name, type, help, [(labels_dict, value), ...]),
+    dipanggil saat scrape untuk metrik yang sumbernya di modul lain.
+    """
+    _collectors.append(fn)
+    return fn
+
+
+def render():
+    """Semua metrik dalam format teks Prometheus (version 0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    for fn in _collectors:
+        for name, kind, documentation, samples in fn():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                keys = tuple(labels)
+                lines.append(f"{name}{_labels(keys, tuple(labels[k] for k in keys))} {_fmt(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value):
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
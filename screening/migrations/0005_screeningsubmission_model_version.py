@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('screening', '0004_remove_screeningsubmission_blood_pressure_td1_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screeningsubmission',
+            name='model_version',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('screening', '0005_screeningsubmission_model_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screeningsubmission',
+            name='outcome',
+            field=models.CharField(blank=True, choices=[('Preeklampsia', 'Preeklampsia'), ('NonPreeklampsia', 'NonPreeklampsia')], max_length=50),
+        ),
+        migrations.AddField(
+            model_name='screeningsubmission',
+            name='outcome_recorded_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
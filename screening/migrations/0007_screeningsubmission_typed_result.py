@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('screening', '0006_screeningsubmission_outcome'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screeningsubmission',
+            name='is_preeclampsia',
+            field=models.BooleanField(db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='screeningsubmission',
+            name='preeclampsia_probability',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+    ]
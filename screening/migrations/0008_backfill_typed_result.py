@@ -0,0 +1,69 @@
+"""Isi is_preeclampsia / preeclampsia_probability dari teks result / confidence.
+
+Diproses per chunk primary key (transaksi per chunk), jadi tabel besar
+tidak dikunci dalam satu transaksi panjang dan migrasi bisa dilanjutkan
+jika terputus (baris yang sudah terisi dilewati).
+"""
+from django.db import migrations, transaction
+
+CHUNK_SIZE = 2000
+
+
+def _parse_result(text):
+    key = (text or "").strip().lower().replace("-", "").replace(" ", "")
+    if key in ("preeklampsia", "preeclampsia"):
+        return True
+    if key in ("nonpreeklampsia", "nonpreeclampsia"):
+        return False
+    return None
+
+
+def _parse_confidence(text):
+    """"87.5%" -> 0.875; None jika kosong / tidak valid."""
+    try:
+        value = float((text or "").strip().rstrip("%").strip())
+    except ValueError:
+        return None
+    if not 0.0 <= value <= 100.0:
+        return None
+    return value / 100.0
+
+
+def backfill(apps, schema_editor):
+    ScreeningSubmission = apps.get_model("screening", "ScreeningSubmission")
+    pending = ScreeningSubmission.objects.filter(is_preeclampsia__isnull=True).exclude(result="")
+    last_pk = 0
+    while True:
+        rows = list(
+            pending.filter(pk__gt=last_pk).order_by("pk").values_list("pk", "result", "confidence")[:CHUNK_SIZE]
+        )
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        updates = []
+        for pk, result, confidence in rows:
+            is_pree = _parse_result(result)
+            if is_pree is None:
+                continue
+            conf = _parse_confidence(confidence)
+            updates.append(ScreeningSubmission(
+                pk=pk,
+                is_preeclampsia=is_pree,
+                preeclampsia_probability=None if conf is None else (conf if is_pree else 1.0 - conf),
+            ))
+        if updates:
+            with transaction.atomic():
+                ScreeningSubmission.objects.bulk_update(updates, ["is_preeclampsia", "preeclampsia_probability"])
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('screening', '0007_screeningsubmission_typed_result'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('screening', '0008_backfill_typed_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('district_city', models.CharField(blank=True, max_length=100)),
+                ('prediction', models.CharField(blank=True, choices=[('Preeklampsia', 'Preeklampsia'), ('NonPreeklampsia', 'NonPreeklampsia'), ('', 'Belum diprediksi')], max_length=20)),
+                ('count', models.BigIntegerField(default=0)),
+                ('probability_sum', models.FloatField(default=0.0)),
+                ('probability_count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'district_city', 'prediction'), name='submission_daily_stat_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+"""Isi rollup SubmissionDailyStat dari submission yang sudah ada."""
+from django.db import migrations
+
+
+def populate(apps, schema_editor):
+    from screening import stats
+
+    stats.rebuild(
+        apps.get_model("screening", "ScreeningSubmission"),
+        apps.get_model("screening", "SubmissionDailyStat"),
+    )
+
+
+def clear(apps, schema_editor):
+    apps.get_model("screening", "SubmissionDailyStat").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('screening', '0009_submissiondailystat'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate, clear),
+    ]
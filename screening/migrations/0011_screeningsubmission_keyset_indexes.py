@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('screening', '0010_populate_submissiondailystat'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='screeningsubmission',
+            index=models.Index(fields=['created_at', 'id'], name='submission_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='screeningsubmission',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='submission_user_created_id'),
+        ),
+    ]
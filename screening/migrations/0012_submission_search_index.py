@@ -0,0 +1,32 @@
+"""Index pencarian submission (lihat screening/search.py): FTS5 trigram +
+trigger di SQLite, index GIN pg_trgm di PostgreSQL."""
+from django.conf import settings
+from django.db import migrations
+
+
+def _models(apps):
+    return apps.get_model("screening", "ScreeningSubmission"), apps.get_model(settings.AUTH_USER_MODEL)
+
+
+def install(apps, schema_editor):
+    from screening import search
+
+    search.install(schema_editor, *_models(apps))
+
+
+def uninstall(apps, schema_editor):
+    from screening import search
+
+    search.uninstall(schema_editor, *_models(apps))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('screening', '0011_screeningsubmission_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -31,19 +31,45 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 
 
+def load_all_final(path):
+    """
+    Load CSV format `ALL_FINAL.csv` lewat loader bersama
+    (`screening.training_data.load_training_data`): kolom numerik apa adanya,
+    kolom kategorikal sebagai kode kategori (-1 = kosong), urutan kolom
+    sama dengan CSV. Return None jika header bukan format ALL_FINAL.
+    """
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    from screening import dataset, training_data
+
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        header = dataset.normalize_header(fh.readline().rstrip("\r\n").replace('"', "").split(dataset.CSV_DELIMITER))
+    if any(col not in header for col, _, _ in dataset.CSV_COLUMNS):
+        return None
+
+    data = training_data.load_training_data(path)
+    position = {col: ("numeric", i) for i, col in enumerate(data.numeric_columns)}
+    position.update({col: ("codes", i) for i, col in enumerate(data.category_columns)})
+    columns = [getattr(data, position[col][0])[position[col][1]] for col, _, _ in dataset.CSV_COLUMNS]
+    X = np.column_stack(columns).astype(float)
+    y = np.asarray(training_data.LABELS)[np.asarray(data.labels)]
+    return X, y
+
+
 def load_csv(path):
     import csv
 
     """
     Load training data from CSV.
 
-    Disesuaikan agar bisa membaca `ALL_FINAL.csv`:
-    - Separator: titik koma `;`
-    - Kolom terakhir: label string "NonPreeklampsia" / "Preeklampsia"
-
-    Juga tetap bisa membaca CSV sederhana dengan label 0/1.
+    `ALL_FINAL.csv` (separator `;`, label "NonPreeklampsia" / "Preeklampsia")
+    dibaca lewat `load_all_final`. CSV sederhana dengan label 0/1 tetap
+    dibaca baris per baris seperti sebelumnya.
     """
 
+    parsed = load_all_final(path)
+    if parsed is not None:
+        return parsed
+
     X = []
     y = []
     with open(path, newline="", encoding="utf-8") as fh:
@@ -1,16 +1,31 @@
 import os
+import sys
+import time
 import numpy as np
 import pandas as pd
 
-from sklearn.model_selection import StratifiedKFold, cross_validate, cross_val_predict
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.metrics import (
+    accuracy_score,
+    classification_report,
+    confusion_matrix,
+    f1_score,
+    precision_score,
+    recall_score,
+)
 
 import joblib
+from joblib import Parallel, delayed
+
+# loader dataset bersama (screening/training_data.py) ada dua level di atas file ini
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from screening.training_data import load_training_data
 
 # =======================
 # 1. KONFIGURASI
@@ -24,28 +39,21 @@ N_SPLITS = 10                   # 10-fold CV
 # 2. LOAD & BERSIHKAN DATA
 # =======================
 
-# separator ; karena CSV-mu pakai ;
-# decimal="." karena angka pakai titik
-df = pd.read_csv(CSV_PATH, sep=";", decimal=".")
+# parse + validasi schema (header "Perkerjaan " -> "Pekerjaan", nilai
+# di-strip, Ya/Tidak dan ejaan ganda Pekerjaan dinormalisasi); hasilnya di-cache di .dataset_cache/
+# per hash file, jadi run berikutnya tidak mem-parse CSV lagi
+data = load_training_data(CSV_PATH)
+if data.from_cache:
+    print(f"Dataset dari cache ({data.sha256[:16]})")
 
-# bersihkan spasi di awal/akhir nama kolom (jaga-jaga)
-df.columns = df.columns.str.strip()
+X = data.frame()
+y = data.target()
 
 print("Kolom di CSV:")
-print(df.columns.tolist())
+print(X.columns.tolist() + [TARGET_COL])
 print()
 
-if TARGET_COL not in df.columns:
-    raise ValueError(f"Kolom target '{TARGET_COL}' tidak ditemukan di CSV.")
-
-X = df.drop(columns=[TARGET_COL])
-y = df[TARGET_COL]
-
-# opsional tapi bagus: bersihkan spasi di nilai string (SMP , dll)
-for col in X.select_dtypes(include=["object"]).columns:
-    X[col] = X[col].astype(str).str.strip()
-
-print(f"Jumlah baris (total data): {df.shape[0]}")
+print(f"Jumlah baris (total data): {len(X)}")
 print(f"Jumlah kolom fitur      : {X.shape[1]}")
 print("\nDistribusi kelas:")
 print(y.value_counts())
@@ -136,14 +144,39 @@ rf_clf = RandomForestClassifier(
     n_jobs=-1,
 )
 
+# Opsional: pakai parameter model terpilih dari leaderboard hasil
+# `python manage.py tune_model` (RF_LEADERBOARD=leaderboard.json): model
+# tercepat dalam toleransi recall, atau kandidat #1 untuk leaderboard lama
+RF_LEADERBOARD = os.environ.get("RF_LEADERBOARD")
+if RF_LEADERBOARD:
+    import json
+
+    with open(RF_LEADERBOARD, encoding="utf-8") as fh:
+        leaderboard = json.load(fh)
+    best_params = (leaderboard.get("selected") or leaderboard["candidates"][0])["params"]
+    rf_clf.set_params(**best_params)
+    print("Parameter RF dari leaderboard:", best_params)
+    print()
+
 model = Pipeline(steps=[
     ("preprocess", preprocessor),
     ("clf", rf_clf),
 ])
 
 # =======================
-# 5. 10-FOLD STRATIFIED CV
+# 5. 10-FOLD STRATIFIED CV (satu kali fit per fold)
 # =======================
+# Setiap fold di-fit SEKALI: metrik fold dan prediksi out-of-fold (untuk
+# confusion matrix) diambil dari fit yang sama, bukan cross_validate +
+# cross_val_predict yang masing-masing me-refit semua fold.
+# Fold berjalan paralel (CV_N_JOBS proses), dan core sisanya dibagi ke
+# n_jobs RandomForest di tiap fold. Hasil preprocessing per fold
+# (imputer + onehot yang sudah di-fit, beserta matriks train/test-nya)
+# di-cache di CV_CACHE_DIR, jadi run berikutnya dengan data yang sama
+# hanya melatih forest-nya.
+
+CV_N_JOBS = int(os.environ.get("CV_N_JOBS", min(N_SPLITS, os.cpu_count() or 1)))
+CV_CACHE_DIR = os.environ.get("CV_CACHE_DIR", ".cv_cache")
 
 cv = StratifiedKFold(
     n_splits=N_SPLITS,
@@ -151,23 +184,58 @@ cv = StratifiedKFold(
     random_state=42,
 )
 
-scoring = {
-    "accuracy": "accuracy",
-    "precision_macro": "precision_macro",
-    "recall_macro": "recall_macro",
-    "f1_macro": "f1_macro",
-}
-
-print(f"=== {N_SPLITS}-fold Stratified Cross Validation ===\n")
-
-cv_results = cross_validate(
-    model,
-    X,
-    y,
-    cv=cv,
-    scoring=scoring,
-    return_train_score=False,
+memory = joblib.Memory(CV_CACHE_DIR or None, verbose=0)
+
+
+def _preprocess_fold(X_train, y_train, X_test):
+    pre = clone(preprocessor)
+    Xt_train = pre.fit_transform(X_train, y_train)
+    return pre, Xt_train, pre.transform(X_test)
+
+
+preprocess_fold = memory.cache(_preprocess_fold)
+
+
+def fit_fold(fold, X_train, y_train, X_test, y_true, test_idx, clf_n_jobs):
+    started = time.perf_counter()
+    _, Xt_train, Xt_test = preprocess_fold(X_train, y_train, X_test)
+    prep_s = time.perf_counter() - started
+
+    clf = clone(rf_clf).set_params(n_jobs=clf_n_jobs)
+    clf.fit(Xt_train, y_train)
+    y_pred = clf.predict(Xt_test)
+
+    scores = {
+        "accuracy": accuracy_score(y_true, y_pred),
+        "precision_macro": precision_score(y_true, y_pred, average="macro", zero_division=0),
+        "recall_macro": recall_score(y_true, y_pred, average="macro", zero_division=0),
+        "f1_macro": f1_score(y_true, y_pred, average="macro", zero_division=0),
+    }
+    return fold, test_idx, y_pred, scores, prep_s, time.perf_counter() - started
+
+
+print(f"=== {N_SPLITS}-fold Stratified Cross Validation ({CV_N_JOBS} proses paralel) ===\n")
+
+cv_started = time.perf_counter()
+clf_n_jobs = max(1, (os.cpu_count() or 1) // max(CV_N_JOBS, 1))
+fold_results = Parallel(n_jobs=CV_N_JOBS)(
+    delayed(fit_fold)(
+        fold, X.iloc[train_idx], y.iloc[train_idx], X.iloc[test_idx], y.iloc[test_idx], test_idx, clf_n_jobs
+    )
+    for fold, (train_idx, test_idx) in enumerate(cv.split(X, y), start=1)
 )
+cv_wall = time.perf_counter() - cv_started
+
+y_pred_cv = np.empty(len(y), dtype=object)
+cv_results = {f"test_{name}": [] for name in ("accuracy", "precision_macro", "recall_macro", "f1_macro")}
+for fold, test_idx, y_pred, scores, prep_s, fold_s in sorted(fold_results, key=lambda r: r[0]):
+    y_pred_cv[test_idx] = y_pred
+    for name, value in scores.items():
+        cv_results[f"test_{name}"].append(value)
+    print(f"Fold {fold:2d}: {fold_s:6.2f} detik (preprocess {prep_s:5.2f} detik), accuracy {scores['accuracy']:.4f}")
+cv_results = {k: np.array(v) for k, v in cv_results.items()}
+print(f"Total wall-clock CV     : {cv_wall:.2f} detik")
+print()
 
 print("Accuracy per fold       :", cv_results["test_accuracy"])
 print("Mean accuracy           :", cv_results["test_accuracy"].mean())
@@ -185,8 +253,6 @@ print()
 
 print("=== Confusion Matrix (gabungan semua fold) ===")
 
-y_pred_cv = cross_val_predict(model, X, y, cv=cv)
-
 labels = sorted(y.unique())  # ['NonPreeklampsia', 'Preeklampsia']
 cm = confusion_matrix(y, y_pred_cv, labels=labels)
 
@@ -205,6 +271,11 @@ print("\n=== Train model final di seluruh data ===")
 model.fit(X, y)
 print("Selesai train model final.\n")
 
+# n_jobs=-1 hanya untuk training. Di artefak disimpan n_jobs=None supaya
+# jumlah thread saat inferensi diatur oleh aplikasi (ThreadBudget di
+# screening/inference.py), bukan selalu memakai semua core per request.
+model.set_params(clf__n_jobs=None)
+
 # =======================
 # 8. SIMPAN MODEL
 # =======================
@@ -0,0 +1,135 @@
+"""
+Format penyimpanan model yang bisa di-mmap dan dibagi antar worker.
+
+`joblib.load` pada pipeline sklearn membuat setiap worker gunicorn/uWSGI
+men-deserialize salinan model sendiri menjadi objek Python. Bundle di sini
+menyimpan hasil compile pipeline (lihat inference.py) sebagai direktori:
+
+    rf_preeclampsia.bundle/
+        meta.json            # sha256 file sumber, kelas, spesifikasi encoder
+        feature.npy          # array node forest (uncompressed)
+        threshold.npy
+        ...
+
+Array dibuka dengan `np.load(mmap_mode="r")`, sehingga semua worker di satu
+host berbagi page read-only yang sama dari page cache, dan worker tidak
+perlu meng-import sklearn sama sekali.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from .inference import CompiledForest, FeatureEncoder
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 1
+BUNDLE_SUFFIX = ".bundle"
+
+
+class StaleBundleError(Exception):
+    """Bundle ada, tapi dibuat dari file model yang berbeda (hash tidak sama)."""
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bundle_path_for(model_path):
+    """ml_models/rf_preeclampsia.joblib -> ml_models/rf_preeclampsia.bundle"""
+    return os.path.splitext(model_path)[0] + BUNDLE_SUFFIX
+
+
+def save_bundle(encoder, engine, path, source_path=None, extra_meta=None):
+    """
+    Tulis bundle secara atomik: isi ditulis ke direktori sementara lalu
+    di-rename, sehingga worker lain tidak pernah melihat bundle setengah jadi.
+    """
+    arrays, forest_meta = engine.to_arrays()
+    meta = {
+        "format": BUNDLE_FORMAT,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "source": os.path.basename(source_path) if source_path else None,
+        "source_sha256": file_sha256(source_path) if source_path else None,
+        "forest": forest_meta,
+        "encoder": encoder.to_dict(),
+        "arrays": {name: {"dtype": str(arr.dtype), "shape": list(arr.shape)} for name, arr in arrays.items()},
+    }
+    if extra_meta:
+        meta.update(extra_meta)
+
+    parent = os.path.dirname(os.path.abspath(path))
+    tmp_dir = tempfile.mkdtemp(prefix=".bundle-", dir=parent)
+    try:
+        for name, arr in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(arr), allow_pickle=False)
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, indent=2)
+        # mkdtemp membuat direktori 0700; bundle dibaca (mmap) oleh worker
+        # yang mungkin berjalan sebagai user lain
+        os.chmod(tmp_dir, 0o755)
+        for name in os.listdir(tmp_dir):
+            os.chmod(os.path.join(tmp_dir, name), 0o644)
+
+        if os.path.isdir(path):
+            old_dir = tempfile.mkdtemp(prefix=".bundle-old-", dir=parent)
+            os.rename(path, os.path.join(old_dir, "bundle"))
+            os.rename(tmp_dir, path)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            os.rename(tmp_dir, path)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return meta
+
+
+def read_meta(path):
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def load_bundle(path, mmap=True, expected_sha256=None):
+    """
+    Load bundle. Return (encoder, engine, meta).
+
+    Dengan mmap=True array tidak disalin ke memori proses; page-nya dibagi
+    lewat page cache dengan semua proses lain yang membuka bundle yang sama.
+    """
+    meta = read_meta(path)
+    if meta.get("format") != BUNDLE_FORMAT:
+        raise StaleBundleError(f"Format bundle {meta.get('format')} tidak didukung")
+    if expected_sha256 and meta.get("source_sha256") != expected_sha256:
+        raise StaleBundleError(f"Bundle {path} dibuat dari model yang berbeda")
+
+    mmap_mode = "r" if mmap else None
+    arrays = {
+        name: np.asarray(np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False))
+        for name in CompiledForest.ARRAY_FIELDS
+    }
+    engine = CompiledForest.from_arrays(arrays, meta["forest"])
+    encoder = FeatureEncoder.from_dict(meta["encoder"])
+    return encoder, engine, meta
+
+
+def build_bundle(model_path, path=None):
+    """Load pipeline joblib, compile, lalu simpan sebagai bundle."""
+    import joblib
+
+    path = path or bundle_path_for(model_path)
+    from .compression import compiled_engine
+
+    pipeline = joblib.load(model_path)
+    encoder = FeatureEncoder.from_estimator(pipeline)
+    engine = compiled_engine(pipeline)
+    return save_bundle(encoder, engine, path, source_path=model_path)
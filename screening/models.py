@@ -64,7 +64,57 @@ class ScreeningSubmission(models.Model):
 	# Prediction result (optional)
 	result = models.CharField(max_length=50, blank=True)
 	confidence = models.CharField(max_length=20, blank=True)
+	# Versi bertipe dari result / confidence untuk query & agregasi
+	# (None = belum diprediksi / tidak bisa di-parse)
+	is_preeclampsia = models.BooleanField(null=True, db_index=True)
+	# Probabilitas kelas Preeklampsia, 0..1
+	preeclampsia_probability = models.FloatField(null=True, blank=True, db_index=True)
+	# Versi model (registry) yang menghasilkan prediksi ini
+	model_version = models.CharField(max_length=64, blank=True)
+
+	# Outcome klinis yang sudah dikonfirmasi (label untuk `manage.py retrain`)
+	OUTCOME_CHOICES = [
+		("Preeklampsia", "Preeklampsia"),
+		("NonPreeklampsia", "NonPreeklampsia"),
+	]
+	outcome = models.CharField(max_length=50, blank=True, choices=OUTCOME_CHOICES)
+	outcome_recorded_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+	class Meta:
+		# Keyset pagination (created_at, id) untuk dashboard dan riwayat per user
+		indexes = [
+			models.Index(fields=["created_at", "id"], name="submission_created_id"),
+			models.Index(fields=["user", "created_at", "id"], name="submission_user_created_id"),
+		]
 
 	def __str__(self):
 		return f"{self.patient_name} - {self.created_at:%Y-%m-%d %H:%M}"
 
+
+
+class SubmissionDailyStat(models.Model):
+	"""
+	Rollup jumlah ScreeningSubmission per (hari, kabupaten/kota, prediksi),
+	dijaga oleh screening/stats.py. Dashboard membaca tabel ini, bukan
+	men-scan tabel submission.
+	"""
+	PREDICTION_CHOICES = [
+		("Preeklampsia", "Preeklampsia"),
+		("NonPreeklampsia", "NonPreeklampsia"),
+		("", "Belum diprediksi"),
+	]
+	day = models.DateField()
+	district_city = models.CharField(max_length=100, blank=True)
+	prediction = models.CharField(max_length=20, blank=True, choices=PREDICTION_CHOICES)
+	count = models.BigIntegerField(default=0)
+	# Jumlah preeclampsia_probability (rata-rata = probability_sum / probability_count)
+	probability_sum = models.FloatField(default=0.0)
+	probability_count = models.BigIntegerField(default=0)
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=["day", "district_city", "prediction"], name="submission_daily_stat_bucket"),
+		]
+
+	def __str__(self):
+		return f"{self.day} {self.district_city or '-'} {self.prediction or '-'}: {self.count}"
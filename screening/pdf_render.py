@@ -0,0 +1,24 @@
+"""
+Render laporan HTML ke PDF dengan xhtml2pdf.
+
+Sengaja tanpa import Django, supaya `render_pdf` bisa dijalankan di process
+pool (lihat views_async.py) tanpa harus setup Django di proses anak.
+"""
+import io
+
+
+def render_pdf(html_content):
+    """
+    Return bytes PDF, atau None jika xhtml2pdf tidak terpasang / gagal
+    (pemanggil mengirim HTML sebagai gantinya).
+    """
+    try:
+        from xhtml2pdf import pisa
+    except ImportError:
+        return None
+
+    buffer = io.BytesIO()
+    pisa_status = pisa.CreatePDF(html_content, dest=buffer, encoding='utf-8')
+    if pisa_status.err:
+        return None
+    return buffer.getvalue()
@@ -0,0 +1,176 @@
+"""
+Cache hasil prediksi.
+
+Pasien yang sama sering di-screening ulang dengan input identik (mis.
+submit ulang karena salah ketik nama). `PredictionCache` menyimpan
+(label, probabilitas) dengan key hash dari vector fitur yang sudah
+di-encode dan dikanonikalisasi, ditambah versi + sha256 model aktif.
+Karena versi model ada di dalam key, entri dari model lama tidak pernah
+terpakai lagi setelah hot-swap; backend in-process juga dikosongkan saat
+swap supaya memorinya langsung bebas.
+
+Backend:
+- `LocMemBackend`: LRU in-process dengan TTL dan batas jumlah entri;
+- `DjangoCacheBackend`: memakai `django.core.cache.caches[alias]`
+  (mis. Redis/Memcached) supaya hit bisa dibagi antar worker.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LocMemBackend:
+    name = "locmem"
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max(int(max_entries), 1)
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def size(self):
+        return len(self._data)
+
+
+class DjangoCacheBackend:
+    name = "django"
+
+    def __init__(self, alias="default", key_prefix="screening:pred:"):
+        self.alias = alias
+        self.key_prefix = key_prefix
+        self.evictions = 0
+
+    @property
+    def _cache(self):
+        from django.core.cache import caches
+
+        return caches[self.alias]
+
+    def get(self, key):
+        return self._cache.get(self.key_prefix + key)
+
+    def set(self, key, value, ttl):
+        self._cache.set(self.key_prefix + key, value, timeout=ttl or None)
+
+    def clear(self):
+        # Cache bersama dipakai juga untuk hal lain (session, dll.), jadi
+        # tidak di-clear; entri model lama tidak cocok lagi karena versi
+        # model ada di key, dan akan kedaluwarsa sesuai TTL.
+        pass
+
+    def size(self):
+        return None
+
+
+class PredictionCache:
+    def __init__(self, backend, ttl=3600):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def from_settings(cls, conf):
+        conf = conf or {}
+        kind = conf.get("BACKEND", "locmem")
+        if kind == "django":
+            backend = DjangoCacheBackend(alias=conf.get("CACHE_ALIAS", "default"))
+        elif kind == "locmem":
+            backend = LocMemBackend(max_entries=conf.get("MAX_ENTRIES", 4096))
+        else:
+            raise ValueError(f"Backend cache prediksi tidak dikenal: {kind}")
+        return cls(backend, ttl=conf.get("TTL_SECONDS", 3600))
+
+    @staticmethod
+    def key_for(model, x):
+        """
+        Hash dari versi + sha256 model dan vector fitur kanonik (float64,
+        -0.0 -> 0.0, semua NaN diseragamkan) supaya input yang sama secara
+        nilai selalu menghasilkan key yang sama.
+        """
+        x = np.asarray(x, dtype=np.float64).ravel() + 0.0
+        x = np.where(np.isnan(x), np.nan, x)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{model.version}:{model.sha256}:{x.size}:".encode())
+        h.update(np.ascontiguousarray(x).tobytes())
+        return h.hexdigest()
+
+    def get(self, key):
+        """Return (label, proba_row) atau None jika tidak ada di cache."""
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            logger.exception("Prediction cache lookup failed")
+            value = None
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is None:
+            return None
+        label, proba = value
+        return label, np.asarray(proba, dtype=np.float64)
+
+    def set(self, key, label, proba):
+        if isinstance(label, np.generic):
+            label = label.item()
+        value = (label, tuple(float(p) for p in np.asarray(proba).ravel()))
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception:
+            logger.exception("Prediction cache store failed")
+            with self._lock:
+                self.errors += 1
+
+    def invalidate(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": self.backend.name,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+                "entries": self.backend.size(),
+                "evictions": self.backend.evictions,
+            }
@@ -0,0 +1,660 @@
+"""
+Runtime model prediksi: load, warm-up dan status kesiapan.
+
+Sebelumnya `views.py` meng-import pandas/NumPy/joblib/sklearn dan
+men-unpickle model saat modul di-import, sehingga `manage.py migrate`,
+`createsuperuser` atau proses admin ikut membayar biayanya. Sekarang:
+
+- import library ML dan load model baru terjadi saat `get_model()` pertama
+  kali dipanggil, atau di background lewat `start_background_warmup()`
+  (dipanggil dari website/wsgi.py dan website/asgi.py);
+- warm-up menjalankan beberapa prediksi sintetis dari baris ALL_FINAL.csv
+  supaya request pertama tidak membayar inisialisasi lazy;
+- `readiness()` dipakai endpoint /healthz/ready agar load balancer hanya
+  mengirim traffic setelah inferensi siap.
+
+Versi model yang aktif ditentukan oleh registry (lihat registry.py). Setiap
+worker memantau manifest; jika versi aktif berubah, versi baru di-load dan
+di-warm-up di background, lalu referensi model aktif ditukar secara atomik.
+Request yang sedang berjalan tetap memakai objek model yang sudah mereka
+pegang, jadi tidak ada request yang gagal saat swap.
+"""
+import csv
+import logging
+import os
+import threading
+import time
+import traceback
+
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+ML_DIR = os.path.join(os.path.dirname(__file__), "ml_models")
+
+# MODEL UTAMA untuk prediksi (Pipeline dengan preprocessing), dipakai jika
+# registry (ml_models/registry.json) tidak ada
+MODEL_PATH = os.path.join(ML_DIR, "rf_preeclampsia.joblib")
+REGISTRY_PATH = os.path.join(ML_DIR, "registry.json")
+WARMUP_CSV_PATH = os.path.join(ML_DIR, "ALL_FINAL.csv")
+UNVERSIONED = "unversioned"
+
+
+class LoadedModel:
+    """
+    Satu model yang siap dipakai untuk prediksi.
+
+    pipeline: Pipeline sklearn (hanya jika di-load lewat joblib; fallback)
+    encoder / engine: hasil compile (lihat inference.py), None jika gagal
+    batcher: MicroBatcher di atas engine, None jika batching dimatikan
+    """
+
+    def __init__(self, path, sha256, storage, pipeline=None, encoder=None, engine=None, version=UNVERSIONED):
+        self.version = version
+        self.path = path
+        self.sha256 = sha256
+        self.storage = storage
+        self.pipeline = pipeline
+        self.encoder = encoder
+        self.engine = engine
+        self.batcher = None
+
+    @property
+    def classes(self):
+        if self.engine is not None:
+            return list(self.engine.classes_)
+        return list(self.pipeline.classes_)
+
+
+class _State:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.model = None
+        self.thread_budget = None
+        self.prediction_cache = None
+        self.status = "idle"  # idle | loading | warming_up | ready | failed
+        self.error = None
+        self.load_ms = None
+        self.warmup_ms = None
+        self.warmup_rows = 0
+        self.warmup_thread = None
+        # load yang sedang berjalan (Event di-set saat selesai), dan backoff
+        # percobaan ulang setelah load gagal
+        self.loading = None
+        self.failures = 0
+        self.retry_at = 0.0
+        # hot-swap dari registry
+        self.registry_mtime = None
+        self.registry_checked_at = 0.0
+        self.swap_thread = None
+        self.swap_error = None
+        self.swaps = 0
+
+
+_state = _State()
+
+
+def _reset_after_fork():
+    # Thread warm-up tidak ikut ter-fork (mis. gunicorn --preload). Jika model
+    # belum selesai di-load di proses induk, child me-load sendiri.
+    _state.lock = threading.Lock()
+    _state.swap_thread = None
+    _state.loading = None
+    if _state.model is None:
+        _state.ready = threading.Event()
+        _state.status = "idle"
+        _state.warmup_thread = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# ==============
+# LOAD
+# ==============
+
+def thread_budget():
+    if _state.thread_budget is None:
+        from .inference import ThreadBudget
+
+        _state.thread_budget = ThreadBudget.from_settings(
+            getattr(settings, "SCREENING_INFERENCE_THREADS", None)
+        )
+    return _state.thread_budget
+
+
+def load_model(path=MODEL_PATH, version=UNVERSIONED, expected_sha256=None):
+    """
+    Load model dari bundle mmap (jika diaktifkan dan masih cocok) atau dari
+    joblib, lalu compile. Return LoadedModel; raise jika model tidak bisa
+    dipakai sama sekali.
+    """
+    from .model_bundle import StaleBundleError, bundle_path_for, file_sha256, load_bundle
+
+    storage_conf = getattr(settings, "SCREENING_MODEL_STORAGE", {})
+    sha256 = file_sha256(path)
+    if expected_sha256 and sha256 != expected_sha256:
+        raise ValueError(f"Hash {path} tidak cocok dengan registry untuk versi {version}")
+
+    # Mode bundle mmap (lihat model_bundle.py): array forest dibuka read-only
+    # lewat mmap sehingga semua worker di satu host berbagi memori yang sama,
+    # dan sklearn tidak perlu di-load sama sekali.
+    if storage_conf.get("MMAP_BUNDLE", False):
+        try:
+            encoder, engine, _ = load_bundle(bundle_path_for(path), expected_sha256=sha256)
+            logger.info("Model bundle (mmap) loaded from %s", bundle_path_for(path))
+            return LoadedModel(path, sha256, "mmap_bundle", encoder=encoder, engine=engine, version=version)
+        except (FileNotFoundError, StaleBundleError) as e:
+            logger.info("Model bundle not usable (%s), loading %s with joblib", e, path)
+        except Exception:
+            logger.exception("Failed to load model bundle for %s", path)
+
+    import joblib
+
+    from .compression import compiled_engine
+    from .inference import FeatureEncoder, prepare_for_inference
+
+    # Load model Pipeline (sudah include preprocessing: imputation + onehot encoding)
+    pipeline = joblib.load(path)
+    prepare_for_inference(pipeline)
+    logger.info("Model Pipeline loaded successfully from %s (%s)", path, type(pipeline).__name__)
+
+    # Pipeline di-compile ke array NumPy (lihat inference.py). Jika compile
+    # gagal, prediksi tetap jalan lewat pipeline sklearn.
+    try:
+        encoder = FeatureEncoder.from_estimator(pipeline)
+        engine = compiled_engine(pipeline)
+        logger.info(
+            "Compiled RF engine: %d features, %d trees, %d nodes",
+            encoder.n_features_out,
+            engine.n_estimators,
+            engine.node_count,
+        )
+    except Exception as e:
+        logger.warning("Failed to compile RF model, falling back to sklearn: %s", e)
+        return LoadedModel(path, sha256, "joblib", pipeline=pipeline, version=version)
+
+    # Bundle belum ada / sudah basi: tulis ulang, lalu pakai versi mmap
+    # supaya worker ini juga tidak menyimpan salinan pipeline sendiri.
+    if storage_conf.get("MMAP_BUNDLE", False) and storage_conf.get("AUTO_BUILD", False):
+        try:
+            from .model_bundle import save_bundle
+
+            save_bundle(encoder, engine, bundle_path_for(path), source_path=path)
+            encoder, engine, _ = load_bundle(bundle_path_for(path))
+            logger.info("Model bundle written to %s", bundle_path_for(path))
+            return LoadedModel(path, sha256, "mmap_bundle", encoder=encoder, engine=engine, version=version)
+        except Exception as e:
+            logger.warning("Could not write model bundle for %s: %s", path, e)
+
+    return LoadedModel(
+        path, sha256, "joblib", pipeline=pipeline, encoder=encoder, engine=engine, version=version
+    )
+
+
+def prediction_cache():
+    """PredictionCache proses ini, atau None jika cache dimatikan."""
+    conf = getattr(settings, "SCREENING_PREDICTION_CACHE", {})
+    if not conf.get("ENABLED", False):
+        return None
+    if _state.prediction_cache is None:
+        from .prediction_cache import PredictionCache
+
+        _state.prediction_cache = PredictionCache.from_settings(conf)
+    return _state.prediction_cache
+
+
+def predict_encoded(model, x, timeout=30):
+    """
+    Prediksi satu vector fitur yang sudah di-encode: return (label, proba_row).
+    Urutan: cache hasil prediksi -> micro-batcher -> engine langsung.
+    """
+    cache = prediction_cache()
+    key = None
+    if cache is not None:
+        key = cache.key_for(model, x)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+
+    if model.batcher is not None:
+        label, proba = model.batcher.predict(x, timeout=timeout)
+    else:
+        started = time.perf_counter()
+        labels, proba_rows = model.engine.predict_with_proba(x)
+        metrics.observe_inference("single", 1, time.perf_counter() - started)
+        label, proba = labels[0], proba_rows[0]
+
+    if cache is not None:
+        cache.set(key, label, proba)
+    return label, proba
+
+
+def predict_rows(model, rows):
+    """
+    Prediksi banyak baris fitur (dict kolom training, lihat
+    dataset.feature_row) dalam satu panggilan vectorized.
+    Return: (labels, proba) dengan urutan sama dengan `rows`.
+    """
+    if model.engine is not None:
+        X = model.encoder.transform_rows(rows)
+        started = time.perf_counter()
+        result = model.engine.predict_with_proba(X, n_jobs=thread_budget().n_jobs_for(len(X)))
+        metrics.observe_inference("vectorized", len(X), time.perf_counter() - started)
+        return result
+
+    # Fallback: pipeline sklearn dengan DataFrame
+    import numpy as np
+    import pandas as pd
+
+    X_input = pd.DataFrame(rows)
+    started = time.perf_counter()
+    with thread_budget().sklearn_context(len(X_input)):
+        proba = model.pipeline.predict_proba(X_input)
+    metrics.observe_inference("sklearn", len(X_input), time.perf_counter() - started)
+    return np.asarray(model.classes)[proba.argmax(axis=1)], proba
+
+
+def _attach_batcher(model):
+    # Micro-batching: request yang datang bersamaan dinilai dalam satu batch
+    # (lihat batching.py dan settings.SCREENING_BATCHING).
+    conf = getattr(settings, "SCREENING_BATCHING", {})
+    if model.engine is None or not conf.get("ENABLED", False):
+        return
+    from .batching import MicroBatcher
+
+    engine = model.engine
+    budget = thread_budget()
+
+    def predict_batch(X):
+        started = time.perf_counter()
+        result = engine.predict_with_proba(X, n_jobs=budget.n_jobs_for(len(X)))
+        metrics.observe_inference("batcher", len(X), time.perf_counter() - started)
+        return result
+
+    model.batcher = MicroBatcher(
+        predict_batch,
+        window_ms=conf.get("WINDOW_MS", 2),
+        max_batch_size=conf.get("MAX_BATCH_SIZE", 32),
+    )
+
+
+def registry():
+    from .registry import ModelRegistry
+
+    conf = getattr(settings, "SCREENING_MODEL_REGISTRY", {})
+    return ModelRegistry(conf.get("MANIFEST", REGISTRY_PATH))
+
+
+def _resolve_active():
+    """(version, path, sha256) model aktif menurut registry, atau MODEL_PATH."""
+    reg = registry()
+    entry = reg.active() if reg.exists() else None
+    if entry is None:
+        return UNVERSIONED, MODEL_PATH, None
+    return entry["version"], reg.artifact_path(entry), entry["sha256"]
+
+
+def _retry_conf():
+    conf = getattr(settings, "SCREENING_WARMUP", {})
+    return float(conf.get("RETRY_SECONDS", 5)), float(conf.get("RETRY_MAX_SECONDS", 300))
+
+
+def _retry_due():
+    """
+    Setelah load gagal: boleh dicoba lagi jika backoff sudah lewat, atau
+    manifest registry berubah (dicek paling sering sekali per POLL_SECONDS),
+    mis. versi yang rusak sudah diganti. Dipanggil dengan lock dipegang.
+    """
+    now = time.monotonic()
+    if now >= _state.retry_at:
+        return True
+    poll = getattr(settings, "SCREENING_MODEL_REGISTRY", {}).get("POLL_SECONDS", 10)
+    if poll is None or now - _state.registry_checked_at < poll:
+        return False
+    _state.registry_checked_at = now
+    return registry().mtime() != _state.registry_mtime
+
+
+def _load_failed(message):
+    base, cap = _retry_conf()
+    _state.failures += 1
+    delay = min(base * 2 ** (_state.failures - 1), cap)
+    _state.retry_at = time.monotonic() + delay
+    _state.status = "failed"
+    _state.error = message
+    _state.ready.set()
+    logger.error("Model load failed (attempt %d), retrying in %.1f s", _state.failures, delay)
+
+
+def _load_active(timeout=None):
+    """
+    Load model aktif. Hanya satu thread yang me-load; lock tidak dipegang
+    selama load, jadi thread lain cukup menunggu load tersebut maks
+    `timeout` detik. Setelah gagal, load dicoba lagi dengan backoff
+    eksponensial (SCREENING_WARMUP RETRY_SECONDS .. RETRY_MAX_SECONDS).
+    """
+    with _state.lock:
+        if _state.model is not None:
+            return _state.model
+        loading = _state.loading
+        owner = loading is None
+        if owner:
+            if _state.status == "failed" and not _retry_due():
+                return None
+            loading = _state.loading = threading.Event()
+            _state.status = "loading"
+    if not owner:
+        loading.wait(timeout)
+        return _state.model
+
+    started = time.perf_counter()
+    path = MODEL_PATH
+    model = None
+    try:
+        _state.registry_mtime = registry().mtime()
+        _state.registry_checked_at = time.monotonic()
+        version, path, sha256 = _resolve_active()
+        model = load_model(path, version=version, expected_sha256=sha256)
+        _attach_batcher(model)
+    except FileNotFoundError:
+        logger.error("Model file not found: %s", path)
+        logger.error("Prediksi tidak dapat dilakukan tanpa model rf_preeclampsia.joblib")
+        error = f"Model file not found: {path}"
+    except Exception as e:
+        logger.error("Failed to load RF model from %s: %s", path, e)
+        logger.error("Traceback: %s", traceback.format_exc())
+        error = str(e)
+
+    with _state.lock:
+        _state.loading = None
+        if model is None:
+            _load_failed(error)
+        else:
+            _state.load_ms = (time.perf_counter() - started) * 1000.0
+            _state.model = model
+            _state.failures = 0
+            _state.error = None
+            warming = threading.current_thread() is _state.warmup_thread
+            _state.status = "warming_up" if warming else "ready"
+            if not warming:
+                _state.ready.set()
+            logger.info("Active model version: %s", model.version)
+    loading.set()
+    return model
+
+
+def get_model(timeout=None):
+    """
+    Model aktif untuk prediksi, atau None jika model tidak tersedia.
+
+    Jika warm-up background sedang berjalan, tunggu sampai selesai (maks
+    `timeout` detik); thread warm-up itu juga yang mencoba ulang load yang
+    gagal. Tanpa warm-up, model di-load di thread ini (atau menunggu load
+    di thread lain maks `timeout` detik).
+    Pemanggil sebaiknya memegang objek yang dikembalikan selama request,
+    supaya hot-swap di tengah request tidak mengubah model yang dipakai.
+    """
+    model = _state.model
+    if model is not None:
+        _maybe_check_registry()
+        return model
+    if _state.warmup_thread is not None and _state.warmup_thread.is_alive():
+        _state.ready.wait(timeout)
+        return _state.model
+    return _load_active(timeout)
+
+
+# ==============
+# HOT-SWAP
+# ==============
+
+def _maybe_check_registry():
+    """
+    Cek mtime manifest registry paling sering sekali per POLL_SECONDS. Jika
+    berubah dan versi aktifnya berbeda, mulai swap di background.
+    """
+    conf = getattr(settings, "SCREENING_MODEL_REGISTRY", {})
+    poll = conf.get("POLL_SECONDS", 10)
+    now = time.monotonic()
+    if poll is None or now - _state.registry_checked_at < poll:
+        return
+    _state.registry_checked_at = now
+
+    mtime = registry().mtime()
+    if mtime == _state.registry_mtime:
+        return
+    _state.registry_mtime = mtime
+    try:
+        version, _, _ = _resolve_active()
+    except Exception:
+        logger.exception("Failed to read model registry")
+        return
+    if _state.model is not None and version != _state.model.version:
+        swap_to(version, background=True)
+
+
+def swap_to(version, background=False):
+    """
+    Load versi `version` dari registry, warm-up, lalu jadikan model aktif.
+    Jika load/warm-up gagal, model lama tetap aktif.
+    """
+    with _state.lock:
+        if _state.swap_thread is not None and _state.swap_thread.is_alive():
+            return _state.swap_thread
+        if background:
+            _state.swap_thread = threading.Thread(
+                target=_swap_main, args=(version,), name="model-swap", daemon=True
+            )
+            _state.swap_thread.start()
+            return _state.swap_thread
+    _swap_main(version)
+    return None
+
+
+def _swap_main(version):
+    conf = getattr(settings, "SCREENING_WARMUP", {})
+    try:
+        reg = registry()
+        entry = reg.get(version)
+        started = time.perf_counter()
+        model = load_model(reg.artifact_path(entry), version=version, expected_sha256=entry["sha256"])
+        _attach_batcher(model)
+        load_ms = (time.perf_counter() - started) * 1000.0
+        warmup_ms = warm_up(model, int(conf.get("ROWS", 8)))
+    except Exception as e:
+        logger.exception("Hot-swap to model version %s failed; keeping current model", version)
+        _state.swap_error = f"{version}: {e}"
+        return
+
+    with _state.lock:
+        old = _state.model
+        # Penukaran referensi bersifat atomik; request yang sedang berjalan
+        # tetap memakai objek `old` yang sudah mereka pegang.
+        _state.model = model
+        _state.load_ms = load_ms
+        _state.warmup_ms = warmup_ms
+        _state.swap_error = None
+        _state.swaps += 1
+        _state.status = "ready"
+        _state.ready.set()
+    if old is not None and old.batcher is not None:
+        old.batcher.close()
+    if _state.prediction_cache is not None:
+        _state.prediction_cache.invalidate()
+    logger.info(
+        "Swapped active model %s -> %s (load %.1f ms, warm-up %.1f ms)",
+        old.version if old is not None else None,
+        version,
+        load_ms,
+        warmup_ms,
+    )
+
+
+# ==============
+# WARM-UP
+# ==============
+
+def _parse_cell(val):
+    val = val.strip()
+    if not val:
+        return None
+    try:
+        return float(val)
+    except ValueError:
+        return val
+
+
+def _warmup_rows(n_rows, path=WARMUP_CSV_PATH):
+    """Ambil beberapa baris ALL_FINAL.csv sebagai input sintetis (dict per baris)."""
+    rows = []
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh, delimiter=";")
+        header = [h.strip() for h in next(reader)]
+        for raw in reader:
+            if len(rows) >= n_rows:
+                break
+            if raw:
+                rows.append({col: _parse_cell(val) for col, val in zip(header, raw)})
+    return rows
+
+
+def warm_up(model, n_rows=8):
+    """
+    Jalankan prediksi sintetis (satu baris + batch) supaya semua jalur
+    inferensi sudah "panas" sebelum request pertama. Return durasi (ms).
+    """
+    started = time.perf_counter()
+    rows = _warmup_rows(n_rows)
+    if model.encoder is not None and model.engine is not None:
+        X = model.encoder.transform_rows(rows)
+        model.engine.predict_with_proba(X)
+        for x in X:
+            model.engine.predict_with_proba(x)
+        if model.batcher is not None:
+            model.batcher.predict(X[0], timeout=30)
+    elif model.pipeline is not None:
+        import pandas as pd
+
+        X_input = pd.DataFrame(rows)
+        with thread_budget().sklearn_context(1):
+            model.pipeline.predict_proba(X_input.iloc[:1])
+        with thread_budget().sklearn_context(len(X_input)):
+            model.pipeline.predict_proba(X_input)
+    _state.warmup_rows = len(rows)
+    return (time.perf_counter() - started) * 1000.0
+
+
+def _warmup_main(n_rows):
+    model = _load_active()
+    while model is None:
+        # Load gagal: thread ini tetap hidup dan mencoba lagi setelah
+        # backoff, atau lebih cepat jika manifest registry berubah
+        poll = getattr(settings, "SCREENING_MODEL_REGISTRY", {}).get("POLL_SECONDS", 10)
+        wait = _state.retry_at - time.monotonic()
+        if poll is not None:
+            wait = min(wait, poll)
+        time.sleep(max(wait, 0.1))
+        model = _load_active()
+    try:
+        _state.warmup_ms = warm_up(model, n_rows)
+        logger.info("Model warm-up finished in %.1f ms (%d rows)", _state.warmup_ms, _state.warmup_rows)
+    except Exception:
+        logger.exception("Model warm-up failed; serving without warm-up")
+    _state.status = "ready"
+    _state.ready.set()
+
+
+def start_background_warmup():
+    """
+    Mulai load + warm-up model di background thread (sekali per proses).
+    Dipanggil oleh website/wsgi.py dan website/asgi.py, jadi perintah
+    manage.py seperti migrate tidak ikut me-load model.
+    """
+    conf = getattr(settings, "SCREENING_WARMUP", {})
+    if not conf.get("ENABLED", True):
+        return None
+    with _state.lock:
+        if _state.warmup_thread is not None or _state.model is not None:
+            return _state.warmup_thread
+        _state.warmup_thread = threading.Thread(
+            target=_warmup_main,
+            args=(int(conf.get("ROWS", 8)),),
+            name="model-warmup",
+            daemon=True,
+        )
+        _state.warmup_thread.start()
+        return _state.warmup_thread
+
+
+def readiness():
+    """Status untuk /healthz/ready."""
+    model = _state.model
+    return {
+        "ready": model is not None and _state.status == "ready",
+        "status": _state.status,
+        "model_loaded": model is not None,
+        "model_path": os.path.relpath(
+            model.path if model is not None else MODEL_PATH, os.path.dirname(os.path.dirname(ML_DIR))
+        ),
+        "model_version": model.version if model is not None else None,
+        "model_sha256": model.sha256 if model is not None else None,
+        "storage": model.storage if model is not None else None,
+        "load_ms": _state.load_ms,
+        "warmup_ms": _state.warmup_ms,
+        "warmup_rows": _state.warmup_rows,
+        "error": _state.error,
+        "load_failures": _state.failures,
+        "swaps": _state.swaps,
+        "swap_error": _state.swap_error,
+    }
+
+
+# ==============
+# METRIK (/metrics)
+# ==============
+
+@metrics.register_collector
+def _collect_metrics():
+    model = _state.model
+    yield "screening_model_ready", "gauge", "1 jika model sudah di-load dan warm-up selesai.", [
+        ({}, _state.status == "ready" and model is not None)
+    ]
+    if model is not None:
+        engine = "compiled" if model.engine is not None else "sklearn"
+        yield "screening_model_info", "gauge", "Model aktif (versi, storage, engine).", [
+            ({"version": model.version, "storage": model.storage, "engine": engine}, 1)
+        ]
+    yield "screening_model_load_seconds", "gauge", "Durasi load model aktif (detik).", [
+        ({}, _state.load_ms / 1000.0 if _state.load_ms is not None else None)
+    ]
+    yield "screening_model_warmup_seconds", "gauge", "Durasi warm-up model aktif (detik).", [
+        ({}, _state.warmup_ms / 1000.0 if _state.warmup_ms is not None else None)
+    ]
+    yield "screening_model_swaps_total", "counter", "Jumlah hot-swap model dari registry.", [({}, _state.swaps)]
+
+    if model is not None and model.batcher is not None:
+        stats = model.batcher.stats()
+        yield "screening_batcher_batches_total", "counter", "Jumlah batch micro-batcher.", [({}, stats["batches"])]
+        yield "screening_batcher_rows_total", "counter", "Jumlah baris lewat micro-batcher.", [({}, stats["rows"])]
+        yield "screening_batcher_errors_total", "counter", "Jumlah batch yang gagal.", [({}, stats["errors"])]
+        yield "screening_batcher_queue_depth", "gauge", "Item yang menunggu di antrean.", [({}, stats["queue_depth"])]
+        yield "screening_batcher_queue_wait_seconds", "gauge", "Waktu tunggu antrean (1024 item terakhir).", [
+            ({"quantile": "0.5"}, stats["queue_wait_ms"]["p50"] / 1000.0),
+            ({"quantile": "0.95"}, stats["queue_wait_ms"]["p95"] / 1000.0),
+        ]
+
+    cache = _state.prediction_cache
+    if cache is not None:
+        stats = cache.stats()
+        yield "screening_prediction_cache_hits_total", "counter", "Cache hit prediksi.", [({}, stats["hits"])]
+        yield "screening_prediction_cache_misses_total", "counter", "Cache miss prediksi.", [({}, stats["misses"])]
+        yield "screening_prediction_cache_evictions_total", "counter", "Entri yang dibuang (LRU).", [
+            ({}, stats["evictions"])
+        ]
+        if stats["entries"] is not None:
+            yield "screening_prediction_cache_entries", "gauge", "Jumlah entri cache.", [({}, stats["entries"])]
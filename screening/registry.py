@@ -0,0 +1,152 @@
+"""
+Registry model berversi.
+
+Manifest JSON (default: ml_models/registry.json) mencatat setiap artefak
+model beserta hash sha256 dan metadata, plus versi mana yang aktif:
+
+    {
+      "active": "rf200-2025-12",
+      "versions": [
+        {"version": "rf200-2025-12", "path": "rf_preeclampsia.joblib",
+         "sha256": "...", "created_at": "...", "metadata": {...}}
+      ]
+    }
+
+`path` relatif terhadap direktori manifest. Key opsional
+"retrain_watermark" mencatat submission berlabel terakhir yang sudah
+dipakai `manage.py retrain`; disimpan di level manifest (bukan di metadata
+versi) supaya tidak ikut mundur saat versi aktif di-rollback. Manifest selalu ditulis secara
+atomik (file sementara + os.replace), sehingga worker yang sedang membaca
+tidak pernah melihat file setengah jadi. Worker memantau mtime manifest dan
+melakukan hot-swap ke versi aktif yang baru (lihat predictor.py).
+"""
+import json
+import os
+import tempfile
+import time
+
+from .model_bundle import file_sha256
+
+
+class RegistryError(Exception):
+    pass
+
+
+class ModelRegistry:
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    def mtime(self):
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    # ==============
+    # BACA
+    # ==============
+
+    def read(self):
+        if not self.exists():
+            return {"active": None, "versions": []}
+        with open(self.manifest_path, encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def versions(self):
+        return self.read()["versions"]
+
+    def get(self, version, manifest=None):
+        manifest = manifest or self.read()
+        for entry in manifest["versions"]:
+            if entry["version"] == version:
+                return entry
+        raise RegistryError(f"Versi model tidak ditemukan di registry: {version}")
+
+    def active(self):
+        """Entry versi aktif, atau None jika registry kosong / tidak ada."""
+        manifest = self.read()
+        if not manifest.get("active"):
+            return None
+        return self.get(manifest["active"], manifest)
+
+    def retrain_watermark(self):
+        """
+        Watermark retrain terakhir, atau None. Manifest lama yang belum punya
+        key ini memakai watermark di metadata versi aktif.
+        """
+        manifest = self.read()
+        if "retrain_watermark" in manifest:
+            return manifest["retrain_watermark"]
+        entry = self.get(manifest["active"], manifest) if manifest.get("active") else None
+        return ((entry or {}).get("metadata") or {}).get("retrain", {}).get("watermark")
+
+    def artifact_path(self, entry):
+        return os.path.join(self.base_dir, entry["path"])
+
+    def verify(self, entry):
+        """Pastikan file artefak ada dan hash-nya sama dengan manifest."""
+        path = self.artifact_path(entry)
+        if not os.path.exists(path):
+            raise RegistryError(f"Artefak {entry['version']} tidak ditemukan: {path}")
+        actual = file_sha256(path)
+        if actual != entry["sha256"]:
+            raise RegistryError(
+                f"Hash artefak {entry['version']} tidak cocok: manifest {entry['sha256'][:12]}, file {actual[:12]}"
+            )
+        return path
+
+    # ==============
+    # TULIS
+    # ==============
+
+    def _write(self, manifest):
+        fd, tmp_path = tempfile.mkstemp(prefix=".registry-", suffix=".json", dir=self.base_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(manifest, fh, indent=2)
+                fh.write("\n")
+            # mkstemp membuat file 0600; manifest harus terbaca oleh worker lain
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def register(self, path, version, metadata=None, activate=False, retrain_watermark=None):
+        """
+        Tambah versi baru. `retrain_watermark` (jika ada) ditulis dalam
+        penulisan manifest yang sama, jadi versi dan watermark selalu konsisten.
+        """
+        manifest = self.read()
+        if any(e["version"] == version for e in manifest["versions"]):
+            raise RegistryError(f"Versi {version} sudah terdaftar")
+        if not os.path.exists(path):
+            raise RegistryError(f"File artefak tidak ditemukan: {path}")
+
+        entry = {
+            "version": version,
+            "path": os.path.relpath(os.path.abspath(path), self.base_dir),
+            "sha256": file_sha256(path),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "metadata": metadata or {},
+        }
+        manifest["versions"].append(entry)
+        if activate or not manifest.get("active"):
+            manifest["active"] = version
+        if retrain_watermark is not None:
+            manifest["retrain_watermark"] = retrain_watermark
+        self._write(manifest)
+        return entry
+
+    def activate(self, version):
+        manifest = self.read()
+        entry = self.get(version, manifest)
+        self.verify(entry)
+        manifest["active"] = version
+        self._write(manifest)
+        return entry
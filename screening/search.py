@@ -0,0 +1,275 @@
+"""
+Index pencarian submission: nama pasien, kabupaten/kota dan user pengirim
+(username + email), untuk kotak pencarian admin dan dashboard.
+
+`icontains` biasa berarti full table scan (plus join ke tabel user) untuk
+setiap pencarian. Backend dipilih per database (SCREENING_SEARCH['BACKEND'],
+default 'auto'):
+
+- `Fts5Backend` (SQLite): virtual table FTS5 dengan tokenizer trigram,
+  jadi semantiknya tetap substring tanpa beda huruf besar/kecil seperti
+  icontains. Index dijaga oleh trigger SQLite (insert / update / delete
+  submission dan perubahan username / email), sehingga `bulk_create`,
+  `queryset.update()` dan SQL mentah ikut tersinkron tanpa signal.
+- `PostgresTrigramBackend`: index GIN pg_trgm pada ekspresi yang dipakai
+  lookup icontains Django, sehingga query icontains biasa memakai index.
+- `IContainsBackend`: tanpa index (database lain, atau BACKEND 'none').
+
+Index dibuat oleh migrasi 0012; `manage.py rebuild_search_index` membuat
+ulang dan mengisi ulang index jika tidak sinkron (mis. database di-restore
+tanpa trigger).
+"""
+import logging
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "screening_submission_fts"
+# Tokenizer trigram tersedia sejak SQLite 3.34
+FTS5_MIN_SQLITE = (3, 34, 0)
+
+
+def _user_columns(user_model):
+    """Kolom tabel user yang ikut di-index (username dan email jika ada)."""
+    names = {f.name: f.column for f in user_model._meta.concrete_fields}
+    # Model historis (migrasi) tidak membawa USERNAME_FIELD
+    columns = [names[getattr(user_model, "USERNAME_FIELD", "username")]]
+    if "email" in names and names["email"] not in columns:
+        columns.append(names["email"])
+    return columns
+
+
+class IContainsBackend:
+    name = "icontains"
+
+    def install(self, schema_editor, submission_model, user_model):
+        pass
+
+    def uninstall(self, schema_editor, submission_model, user_model):
+        pass
+
+    def size(self, connection):
+        """Jumlah baris di index, atau None jika backend tidak punya tabel index."""
+        return None
+
+    def filter(self, queryset, term):
+        query = Q()
+        for token in term.split():
+            query &= (
+                Q(patient_name__icontains=token)
+                | Q(district_city__icontains=token)
+                | Q(user__username__icontains=token)
+                | Q(user__email__icontains=token)
+            )
+        return queryset.filter(query)
+
+
+class Fts5Backend(IContainsBackend):
+    name = "fts5"
+    # Trigram: token query harus minimal 3 karakter supaya bisa pakai index
+    MIN_TOKEN_LENGTH = 3
+
+    def _sql(self, submission_model, user_model):
+        sub = submission_model._meta.db_table
+        user = user_model._meta.db_table
+        user_pk = user_model._meta.pk.column
+        columns = _user_columns(user_model)
+        watched = ", ".join(f'"{c}"' for c in columns)
+
+        def user_text(alias):
+            return " || ' ' || ".join(f'COALESCE({alias}."{c}", \'\')' for c in columns)
+
+        def user_of(row):
+            return f'COALESCE((SELECT {user_text("u")} FROM "{user}" u WHERE u."{user_pk}" = {row}.user_id), \'\')'
+
+        insert_new = (
+            f"INSERT INTO {FTS_TABLE}(rowid, patient_name, district_city, user_text) "
+            f"VALUES (new.id, new.patient_name, new.district_city, {user_of('new')});"
+        )
+        return {
+            "table": (
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                f"USING fts5(patient_name, district_city, user_text, tokenize='trigram')"
+            ),
+            "triggers": {
+                "ai": f'AFTER INSERT ON "{sub}" BEGIN {insert_new} END',
+                "ad": f'AFTER DELETE ON "{sub}" BEGIN DELETE FROM {FTS_TABLE} WHERE rowid = old.id; END',
+                "au": (
+                    f'AFTER UPDATE OF id, patient_name, district_city, user_id ON "{sub}" BEGIN '
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id; {insert_new} END"
+                ),
+                "user_au": (
+                    f'AFTER UPDATE OF {watched} ON "{user}" BEGIN '
+                    f"UPDATE {FTS_TABLE} SET user_text = {user_text('new')} "
+                    f'WHERE rowid IN (SELECT id FROM "{sub}" WHERE user_id = new."{user_pk}"); END'
+                ),
+            },
+            "populate": (
+                f"INSERT INTO {FTS_TABLE}(rowid, patient_name, district_city, user_text) "
+                f'SELECT s.id, s.patient_name, s.district_city, {user_of("s")} FROM "{sub}" s'
+            ),
+        }
+
+    def install(self, schema_editor, submission_model, user_model):
+        sql = self._sql(submission_model, user_model)
+        schema_editor.execute(sql["table"])
+        for suffix, body in sql["triggers"].items():
+            schema_editor.execute(f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{suffix} {body}")
+        # Isi ulang dari nol (idempotent, juga dipakai rebuild_search_index)
+        schema_editor.execute(f"DELETE FROM {FTS_TABLE}")
+        schema_editor.execute(sql["populate"])
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+    def uninstall(self, schema_editor, submission_model, user_model):
+        for suffix in self._sql(submission_model, user_model)["triggers"]:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    def size(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def match_expression(term):
+        """Setiap kata jadi frase (substring) yang semuanya harus cocok."""
+        return " AND ".join('"' + token.replace('"', '""') + '"' for token in term.split())
+
+    def filter(self, queryset, term):
+        """
+        Kata kunci spesifik: ambil rowid dari index (maks MAX_INDEX_MATCHES)
+        lalu filter pk. Kata kunci umum (lebih banyak hasil dari batas itu,
+        mis. nama kabupaten) memakai icontains: scan urut index created_at
+        sudah menemukan satu halaman hasil dalam beberapa baris, sedangkan
+        menyortir semua hasil index justru lebih lambat.
+        """
+        tokens = term.split()
+        if not tokens or any(len(token) < self.MIN_TOKEN_LENGTH for token in tokens):
+            # Kata pendek tidak punya trigram; icontains tetap benar (tanpa index)
+            return super().filter(queryset, term)
+        limit = int(getattr(settings, "SCREENING_SEARCH", {}).get("MAX_INDEX_MATCHES", 5000))
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s LIMIT %s",
+                (self.match_expression(term), limit + 1),
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        if len(ids) > limit:
+            return super().filter(queryset, term)
+        return queryset.filter(pk__in=ids)
+
+    @classmethod
+    def supported(cls, connection):
+        """SQLite ini punya FTS5 dengan tokenizer trigram (dicoba di tabel temp)."""
+        import sqlite3
+
+        if sqlite3.sqlite_version_info < FTS5_MIN_SQLITE:
+            return False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("CREATE VIRTUAL TABLE temp.screening_fts_probe USING fts5(x, tokenize='trigram')")
+                cursor.execute("DROP TABLE temp.screening_fts_probe")
+            return True
+        except Exception:
+            return False
+
+
+class PostgresTrigramBackend(IContainsBackend):
+    name = "pg_trgm"
+
+    def _indexes(self, submission_model, user_model):
+        # Ekspresi harus sama dengan lookup icontains Django: UPPER(kolom::text)
+        targets = [(submission_model._meta.db_table, "patient_name"), (submission_model._meta.db_table, "district_city")]
+        targets += [(user_model._meta.db_table, column) for column in _user_columns(user_model)]
+        return [(f"{table}_{column}_trgm"[:63], table, column) for table, column in targets]
+
+    def install(self, schema_editor, submission_model, user_model):
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, table, column in self._indexes(submission_model, user_model):
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+            )
+
+    def uninstall(self, schema_editor, submission_model, user_model):
+        for name, _, _ in self._indexes(submission_model, user_model):
+            schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+BACKENDS = {
+    "fts5": Fts5Backend,
+    "pg_trgm": PostgresTrigramBackend,
+    "none": IContainsBackend,
+}
+
+# (alias, NAME database) -> nama backend yang aktif untuk pencarian
+_active = {}
+
+
+def backend_name(connection):
+    """Nama backend untuk koneksi ini sesuai SCREENING_SEARCH['BACKEND']."""
+    kind = getattr(settings, "SCREENING_SEARCH", {}).get("BACKEND", "auto")
+    if kind != "auto":
+        if kind not in BACKENDS:
+            raise ValueError(f"Backend pencarian tidak dikenal: {kind}")
+        return kind
+    if connection.vendor == "sqlite" and Fts5Backend.supported(connection):
+        return "fts5"
+    if connection.vendor == "postgresql":
+        return "pg_trgm"
+    return "none"
+
+
+def backend_for(connection):
+    return BACKENDS[backend_name(connection)]()
+
+
+def _active_backend(connection):
+    """
+    Backend untuk query (dicek sekali per database). Jika index FTS5 belum
+    dibuat di database ini, pencarian memakai icontains.
+    """
+    key = (connection.alias, str(connection.settings_dict.get("NAME")))
+    if key not in _active:
+        name = backend_name(connection)
+        if name == "fts5" and FTS_TABLE not in connection.introspection.table_names():
+            logger.warning("Search index %s belum ada; pencarian memakai icontains", FTS_TABLE)
+            name = "none"
+        _active[key] = name
+    return BACKENDS[_active[key]]()
+
+
+def search_submissions(queryset, term):
+    """Filter queryset ScreeningSubmission dengan kata kunci pencarian."""
+    term = (term or "").strip()
+    if not term:
+        return queryset
+    return _active_backend(connections[queryset.db]).filter(queryset, term)
+
+
+def install(schema_editor, submission_model, user_model):
+    backend = backend_for(schema_editor.connection)
+    backend.install(schema_editor, submission_model, user_model)
+    _active.clear()
+    return backend.name
+
+
+def uninstall(schema_editor, submission_model, user_model):
+    backend_for(schema_editor.connection).uninstall(schema_editor, submission_model, user_model)
+    _active.clear()
+
+
+def rebuild(using="default"):
+    """Buat (jika belum ada) dan isi ulang index; return (nama backend, jumlah baris index)."""
+    from django.contrib.auth import get_user_model
+
+    from .models import ScreeningSubmission
+
+    connection = connections[using]
+    backend = backend_for(connection)
+    with connection.schema_editor() as schema_editor:
+        backend.install(schema_editor, ScreeningSubmission, get_user_model())
+    _active.clear()
+    return backend.name, backend.size(connection)
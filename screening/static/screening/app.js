@@ -217,12 +217,168 @@
 })();
 
 // =======================================
-//   DASHBOARD FILTER DI dashboard.html
+//   RIWAYAT SUBMISSION (LAZY LOAD)
 // =======================================
+// Baris diambil per halaman dari /api/v1/submissions (keyset pagination,
+// `next_cursor`) saat sentinel di bawah tabel terlihat. Filter dikirim ke
+// server, jadi berlaku untuk seluruh data, bukan hanya baris yang sudah dimuat.
+function createSubmissionLoader(options) {
+  const tbody = options.tbody;
+  const sentinel = options.sentinel;
+  let cursor = null;
+  let params = {};
+  let done = false;
+  let loading = false;
+  let generation = 0;
+  let rowCount = 0;
+
+  function messageRow(text) {
+    const tr = document.createElement("tr");
+    const td = document.createElement("td");
+    td.colSpan = options.colspan;
+    td.style.textAlign = "center";
+    td.style.color = "#999";
+    td.textContent = text;
+    tr.appendChild(td);
+    return tr;
+  }
+
+  function loadMore() {
+    if (done || loading) return;
+    loading = true;
+    const current = generation;
+    const query = new URLSearchParams(
+      Object.assign({ scope: tbody.dataset.scope }, params)
+    );
+    if (cursor) query.set("cursor", cursor);
+
+    fetch(tbody.dataset.url + "?" + query.toString(), {
+      credentials: "same-origin",
+      headers: { Accept: "application/json" },
+    })
+      .then((response) =>
+        response.json().then((data) => {
+          if (!response.ok) throw new Error(data.error || response.statusText);
+          return data;
+        })
+      )
+      .then((data) => {
+        if (current !== generation) return;
+        if (rowCount === 0) tbody.innerHTML = "";
+        data.results.forEach((row) => {
+          rowCount += 1;
+          tbody.appendChild(options.renderRow(row, rowCount));
+        });
+        cursor = data.next_cursor;
+        done = !cursor;
+        if (rowCount === 0) tbody.appendChild(messageRow(options.emptyText));
+      })
+      .catch((err) => {
+        if (current !== generation) return;
+        console.error("Gagal memuat riwayat submission", err);
+        done = true;
+        if (rowCount === 0) tbody.innerHTML = "";
+        tbody.appendChild(messageRow("Gagal memuat data: " + err.message));
+      })
+      .finally(() => {
+        if (current !== generation) return;
+        loading = false;
+        // Layar belum penuh: sentinel masih terlihat, ambil halaman berikutnya
+        if (!done && sentinel && isVisible(sentinel)) loadMore();
+      });
+  }
+
+  function isVisible(el) {
+    const rect = el.getBoundingClientRect();
+    return rect.top < window.innerHeight && rect.bottom >= 0;
+  }
+
+  function reset(newParams) {
+    generation += 1;
+    params = newParams || {};
+    cursor = null;
+    done = false;
+    loading = false;
+    rowCount = 0;
+    tbody.innerHTML = "";
+    tbody.appendChild(messageRow("Memuat data..."));
+    loadMore();
+  }
+
+  if (sentinel && "IntersectionObserver" in window) {
+    new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) loadMore();
+    }, { rootMargin: "400px" }).observe(sentinel);
+  } else {
+    window.addEventListener("scroll", () => {
+      if (sentinel && isVisible(sentinel)) loadMore();
+    });
+  }
+
+  return { reset: reset, loadMore: loadMore };
+}
+
+function submissionCell(value, className) {
+  const td = document.createElement("td");
+  if (className) td.className = className;
+  td.textContent = value === null || value === undefined || value === "" ? "-" : String(value);
+  return td;
+}
+
+function yesNo(value) {
+  return value ? "Ya" : "Tidak";
+}
+
+// =======================================
+//   DASHBOARD DI dashboard.html
+// =======================================
+// Urutan kolom sama dengan header tabel dashboard.html
+const DASHBOARD_COLUMNS = [
+  ["patient_name"], ["district_city"], ["patient_age"], ["education_level"],
+  ["current_occupation"], ["marital_status"], ["marriage_order"], ["parity"],
+  ["new_partner_pregnancy", yesNo], ["child_spacing_over_10_years", yesNo],
+  ["ivf_pregnancy", yesNo], ["multiple_pregnancy", yesNo], ["smoker", yesNo],
+  ["planned_pregnancy", yesNo],
+  ["family_history_pe", yesNo], ["personal_history_pe", yesNo],
+  ["chronic_hypertension", yesNo], ["diabetes_mellitus", yesNo],
+  ["kidney_disease", yesNo], ["autoimmune_disease", yesNo], ["aps_history", yesNo],
+  ["pre_pregnancy_weight"], ["height_cm"], ["bmi"], ["lila_cm"],
+  ["systolic_bp"], ["diastolic_bp"], ["map_mmhg"], ["hemoglobin"],
+  ["family_history_hypertension", yesNo], ["family_history_kidney", yesNo],
+  ["family_history_heart", yesNo],
+];
+
+function renderDashboardRow(row, number) {
+  const tr = document.createElement("tr");
+  tr.appendChild(submissionCell(number, "sticky-col sticky-col-1"));
+  tr.appendChild(submissionCell(row.email));
+  tr.appendChild(submissionCell(row.created_at));
+  DASHBOARD_COLUMNS.forEach(([field, format]) => {
+    tr.appendChild(submissionCell(format ? format(row[field]) : row[field]));
+  });
+  tr.appendChild(submissionCell(row.result, "result-cell"));
+  tr.appendChild(submissionCell(row.confidence, "confidence-cell"));
+  return tr;
+}
+
 window.loadDashboardData = function () {
+  const tbody = document.getElementById("admin-table-body");
+  if (!tbody || !tbody.dataset.url || tbody.dataset.loaderReady) return;
+  tbody.dataset.loaderReady = "1";
+
+  const loader = createSubmissionLoader({
+    tbody: tbody,
+    sentinel: document.getElementById("admin-table-sentinel"),
+    colspan: 3 + DASHBOARD_COLUMNS.length + 2,
+    emptyText: "Belum ada data prediksi",
+    renderRow: renderDashboardRow,
+  });
+  window.dashboardLoader = loader;
+
   const search = document.getElementById("search-patient");
   const filterBtn = document.querySelector(".btn-filter");
   const clearBtn = document.querySelector(".btn-clear");
+  const exportBtn = document.querySelector(".btn-export");
 
   if (search) {
     search.addEventListener("keyup", (e) => {
@@ -231,94 +387,88 @@ window.loadDashboardData = function () {
   }
   if (filterBtn) filterBtn.addEventListener("click", filterData);
   if (clearBtn) clearBtn.addEventListener("click", clearFilters);
-};
-
-// FILTER UTAMA
-window.filterData = function () {
-  console.debug("filterData called");
-
-  const searchTerm = (document.getElementById("search-patient")?.value || "")
-    .trim()
-    .toLowerCase();
+  if (exportBtn) exportBtn.addEventListener("click", exportData);
 
-  const resultFilter = (document.getElementById("filter-result")?.value || "")
-    .trim()
-    .toLowerCase(); // "" / "preeklampsia" / "non-preeklampsia"
-
-  const tbody = document.getElementById("admin-table-body");
-  if (!tbody) return;
-
-  const rows = Array.from(tbody.querySelectorAll("tr"));
-
-  rows.forEach((row) => {
-    const cells = row.children;
-    if (!cells.length) return;
-
-    // Baris placeholder "Belum ada data prediksi"
-    if (cells[0].hasAttribute("colspan")) {
-      row.style.display = "";
-      return;
-    }
-
-    // Struktur tabel:
-    // 0: No
-    // 1: Email
-    // 2: Tanggal
-    // 3: Nama Pasien
-    // ...
-    // n-2: Hasil
-    // n-1: Confidence
-    const nameCell = cells[3];
-    // Gunakan class untuk hasil jika ada; fallback ke kolom sebelum terakhir
-    const resultCell =
-      row.querySelector(".result-cell") || cells[cells.length - 2];
-
-    const nameText = (nameCell?.textContent || "").toLowerCase();
-    const hasilTextRaw = (resultCell?.textContent || "").toLowerCase().trim();
-
-    // Normalisasi hasil: hilangkan spasi dan tanda minus
-    const hasilNorm = hasilTextRaw.replace(/[\s-]+/g, "");
-
-    let show = true;
-
-    // === Filter berdasarkan nama pasien ===
-    if (searchTerm && !nameText.includes(searchTerm)) {
-      show = false;
-    }
-
-    // === Filter berdasarkan hasil ===
-    if (show && resultFilter) {
-      const filterNorm = resultFilter.replace(/[\s-]+/g, ""); // "preeklampsia" atau "nonpreeklampsia"
-
-      // Normalisasi hasil: hapus spasi/dash lalu cek apakah mengandung kata kunci
-      const hasPree = hasilNorm.includes("preeklampsia") || hasilNorm.includes("preeclampsia");
-      const hasNon = hasilNorm.includes("nonpreeklampsia") || hasilNorm.includes("nonpreeclampsia");
+  loader.reset(dashboardFilters());
+};
 
-      if (filterNorm.startsWith("non")) {
-        // minta Non-Preeklampsia -> harus ada 'non' di hasil
-        if (!hasNon) show = false;
-      } else if (filterNorm.includes("preeclampsia") || filterNorm.includes("preeklampsia")) {
-        // minta Preeklampsia -> harus pree dan bukan non
-        if (!hasPree || hasNon) show = false;
-      }
-    }
+const DASHBOARD_FILTER_INPUTS = {
+  q: "search-patient",
+  result: "filter-result",
+  district: "filter-district",
+  date_from: "filter-date-from",
+  date_to: "filter-date-to",
+};
 
-    row.style.display = show ? "" : "none";
+function dashboardFilters() {
+  const params = {};
+  Object.entries(DASHBOARD_FILTER_INPUTS).forEach(([param, id]) => {
+    const value = (document.getElementById(id)?.value || "").trim();
+    if (value) params[param] = value;
   });
+  return params;
+}
+
+// FILTER UTAMA (server-side)
+window.filterData = function () {
+  if (window.dashboardLoader) window.dashboardLoader.reset(dashboardFilters());
 };
 
 // CLEAR FILTER
 window.clearFilters = function () {
-  const s = document.getElementById("search-patient");
-  const rf = document.getElementById("filter-result");
+  Object.values(DASHBOARD_FILTER_INPUTS).forEach((id) => {
+    const el = document.getElementById(id);
+    if (el) el.value = "";
+  });
+  filterData();
+};
 
-  if (s) s.value = "";
-  if (rf) rf.value = "";
+// EXPORT CSV (streaming dari server, filter tanggal/kabupaten/hasil)
+window.exportData = function () {
+  const button = document.querySelector(".btn-export");
+  if (!button || !button.dataset.url) return;
+  const params = dashboardFilters();
+  delete params.q;
+  window.location.href =
+    button.dataset.url + "?" + new URLSearchParams(Object.assign({ format: "csv" }, params)).toString();
+};
 
-  const tbody = document.getElementById("admin-table-body");
-  if (tbody) {
-    Array.from(tbody.querySelectorAll("tr")).forEach((row) => {
-      row.style.display = "";
-    });
+// =======================================
+//   RIWAYAT SAYA DI my_submissions.html
+// =======================================
+window.loadMySubmissions = function () {
+  const tbody = document.getElementById("my-submissions-body");
+  if (!tbody || !tbody.dataset.url) return;
+  const downloadUrl = tbody.dataset.downloadUrl;
+
+  function link(href, text, className, newTab) {
+    const a = document.createElement("a");
+    a.href = href;
+    a.textContent = text;
+    a.className = className;
+    if (newTab) {
+      a.target = "_blank";
+      a.style.marginRight = "6px";
+    }
+    return a;
   }
+
+  createSubmissionLoader({
+    tbody: tbody,
+    sentinel: document.getElementById("my-submissions-sentinel"),
+    colspan: 7,
+    emptyText: "Belum ada prediksi.",
+    renderRow: (row) => {
+      const tr = document.createElement("tr");
+      ["id", "patient_name", "patient_age", "result", "confidence", "created_at"].forEach((field) => {
+        tr.appendChild(submissionCell(row[field]));
+      });
+      const actions = document.createElement("td");
+      const href = downloadUrl + "?submission_id=" + encodeURIComponent(row.id);
+      actions.appendChild(link(href + "&preview=1", "Preview PDF", "btn btn-secondary", true));
+      actions.appendChild(link(href, "Download PDF", "btn btn-primary", false));
+      tr.appendChild(actions);
+      return tr;
+    },
+  }).reset();
 };
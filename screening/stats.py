@@ -0,0 +1,261 @@
+"""
+Rollup statistik submission untuk dashboard admin.
+
+Tabel `SubmissionDailyStat` menyimpan jumlah submission per (hari,
+kabupaten/kota, prediksi) plus jumlah probabilitas Preeklampsia, sehingga
+total dan grafik deret waktu cukup membaca beberapa baris pre-agregasi.
+
+Rollup dijaga secara inkremental:
+
+- `Model.save()` / `delete()` ScreeningSubmission: signal pre_save /
+  post_save / post_delete memindahkan hitungan dari bucket lama ke bucket
+  baru (create, re-score, ubah kabupaten/kota, delete);
+- `bulk_create` tidak mengirim signal, jadi pemanggilnya (bulk.py, API)
+  memanggil `record_created(objs)` di transaksi yang sama.
+
+Setiap perubahan memakai UPDATE ... SET count = count + n di dalam
+transaksi, jadi aman dipanggil paralel dari beberapa worker. Jika rollup
+tidak sinkron (mis. data diubah lewat SQL mentah), `manage.py rebuild_stats`
+menghitung ulang semuanya dari tabel submission.
+"""
+import datetime
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+PREEKLAMPSIA = "Preeklampsia"
+NON_PREEKLAMPSIA = "NonPreeklampsia"
+# field ScreeningSubmission yang menentukan bucket
+BUCKET_FIELDS = ("created_at", "district_city", "is_preeclampsia", "preeclampsia_probability")
+
+
+def _models():
+    from .models import ScreeningSubmission, SubmissionDailyStat
+
+    return ScreeningSubmission, SubmissionDailyStat
+
+
+def prediction_key(is_preeclampsia):
+    if is_preeclampsia is None:
+        return ""
+    return PREEKLAMPSIA if is_preeclampsia else NON_PREEKLAMPSIA
+
+
+def _day(value):
+    if value is None:
+        value = timezone.now()
+    if isinstance(value, datetime.datetime):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    return value
+
+
+def _bucket(values):
+    """(bucket, probabilitas) dari dict field BUCKET_FIELDS."""
+    key = (_day(values["created_at"]), values["district_city"] or "", prediction_key(values["is_preeclampsia"]))
+    return key, values["preeclampsia_probability"]
+
+
+def _add(deltas, values, sign):
+    key, proba = _bucket(values)
+    delta = deltas[key]
+    delta[0] += sign
+    if proba is not None:
+        delta[1] += sign * proba
+        delta[2] += sign
+
+
+# ==============
+# UPDATE INKREMENTAL
+# ==============
+
+def apply_deltas(deltas):
+    """deltas: {(day, district_city, prediction): [count, probability_sum, probability_count]}."""
+    _, SubmissionDailyStat = _models()
+    with transaction.atomic():
+        for (day, district, prediction), (count, proba_sum, proba_count) in sorted(deltas.items()):
+            if not (count or proba_sum or proba_count):
+                continue
+            bucket = SubmissionDailyStat.objects.filter(day=day, district_city=district, prediction=prediction)
+            changes = dict(
+                count=F("count") + count,
+                probability_sum=F("probability_sum") + proba_sum,
+                probability_count=F("probability_count") + proba_count,
+            )
+            if bucket.update(**changes):
+                continue
+            try:
+                with transaction.atomic():
+                    SubmissionDailyStat.objects.create(
+                        day=day,
+                        district_city=district,
+                        prediction=prediction,
+                        count=count,
+                        probability_sum=proba_sum,
+                        probability_count=proba_count,
+                    )
+            except IntegrityError:
+                # Worker lain membuat bucket yang sama lebih dulu
+                bucket.update(**changes)
+
+
+def record_created(objs):
+    """Tambahkan submission hasil bulk_create (yang tidak mengirim signal) ke rollup."""
+    deltas = defaultdict(lambda: [0, 0.0, 0])
+    for obj in objs:
+        _add(deltas, {f: getattr(obj, f) for f in BUCKET_FIELDS}, +1)
+    apply_deltas(deltas)
+
+
+def _pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._stats_old = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(BUCKET_FIELDS):
+        return
+    instance._stats_old = sender.objects.filter(pk=instance.pk).values(*BUCKET_FIELDS).first()
+
+
+def _post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = getattr(instance, "_stats_old", None)
+    if not created and old is None:
+        return
+    deltas = defaultdict(lambda: [0, 0.0, 0])
+    if old is not None:
+        _add(deltas, old, -1)
+    _add(deltas, {f: getattr(instance, f) for f in BUCKET_FIELDS}, +1)
+    apply_deltas(deltas)
+    instance._stats_old = None
+
+
+def _post_delete(sender, instance, **kwargs):
+    deltas = defaultdict(lambda: [0, 0.0, 0])
+    _add(deltas, {f: getattr(instance, f) for f in BUCKET_FIELDS}, -1)
+    apply_deltas(deltas)
+
+
+def connect():
+    """Dipanggil dari ScreeningConfig.ready()."""
+    ScreeningSubmission, _ = _models()
+    pre_save.connect(_pre_save, sender=ScreeningSubmission, dispatch_uid="screening_stats_pre_save")
+    post_save.connect(_post_save, sender=ScreeningSubmission, dispatch_uid="screening_stats_post_save")
+    post_delete.connect(_post_delete, sender=ScreeningSubmission, dispatch_uid="screening_stats_post_delete")
+
+
+# ==============
+# REBUILD
+# ==============
+
+def rebuild(submission_model=None, stat_model=None, batch_size=1000):
+    """
+    Hitung ulang seluruh rollup dari tabel submission (satu query GROUP BY)
+    dalam satu transaksi. Model bisa diganti model historis dari migrasi.
+    Return jumlah baris rollup.
+    """
+    from django.db.models.functions import TruncDate
+
+    if submission_model is None:
+        submission_model, stat_model = _models()
+    grouped = (
+        submission_model.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "district_city", "is_preeclampsia")
+        .annotate(
+            n=Count("id"),
+            proba_sum=Sum("preeclampsia_probability"),
+            proba_count=Count("preeclampsia_probability"),
+        )
+        .order_by()
+    )
+    merged = defaultdict(lambda: [0, 0.0, 0])
+    for row in grouped.iterator():
+        delta = merged[(row["day"], row["district_city"] or "", prediction_key(row["is_preeclampsia"]))]
+        delta[0] += row["n"]
+        delta[1] += row["proba_sum"] or 0.0
+        delta[2] += row["proba_count"]
+
+    with transaction.atomic():
+        stat_model.objects.all().delete()
+        stat_model.objects.bulk_create(
+            [
+                stat_model(
+                    day=day,
+                    district_city=district,
+                    prediction=prediction,
+                    count=count,
+                    probability_sum=proba_sum,
+                    probability_count=proba_count,
+                )
+                for (day, district, prediction), (count, proba_sum, proba_count) in merged.items()
+            ],
+            batch_size=batch_size,
+        )
+    return len(merged)
+
+
+# ==============
+# BACA (DASHBOARD)
+# ==============
+
+def totals():
+    """Total prediksi, Preeklampsia dan Non-Preeklampsia dari rollup (satu query)."""
+    _, SubmissionDailyStat = _models()
+    result = SubmissionDailyStat.objects.aggregate(
+        total_predictions=Sum("count"),
+        preeclampsia_count=Sum("count", filter=Q(prediction=PREEKLAMPSIA)),
+        non_preeclampsia_count=Sum("count", filter=Q(prediction=NON_PREEKLAMPSIA)),
+    )
+    return {key: value or 0 for key, value in result.items()}
+
+
+def daily_series(days=30, district=None, today=None):
+    """
+    Deret harian `days` hari terakhir (termasuk hari tanpa submission):
+    [{"day", "total", "preeclampsia", "non_preeclampsia", "mean_probability"}].
+    """
+    _, SubmissionDailyStat = _models()
+    today = today or timezone.localdate()
+    start = today - datetime.timedelta(days=days - 1)
+    qs = SubmissionDailyStat.objects.filter(day__gte=start, day__lte=today)
+    if district:
+        qs = qs.filter(district_city=district)
+    rows = qs.values("day", "prediction").annotate(
+        n=Sum("count"), proba_sum=Sum("probability_sum"), proba_count=Sum("probability_count")
+    )
+
+    series = {
+        start + datetime.timedelta(days=i): {
+            "total": 0, "preeclampsia": 0, "non_preeclampsia": 0, "proba_sum": 0.0, "proba_count": 0,
+        }
+        for i in range(days)
+    }
+    for row in rows:
+        point = series[row["day"]]
+        point["total"] += row["n"]
+        if row["prediction"] == PREEKLAMPSIA:
+            point["preeclampsia"] += row["n"]
+        elif row["prediction"] == NON_PREEKLAMPSIA:
+            point["non_preeclampsia"] += row["n"]
+        point["proba_sum"] += row["proba_sum"] or 0.0
+        point["proba_count"] += row["proba_count"] or 0
+
+    result = []
+    for day, point in sorted(series.items()):
+        proba_sum, proba_count = point.pop("proba_sum"), point.pop("proba_count")
+        point["mean_probability"] = proba_sum / proba_count if proba_count else None
+        result.append({"day": day.isoformat(), **point})
+    return result
+
+
+def districts():
+    """Daftar kabupaten/kota yang ada di rollup."""
+    _, SubmissionDailyStat = _models()
+    return list(
+        SubmissionDailyStat.objects.exclude(district_city="").filter(count__gt=0)
+        .order_by("district_city")
+        .values_list("district_city", flat=True)
+        .distinct()
+    )
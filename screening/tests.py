@@ -1,3 +1,961 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import bulk, dataset, predictor, search, stats, training, views
+from .models import ScreeningSubmission, SubmissionDailyStat
+
+
+def _patient(**overrides):
+    """Field ScreeningSubmission satu pasien valid (baris pertama ALL_FINAL.csv)."""
+    with open(predictor.WARMUP_CSV_PATH, newline="", encoding="utf-8") as fh:
+        chunk = next(dataset.iter_csv_chunks(fh, chunk_size=1))
+    data = dataset.submission_fields(chunk[0][1])
+    data["patient_name"] = "Pasien Uji"
+    data.update(overrides)
+    return data
+
+
+def _submission(user=None, **overrides):
+    data = _patient(**overrides)
+    data.setdefault("is_preeclampsia", False)
+    data.setdefault("preeclampsia_probability", 0.2)
+    return ScreeningSubmission.objects.create(user=user, **data)
+
+
+def _basic_auth(username, password):
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return {"HTTP_AUTHORIZATION": f"Basic {token}"}
+
+
+# ==============
+# INFERENSI
+# ==============
+
+class CompiledForestParityTests(TestCase):
+    """CompiledForest + FeatureEncoder harus identik dengan pipeline sklearn."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        import joblib
+
+        from .inference import CompiledForest, FeatureEncoder
+
+        cls.pipeline = joblib.load(predictor.MODEL_PATH)
+        cls.encoder = FeatureEncoder.from_estimator(cls.pipeline)
+        cls.engine = CompiledForest.from_estimator(cls.pipeline)
+        cls.X, _ = training.load_training_frame(training.DEFAULT_CSV)
+
+    def test_predict_proba_matches_sklearn_on_all_final(self):
+        expected = self.pipeline.predict_proba(self.X)
+        X = self.encoder.transform_rows(self.X.to_dict("records"))
+        np.testing.assert_array_equal(self.engine.predict_proba(X), expected)
+        labels, _ = self.engine.predict_with_proba(X)
+        np.testing.assert_array_equal(labels, self.pipeline.predict(self.X))
+
+    def test_single_row_matches_batch(self):
+        rows = self.X.head(20).to_dict("records")
+        batch = self.engine.predict_proba(self.encoder.transform_rows(rows))
+        for i, row in enumerate(rows):
+            single = self.engine.predict_proba(self.encoder.transform_row(row))
+            np.testing.assert_array_equal(single[0], batch[i])
+
+
+class FeatureEncoderTests(TestCase):
+    """FeatureEncoder harus identik dengan `preprocess.transform` sklearn."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        import joblib
+
+        from .inference import FeatureEncoder
+
+        cls.pipeline = joblib.load(predictor.MODEL_PATH)
+        cls.encoder = FeatureEncoder.from_estimator(cls.pipeline)
+        cls.X, _ = training.load_training_frame(training.DEFAULT_CSV)
+
+    def preprocess(self, X):
+        Xt = self.pipeline[:-1].transform(X)
+        return Xt.toarray() if hasattr(Xt, "toarray") else np.asarray(Xt)
+
+    def test_matches_preprocess_on_all_final(self):
+        np.testing.assert_array_equal(self.encoder.transform_rows(self.X.to_dict("records")), self.preprocess(self.X))
+
+    def test_missing_and_unknown_values(self):
+        import pandas as pd
+
+        row = self.X.iloc[0].to_dict()
+        # NaN numerik -> median, NaN kategori -> most_frequent, kategori baru -> semua 0
+        row.update({"Hb (gr/dl)": np.nan, "Pendidikan": np.nan, "Kabupaten/Kota": "Kota Lain"})
+        expected = self.preprocess(pd.DataFrame([row], columns=self.X.columns))[0]
+        np.testing.assert_array_equal(self.encoder.transform_row(row), expected)
+        row["Hb (gr/dl)"] = None
+        np.testing.assert_array_equal(self.encoder.transform_row(row), expected)
+
+    def test_missing_column_raises(self):
+        row = self.X.iloc[0].to_dict()
+        del row["Hb (gr/dl)"]
+        with self.assertRaises(ValueError):
+            self.encoder.transform_row(row)
+
+
+class MicroBatcherTests(TestCase):
+    def predict_fn(self, X):
+        self.batches.append(len(X))
+        return X[:, 0] > 0, np.column_stack([X[:, 0], -X[:, 0]])
+
+    def setUp(self):
+        from .batching import MicroBatcher
+
+        self.batches = []
+        self.batcher = MicroBatcher(self.predict_fn, window_ms=50, max_batch_size=4)
+        self.addCleanup(self.batcher.close)
+
+    def test_concurrent_requests_share_batches(self):
+        futures = [self.batcher.submit([float(i), 0.0]) for i in range(10)]
+        results = [f.result(timeout=5) for f in futures]
+        for i, (label, proba) in enumerate(results):
+            self.assertEqual(label, i > 0)
+            np.testing.assert_array_equal(proba, [i, -i])
+        self.assertEqual(sum(self.batches), 10)
+        self.assertLessEqual(max(self.batches), 4)
+        self.assertLess(len(self.batches), 10)
+        stats = self.batcher.stats()
+        self.assertEqual(stats["rows"], 10)
+        self.assertEqual(stats["batches"], len(self.batches))
+
+    def test_error_is_raised_for_every_request_in_batch(self):
+        def fail(X):
+            raise RuntimeError("model rusak")
+
+        self.batcher.predict_fn = fail
+        futures = [self.batcher.submit([1.0, 0.0]) for _ in range(3)]
+        for f in futures:
+            with self.assertRaises(RuntimeError):
+                f.result(timeout=5)
+        self.assertGreaterEqual(self.batcher.stats()["errors"], 1)
+
+    def test_closed_batcher_predicts_directly(self):
+        self.batcher.close()
+        label, proba = self.batcher.predict([2.0, 0.0], timeout=5)
+        self.assertTrue(label)
+        np.testing.assert_array_equal(proba, [2.0, -2.0])
+
+
+class PredictionCacheKeyTests(TestCase):
+    def test_key_changes_with_model_version_and_hash(self):
+        from .prediction_cache import PredictionCache
+
+        x = np.array([1.0, 0.0, np.nan, 3.5])
+        v1 = SimpleNamespace(version="v1", sha256="a" * 64)
+        self.assertEqual(PredictionCache.key_for(v1, x), PredictionCache.key_for(v1, x.copy()))
+        self.assertNotEqual(
+            PredictionCache.key_for(v1, x), PredictionCache.key_for(SimpleNamespace(version="v2", sha256="a" * 64), x)
+        )
+        self.assertNotEqual(
+            PredictionCache.key_for(v1, x), PredictionCache.key_for(SimpleNamespace(version="v1", sha256="b" * 64), x)
+        )
+
+    def test_key_is_canonical(self):
+        from .prediction_cache import PredictionCache
+
+        model = SimpleNamespace(version="v1", sha256="a" * 64)
+        self.assertEqual(
+            PredictionCache.key_for(model, np.array([-0.0, float("nan")])),
+            PredictionCache.key_for(model, np.array([0.0, -float("nan")])),
+        )
+
+
+# ==============
+# LOAD MODEL / REGISTRY
+# ==============
+
+class ModelBundleTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def test_bundle_permissions(self):
+        from .model_bundle import build_bundle
+
+        out = os.path.join(self.tmp, "m.bundle")
+        build_bundle(predictor.MODEL_PATH, out)
+        self.assertEqual(stat.S_IMODE(os.stat(out).st_mode), 0o755)
+        for name in os.listdir(out):
+            self.assertEqual(stat.S_IMODE(os.stat(os.path.join(out, name)).st_mode), 0o644)
+
+
+class ModelLoadTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.manifest = os.path.join(self.tmp, "registry.json")
+        self._old_state = predictor._state
+        predictor._state = predictor._State()
+        self.addCleanup(setattr, predictor, "_state", self._old_state)
+
+    def _write_manifest(self, sha256):
+        with open(self.manifest, "w", encoding="utf-8") as fh:
+            json.dump({
+                "active": "v1",
+                "versions": [{"version": "v1", "path": "m.joblib", "sha256": sha256, "created_at": "", "metadata": {}}],
+            }, fh)
+
+    def test_failed_load_is_retried_after_backoff(self):
+        from .model_bundle import file_sha256
+
+        self._write_manifest("0" * 64)
+        conf = {"MANIFEST": self.manifest, "POLL_SECONDS": None}
+        with override_settings(SCREENING_MODEL_REGISTRY=conf, SCREENING_WARMUP={"RETRY_SECONDS": 0.2}):
+            self.assertIsNone(predictor.get_model())
+            self.assertEqual(predictor.readiness()["status"], "failed")
+            shutil.copy(predictor.MODEL_PATH, os.path.join(self.tmp, "m.joblib"))
+            self._write_manifest(file_sha256(os.path.join(self.tmp, "m.joblib")))
+            # Masih dalam backoff: belum dicoba lagi
+            self.assertIsNone(predictor.get_model())
+            time.sleep(0.25)
+            model = predictor.get_model()
+        self.assertIsNotNone(model)
+        self.assertEqual(model.version, "v1")
+        self.assertEqual(predictor.readiness()["load_failures"], 0)
+
+    def test_get_model_timeout_while_another_thread_loads(self):
+        started = threading.Event()
+        original = predictor.load_model
+
+        def slow_load(*args, **kwargs):
+            started.set()
+            time.sleep(1.0)
+            return original(*args, **kwargs)
+
+        with mock.patch.object(predictor, "load_model", slow_load):
+            loader = threading.Thread(target=predictor.get_model)
+            loader.start()
+            started.wait(5)
+            t0 = time.monotonic()
+            self.assertIsNone(predictor.get_model(timeout=0.1))
+            self.assertLess(time.monotonic() - t0, 0.5)
+            loader.join()
+        self.assertIsNotNone(predictor.get_model(timeout=0))
+
+    def test_backoff_grows_and_is_capped(self):
+        with override_settings(SCREENING_WARMUP={"RETRY_SECONDS": 1, "RETRY_MAX_SECONDS": 3}):
+            delays = []
+            for _ in range(4):
+                predictor._load_failed("rusak")
+                delays.append(round(predictor._state.retry_at - time.monotonic()))
+        self.assertEqual(delays, [1, 2, 3, 3])
+        self.assertEqual(predictor.readiness()["load_failures"], 4)
+        self.assertFalse(predictor.readiness()["ready"])
+
+    def test_healthz_ready_follows_warmup(self):
+        url = reverse("healthz_ready")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "idle")
+
+        with override_settings(SCREENING_WARMUP={"ENABLED": True, "ROWS": 2}):
+            thread = predictor.start_background_warmup()
+        thread.join(30)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body["ready"])
+        self.assertEqual(body["warmup_rows"], 2)
+        self.assertIsNotNone(body["model_version"])
+
+    def test_views_do_not_import_ml_stack(self):
+        import subprocess
+        import sys
+
+        code = (
+            "import django, sys; django.setup(); import screening.views, screening.urls; "
+            "print(sorted(m for m in ('numpy', 'pandas', 'sklearn', 'joblib') if m in sys.modules))"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="website.settings")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+class ModelRegistryTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.manifest = os.path.join(self.tmp, "registry.json")
+
+    def test_registry_manifest_is_world_readable(self):
+        from .registry import ModelRegistry
+
+        shutil.copy(predictor.MODEL_PATH, os.path.join(self.tmp, "m.joblib"))
+        reg = ModelRegistry(self.manifest)
+        reg.register(os.path.join(self.tmp, "m.joblib"), "v1")
+        self.assertEqual(stat.S_IMODE(os.stat(self.manifest).st_mode), 0o644)
+
+
+# ==============
+# METRIK
+# ==============
+
+class MetricsEndpointTests(TestCase):
+    def test_access(self):
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url, REMOTE_ADDR="10.0.0.5").status_code, 403)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.force_login(User.objects.create_user("admin", is_staff=True))
+        self.assertEqual(self.client.get(url, REMOTE_ADDR="10.0.0.5").status_code, 200)
+
+    def test_stage_histograms_are_exported(self):
+        from . import metrics
+
+        submission = _submission()
+        self.client.get(reverse("download_result"), {"submission_id": submission.id})
+        response = self.client.get(reverse("metrics"))
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        lines = response.content.decode().splitlines()
+        self.assertIn("# TYPE screening_stage_seconds histogram", lines)
+        self.assertTrue(any(line.startswith("screening_model_ready ") for line in lines))
+
+        prefix = 'screening_stage_seconds_bucket{view="download",stage="fetch",le='
+        buckets = [int(line.rsplit(" ", 1)[1]) for line in lines if line.startswith(prefix)]
+        self.assertEqual(len(buckets), len(metrics.LATENCY_BUCKETS) + 1)
+        self.assertEqual(buckets, sorted(buckets))
+        count = next(
+            line for line in lines if line.startswith('screening_stage_seconds_count{view="download",stage="fetch"}')
+        )
+        self.assertEqual(int(count.rsplit(" ", 1)[1]), buckets[-1])
+        self.assertGreaterEqual(buckets[-1], 1)
+
+
+# ==============
+# TUNING MODEL
+# ==============
+
+class SuccessiveHalvingTests(TestCase):
+    def test_rungs_shrink_candidates_and_grow_budget(self):
+        X, y = training.load_training_frame(training.DEFAULT_CSV)
+        candidates = [
+            {"n_estimators": n, "max_depth": depth, "min_samples_leaf": 1, "max_features": "sqrt"}
+            for n in (4, 8) for depth in (2, None)
+        ]
+        rungs, results = training.successive_halving(
+            X, y, candidates, factor=2, cv=2, n_jobs=1, min_samples=100, min_trees=2, log=lambda msg: None
+        )
+        self.assertEqual([r["candidates"] for r in rungs], [4, 2, 1])
+        self.assertEqual([r["fits"] for r in rungs], [8, 4, 2])
+        self.assertEqual(rungs[-1]["n_samples"], len(y))
+        self.assertLess(rungs[0]["n_samples"], rungs[-1]["n_samples"])
+        winner = next(r for r in results if r["rung"] == 2)
+        self.assertEqual(winner["n_estimators_fit"], winner["params"]["n_estimators"])
+        self.assertEqual(sorted(r["rung"] for r in results), [0, 0, 1, 2])
+
+    def test_sampled_grid_keeps_baseline(self):
+        grid = training.candidate_grid(n_candidates=5, seed=3)
+        self.assertEqual(len(grid), 5)
+        self.assertIn(training.BASELINE_PARAMS, grid)
+
+
+class ParetoSelectionTests(TestCase):
+    points = [
+        {"name": "a", "recall_pree": 0.95, "single_p99_ms": 0.50, "engine_bytes": 900},
+        {"name": "b", "recall_pree": 0.94, "single_p99_ms": 0.20, "engine_bytes": 300},
+        {"name": "c", "recall_pree": 0.90, "single_p99_ms": 0.10, "engine_bytes": 200},
+        {"name": "d", "recall_pree": 0.93, "single_p99_ms": 0.30, "engine_bytes": 400},
+        {"name": "e", "recall_pree": 0.94, "single_p99_ms": 0.20, "engine_bytes": 250},
+    ]
+
+    def test_pareto_front(self):
+        front = training.pareto_front(self.points)
+        self.assertEqual([p["name"] for p in front], ["c", "e", "a"])
+
+    def test_select_fastest_within_recall_tolerance(self):
+        self.assertEqual(training.select_fastest(self.points, recall_tolerance=0.01)["name"], "e")
+        self.assertEqual(training.select_fastest(self.points, recall_tolerance=0.0)["name"], "a")
+        self.assertEqual(training.select_fastest(self.points, recall_tolerance=0.05)["name"], "c")
+
+
+# ==============
+# ROLLUP STATISTIK
+# ==============
+
+class StatsRollupTests(TestCase):
+    def snapshot(self):
+        return {
+            (row.day, row.district_city, row.prediction): (row.count, round(row.probability_sum, 9), row.probability_count)
+            for row in SubmissionDailyStat.objects.filter(count__gt=0)
+        }
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot()
+        stats.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_create_rescore_delete_match_rebuild(self):
+        a = _submission(district_city="Gresik", is_preeclampsia=True, preeclampsia_probability=0.9)
+        b = _submission(district_city="Gresik", is_preeclampsia=False, preeclampsia_probability=0.1)
+        _submission(district_city="Lamongan", is_preeclampsia=None, preeclampsia_probability=None)
+        objs = ScreeningSubmission.objects.bulk_create(
+            [ScreeningSubmission(**_patient(is_preeclampsia=True, preeclampsia_probability=0.7)) for _ in range(3)]
+        )
+        stats.record_created(objs)
+        self.assertMatchesRebuild()
+
+        # Re-score: pindah bucket prediksi dan probabilitas
+        b.is_preeclampsia = True
+        b.preeclampsia_probability = 0.8
+        b.save()
+        a.district_city = "Surabaya"
+        a.save(update_fields=["district_city"])
+        self.assertMatchesRebuild()
+
+        b.delete()
+        self.assertMatchesRebuild()
+        self.assertEqual(stats.totals()["total_predictions"], ScreeningSubmission.objects.count())
+
+
+class DashboardAccessTests(TestCase):
+    def test_stats_require_staff(self):
+        url = reverse("dashboard_stats")
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(User.objects.create_user("bidan"))
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(User.objects.create_user("admin", is_staff=True))
+        response = self.client.get(url, {"days": 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["series"]), 7)
+
+
+# ==============
+# RIWAYAT (KEYSET)
+# ==============
+
+class SubmissionHistoryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("bidan", password="rahasia123")
+        self.client.force_login(self.user)
+        subs = [_submission(user=self.user, patient_name=f"Pasien {i}") for i in range(23)]
+        # Beberapa submission dengan created_at yang sama: urutan ditentukan id
+        same = timezone.now() - timezone.timedelta(days=1)
+        ScreeningSubmission.objects.filter(pk__in=[s.pk for s in subs[5:12]]).update(created_at=same)
+        self.expected = list(
+            ScreeningSubmission.objects.order_by("-created_at", "-id").values_list("patient_name", flat=True)
+        )
+
+    def test_cursor_pages_have_no_gaps_or_duplicates(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 4}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(reverse("submissions_page"), params)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen += [row["patient_name"] for row in body["results"]]
+            pages += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(pages, 6)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("submissions_page"), {"cursor": "bukan-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+
+# ==============
+# PENCARIAN
+# ==============
+
+class SearchTests(TestCase):
+    def setUp(self):
+        search._active.clear()
+        self.user = User.objects.create_user("bidan_gresik", email="bidan@puskesmas.test")
+
+    def names(self, term):
+        return set(search.search_submissions(ScreeningSubmission.objects.all(), term).values_list("patient_name", flat=True))
+
+    def test_index_follows_insert_update_delete(self):
+        sub = _submission(user=self.user, patient_name="Siti Aminah", district_city="Gresik")
+        _submission(patient_name="Dewi Lestari", district_city="Lamongan")
+        self.assertEqual(self.names("aminah"), {"Siti Aminah"})
+        self.assertEqual(self.names("lamongan"), {"Dewi Lestari"})
+        self.assertEqual(self.names("siti gresik"), {"Siti Aminah"})
+
+        sub.patient_name = "Siti Rahayu"
+        sub.save()
+        self.assertEqual(self.names("aminah"), set())
+        self.assertEqual(self.names("rahayu"), {"Siti Rahayu"})
+
+        ScreeningSubmission.objects.filter(pk=sub.pk).update(district_city="Surabaya")
+        self.assertEqual(self.names("surabaya"), {"Siti Rahayu"})
+
+        sub.delete()
+        self.assertEqual(self.names("rahayu"), set())
+
+    def test_index_follows_username_change(self):
+        _submission(user=self.user, patient_name="Siti Aminah")
+        self.assertEqual(self.names("bidan_gresik"), {"Siti Aminah"})
+        self.user.username = "bidan_tuban"
+        self.user.save()
+        self.assertEqual(self.names("bidan_gresik"), set())
+        self.assertEqual(self.names("tuban"), {"Siti Aminah"})
+        self.assertEqual(self.names("puskesmas"), {"Siti Aminah"})
+
+    def test_short_terms_fall_back_to_icontains(self):
+        _submission(patient_name="Ani")
+        self.assertEqual(self.names("an"), {"Ani"})
+
+
+# ==============
+# UPLOAD MASSAL DAN API
+# ==============
+
+class BulkImportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.model = predictor.get_model(timeout=60)
+        with open(predictor.WARMUP_CSV_PATH, encoding="utf-8") as fh:
+            lines = fh.read().splitlines()
+        cls.header, cls.rows = lines[0], lines[1:4]
+
+    def csv(self, rows):
+        return io.StringIO("\n".join([self.header + ';"Nama Pasien"'] + rows))
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        negative_age = self.rows[0].split(";")
+        negative_age[1] = "-3"
+        missing_age = self.rows[1].split(";")
+        missing_age[1] = ""
+        report = bulk.import_csv(
+            self.csv([
+                self.rows[2] + ';"Valid"',
+                ";".join(negative_age) + ';"Umur negatif"',
+                ";".join(missing_age) + ';"Tanpa umur"',
+                self.rows[2] + ';"' + "x" * 300 + '"',
+            ]),
+            self.model,
+            chunk_size=2,
+        )
+        self.assertEqual((report.rows, report.created, report.failed), (4, 1, 3))
+        self.assertEqual([line for line, _ in report.errors], [3, 4, 5])
+        self.assertIn("Umur (Tahun)", report.errors[0][1])
+        self.assertIn("Nama Pasien", report.errors[2][1])
+        self.assertEqual(list(ScreeningSubmission.objects.values_list("patient_name", flat=True)), ["Valid"])
+        self.assertEqual(stats.totals()["total_predictions"], 1)
+
+    def test_bulk_upload_view_reports_errors(self):
+        user = User.objects.create_user("bidan", password="rahasia123")
+        self.client.force_login(user)
+        upload = io.BytesIO("\n".join([self.header, self.rows[0], "Gresik;-1"]).encode())
+        upload.name = "screening.csv"
+        response = self.client.post(reverse("bulk_upload"), {"csv_file": upload})
+        self.assertEqual(response.status_code, 200)
+        report = response.context["report"]
+        self.assertEqual((report["created"], report["failed"]), (1, 1))
+        self.assertEqual(report["errors"][0]["line"], 3)
+
+
+class ApiPredictTests(TestCase):
+    def setUp(self):
+        views._api_basic_auth_cache = None
+        self.user = User.objects.create_user("simrs", password="rahasia123")
+        self.auth = _basic_auth("simrs", "rahasia123")
+
+    def post(self, payload, **extra):
+        return self.client.post(
+            reverse("api_predict"), json.dumps(payload), content_type="application/json", **{**self.auth, **extra}
+        )
+
+    def patient(self, **overrides):
+        return {field: value for field, value in _patient(**overrides).items() if value is not None}
+
+    def test_invalid_patients_are_reported_and_not_persisted(self):
+        response = self.post({
+            "persist": True,
+            "patients": [
+                self.patient(),
+                self.patient(patient_age=-3),
+                self.patient(patient_name="x" * 300),
+                self.patient(district_city=["Gresik"], smoker={"ya": 1}),
+                self.patient(systolic_bp="tinggi"),
+                self.patient(patient_age=None),
+            ],
+        })
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([r["index"] for r in body["results"]], [0])
+        errors = {e["index"]: e["error"] for e in body["errors"]}
+        self.assertEqual(sorted(errors), [1, 2, 3, 4, 5])
+        self.assertIn("patient_age", errors[1])
+        self.assertIn("patient_name", errors[2])
+        self.assertIn("district_city", errors[3])
+        self.assertIn("smoker", errors[3])
+        self.assertIn("systolic_bp", errors[4])
+        self.assertEqual(ScreeningSubmission.objects.count(), 1)
+
+    def test_all_invalid_returns_400(self):
+        response = self.post([self.patient(patient_age=-3)])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ScreeningSubmission.objects.count(), 0)
+
+    def test_authentication_errors(self):
+        self.assertEqual(self.post(self.patient(), HTTP_AUTHORIZATION="").status_code, 401)
+        self.assertEqual(self.post(self.patient(), **_basic_auth("simrs", "salah")).status_code, 401)
+        self.assertEqual(self.post(self.patient(), HTTP_AUTHORIZATION="Basic ???").status_code, 401)
+        self.assertEqual(self.client.get(reverse("api_predict"), **self.auth).status_code, 405)
+
+    def test_changed_password_is_refused_despite_cache(self):
+        self.assertEqual(self.post(self.patient()).status_code, 200)
+        self.user.set_password("baru-456789")
+        self.user.save()
+        self.assertEqual(self.post(self.patient()).status_code, 401)
+
+    @override_settings(SCREENING_API={"MAX_BATCH_SIZE": 1000, "BASIC_AUTH_CACHE_SIZE": 2})
+    def test_credential_cache_is_bounded(self):
+        for i in range(4):
+            User.objects.create_user(f"klien{i}", password="rahasia123")
+            self.assertEqual(self.post(self.patient(), **_basic_auth(f"klien{i}", "rahasia123")).status_code, 200)
+        self.assertEqual(views._basic_auth_cache().size(), 2)
+
+
+# ==============
+# EKSPOR
+# ==============
+
+class ExportTests(TestCase):
+    def test_csv_header_matches_all_final(self):
+        from . import export
+
+        with open(predictor.WARMUP_CSV_PATH, encoding="utf-8") as fh:
+            original = fh.readline().rstrip("\n").split(";")
+        _submission()
+        content = "".join(export.iter_csv(export.export_queryset()))
+        header = content.lstrip("﻿").splitlines()[0].split(";")
+        self.assertEqual(header[:len(original)], original)
+        chunk = next(dataset.iter_csv_chunks(io.StringIO(content.lstrip("﻿"))))
+        self.assertEqual(dataset.submission_fields(chunk[0][1])["current_occupation"], _patient()["current_occupation"])
+
+
+# ==============
+# DATASET TRAINING
+# ==============
+
+class TrainingDataLoaderTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.csv = os.path.join(self.tmp, "ALL_FINAL.csv")
+        shutil.copyfile(predictor.WARMUP_CSV_PATH, self.csv)
+        self.cache_dir = os.path.join(self.tmp, "cache")
+
+    def load(self):
+        from . import training_data
+
+        return training_data.load_training_data(self.csv, cache_dir=self.cache_dir)
+
+    def test_second_load_uses_cache(self):
+        first = self.load()
+        second = self.load()
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.sha256, first.sha256)
+        np.testing.assert_array_equal(second.numeric, first.numeric)
+        np.testing.assert_array_equal(second.codes, first.codes)
+        np.testing.assert_array_equal(second.labels, first.labels)
+        self.assertTrue(second.frame().equals(first.frame()))
+
+    def test_changed_file_invalidates_cache(self):
+        first = self.load()
+        with open(self.csv, encoding="utf-8") as fh:
+            last = fh.read().splitlines()[-1]
+        with open(self.csv, "a", encoding="utf-8") as fh:
+            fh.write(last + "\n")
+        changed = self.load()
+        self.assertFalse(changed.from_cache)
+        self.assertNotEqual(changed.sha256, first.sha256)
+        self.assertEqual(len(changed), len(first) + 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_aliases_are_normalized_and_recorded(self):
+        data = self.load()
+        self.assertEqual(data.issues["renamed_columns"], {"Perkerjaan": "Pekerjaan"})
+        self.assertEqual(set(data.issues["normalized_categories"]["Pekerjaan"]), {"Swastas", "WiraSwasta"})
+        occupations = set(data.frame()["Pekerjaan"].dropna())
+        self.assertNotIn("Swastas", occupations)
+        self.assertNotIn("WiraSwasta", occupations)
+        self.assertNotIn("unknown_categories", data.issues)
+        self.assertEqual(dataset.feature_row({"current_occupation": " WiraSwasta "})["Pekerjaan"], "Wiraswasta")
+
+
+# ==============
+# KOMPRESI MODEL
+# ==============
+
+class CompressionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.X, cls.y = training.load_training_frame(cache=False)
+        cls.pipeline = training.build_pipeline(list(cls.X.columns), {"n_estimators": 30})
+        cls.pipeline.fit(cls.X, cls.y)
+
+    def test_exact_compression_matches_pruned_forest(self):
+        import copy
+
+        from .compression import attach_engine, compress
+        from .inference import CompiledForest
+
+        engine, info = compress(self.pipeline, self.X, self.y, min_trees=10, collapse="exact")
+        for name in ("feature", "children_left", "children_right", "roots"):
+            self.assertEqual(getattr(engine, name).dtype, np.intp)
+        self.assertEqual(engine.threshold.dtype, np.float32)
+        self.assertEqual(info["proba_delta_by_stage"]["collapse"], 0.0)
+
+        pruned = attach_engine(copy.deepcopy(self.pipeline), engine, info["trees"]["kept"])
+        self.assertEqual(len(pruned.steps[-1][1].estimators_), info["trees"]["after"])
+        Xt = training.transform_features(pruned, self.X)
+        reference = CompiledForest.from_estimator(pruned).predict_proba(Xt)
+        proba = engine.predict_proba(Xt)
+        np.testing.assert_array_equal(np.argmax(proba, axis=1), np.argmax(reference, axis=1))
+        self.assertLessEqual(float(np.max(np.abs(proba - reference))), 5e-4)
+
+    def test_collapse_vote_merges_uniform_subtree(self):
+        from .compression import collapse_tree
+
+        # root -> (leaf kelas 0, node 2 -> leaf 3 / leaf 4, keduanya vote kelas 0)
+        tree = {
+            "children_left": np.array([1, -1, 3, -1, -1]),
+            "children_right": np.array([2, -1, 4, -1, -1]),
+            "feature": np.array([0, -2, 1, -2, -2]),
+            "threshold": np.array([0.5, -2.0, 1.5, -2.0, -2.0]),
+            "missing_go_to_left": np.zeros(5, dtype=np.uint8),
+            "value": np.array([[0.8, 0.2], [1.0, 0.0], [0.7, 0.3], [0.9, 0.1], [0.6, 0.4]]),
+            "weight": np.array([10.0, 4.0, 6.0, 3.0, 3.0]),
+            "max_depth": 2,
+        }
+        voted = collapse_tree(tree, mode="vote")
+        self.assertEqual(len(voted["children_left"]), 1)
+        np.testing.assert_array_equal(voted["value"], [[0.8, 0.2]])
+        self.assertEqual(len(collapse_tree(tree, mode="exact")["children_left"]), 5)
+
+    def _run_command(self, tmp, *args):
+        import joblib
+        from django.core.management import call_command
+
+        from .registry import ModelRegistry
+
+        model = os.path.join(tmp, "source.joblib")
+        joblib.dump(self.pipeline, model)
+        manifest = os.path.join(tmp, "registry.json")
+        ModelRegistry(manifest).register(model, "v1")
+        latencies = iter([1.0, 2.0])
+
+        def slower_after(encoder, engine, rows, **kwargs):
+            value = next(latencies)
+            return {
+                "single_p50_ms": value, "single_p99_ms": value, "batch_per_row_us": value, "engine_bytes": engine.nbytes,
+            }
+
+        out = io.StringIO()
+        with override_settings(SCREENING_MODEL_REGISTRY={"MANIFEST": manifest, "POLL_SECONDS": None}), \
+                mock.patch.object(training, "engine_latency", slower_after):
+            call_command(
+                "compress_model", "--model", model, "--out", os.path.join(tmp, "small.joblib"),
+                "--min-trees", "10", "--model-version", "v1-small", *args, stdout=out,
+            )
+        return ModelRegistry(manifest), out.getvalue()
+
+    def test_slower_artifact_is_not_registered(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        reg, output = self._run_command(tmp)
+        self.assertIn("--allow-slower", output)
+        self.assertTrue(os.path.exists(os.path.join(tmp, "small.joblib")))
+        self.assertEqual([e["version"] for e in reg.versions()], ["v1"])
+
+    def test_allow_slower_registers_inactive_version(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        reg, _ = self._run_command(tmp, "--allow-slower")
+        self.assertEqual([e["version"] for e in reg.versions()], ["v1", "v1-small"])
+        self.assertEqual(reg.active()["version"], "v1")
+
+
+# ==============
+# VIEW ASYNC (ASGI)
+# ==============
+
+class AsyncViewTests(TestCase):
+    def post(self, data):
+        from asgiref.sync import async_to_sync
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import AsyncRequestFactory
+
+        from . import views_async
+
+        form = {k: ("1" if v else "0") if isinstance(v, bool) else ("" if v is None else str(v)) for k, v in data.items()}
+        request = AsyncRequestFactory().post(reverse("submit_screening"), form)
+        request.user = AnonymousUser()
+
+        async def auser():
+            return request.user
+
+        request.auser = auser
+        return async_to_sync(views_async.submit_screening)(request)
+
+    def test_submit_saves_submission_and_times_model_stage(self):
+        from . import metrics
+
+        before = metrics.STAGE_SECONDS.labels("submit", "model").count
+        response = self.post(_patient())
+        self.assertEqual(response.status_code, 200)
+        submission = ScreeningSubmission.objects.get()
+        self.assertEqual(submission.model_version, predictor.get_model().version)
+        self.assertEqual(metrics.STAGE_SECONDS.labels("submit", "model").count, before + 1)
+
+    def test_submit_without_model_shows_error(self):
+        with mock.patch.object(predictor, "get_model", return_value=None):
+            response = self.post(_patient())
+        self.assertContains(response, "Sistem prediksi sedang tidak tersedia")
+        self.assertFalse(ScreeningSubmission.objects.exists())
+
+    def test_download_result(self):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncRequestFactory
+
+        from . import views_async
+
+        download = async_to_sync(views_async.download_result)
+        submission = _submission()
+        factory = AsyncRequestFactory()
+        response = download(factory.get(reverse("download_result"), {"submission_id": submission.id}))
+        self.assertEqual(response.status_code, 200)
+        response = download(factory.get(reverse("download_result"), {"submission_id": submission.id + 1}))
+        self.assertEqual(response.status_code, 404)
+
+
+# ==============
+# RETRAIN
+# ==============
+
+class RetrainTests(TestCase):
+    def setUp(self):
+        from .registry import ModelRegistry
+
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        manifest = os.path.join(self.tmp, "registry.json")
+        shutil.copy(predictor.MODEL_PATH, os.path.join(self.tmp, "m.joblib"))
+        self.reg = ModelRegistry(manifest)
+        self.reg.register(os.path.join(self.tmp, "m.joblib"), "v1")
+        settings_override = override_settings(SCREENING_MODEL_REGISTRY={"MANIFEST": manifest, "POLL_SECONDS": None})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def labelled(self, minutes_ago, outcome="Preeklampsia"):
+        submission = _submission(outcome=outcome)
+        ScreeningSubmission.objects.filter(pk=submission.pk).update(
+            outcome_recorded_at=timezone.now() - timezone.timedelta(minutes=minutes_ago)
+        )
+        return submission
+
+    def retrain(self, *args):
+        from django.core.management import call_command
+
+        out = io.StringIO()
+        call_command("retrain", *args, stdout=out)
+        return out.getvalue()
+
+    def test_watermark_survives_rollback(self):
+        self.labelled(60)
+        self.labelled(30, outcome="NonPreeklampsia")
+        self.retrain("--trees", "1", "--model-version", "r1")
+        self.assertEqual(self.reg.active()["version"], "r1")
+        self.assertEqual(self.reg.retrain_watermark()["version"], "r1")
+
+        self.reg.activate("v1")
+        self.assertIn("0 submission baru", self.retrain("--dry-run"))
+        self.labelled(10)
+        self.assertIn("1 submission baru", self.retrain("--dry-run"))
+        self.assertIn("3 submission baru", self.retrain("--dry-run", "--reset-watermark"))
+
+    def test_recent_outcomes_wait_for_settle_window(self):
+        self.labelled(60)
+        self.labelled(1)
+        self.assertIn("1 submission baru", self.retrain("--dry-run"))
+        self.assertIn("2 submission baru", self.retrain("--dry-run", "--settle-seconds", "0"))
+
+    def test_late_commit_with_earlier_timestamp_is_not_skipped(self):
+        self.labelled(10)
+        self.labelled(1)
+        self.retrain("--trees", "1", "--model-version", "r1")
+        # Commit sesudah run di atas, dengan outcome_recorded_at lebih awal
+        # dari baris 1 menit lalu: tidak boleh terlewati watermark
+        self.labelled(4)
+        self.assertIn("2 submission baru", self.retrain("--dry-run", "--settle-seconds", "0"))
+
+
+# ==============
+# MIGRASI
+# ==============
+
+class TypedResultBackfillTests(TransactionTestCase):
+    """Migrasi 0008 mengisi is_preeclampsia / preeclampsia_probability dari teks lama."""
+
+    before = [("screening", "0007_screeningsubmission_typed_result")]
+    after = [("screening", "0008_backfill_typed_result")]
+
+    def migrate(self, targets):
+        from django.db import connection
+        from django.db.migrations.executor import MigrationExecutor
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        from django.db import connection
+        from django.db.migrations.executor import MigrationExecutor
+
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        apps = self.migrate(self.before)
+        Submission = apps.get_model("screening", "ScreeningSubmission")
+        fields = _patient()
+        rows = {
+            "pree": Submission.objects.create(**dict(fields, result="Preeklampsia", confidence="87.5%")).pk,
+            "non": Submission.objects.create(**dict(fields, result="Non-Preeklampsia", confidence="80%")).pk,
+            "bad_conf": Submission.objects.create(**dict(fields, result="preeclampsia", confidence="abc")).pk,
+            "unknown": Submission.objects.create(**dict(fields, result="?", confidence="50%")).pk,
+        }
+
+        apps = self.migrate(self.after)
+        Submission = apps.get_model("screening", "ScreeningSubmission")
+        typed = {
+            key: Submission.objects.values_list("is_preeclampsia", "preeclampsia_probability").get(pk=pk)
+            for key, pk in rows.items()
+        }
+        self.assertEqual(typed["pree"], (True, 0.875))
+        self.assertEqual(typed["non"][0], False)
+        self.assertAlmostEqual(typed["non"][1], 0.2)
+        self.assertEqual(typed["bad_conf"], (True, None))
+        self.assertEqual(typed["unknown"], (None, None))
@@ -0,0 +1,417 @@
+"""
+Tooling training RandomForest preeklampsia yang bisa dipakai ulang dari
+management command (tanpa Django; hanya pandas + sklearn).
+
+Definisi fitur dan preprocessing sama dengan `ml_models/train_preeklampsia_rf.py`
+sehingga kandidat hasil search bisa dibandingkan langsung dengan model yang
+sedang dipakai.
+
+Search hyperparameter (`successive_halving`):
+
+- kandidat diambil dari grid n_estimators x max_depth x min_samples_leaf
+  x max_features;
+- setiap rung memakai sebagian sampel DAN sebagian tree (fraksi factor^(k-K)),
+  hanya 1/factor kandidat terbaik (f1_macro CV) yang naik ke rung berikutnya,
+  rung terakhir memakai seluruh data dan n_estimators penuh;
+- semua (kandidat, fold) dalam satu rung dijalankan paralel di process
+  pool; Pipeline(memory=...) membuat ColumnTransformer hanya di-fit sekali
+  per (rung, fold), dipakai bersama oleh semua kandidat;
+- latency inferensi setiap kandidat (CompiledForest + FeatureEncoder, jalur
+  yang dipakai aplikasi) diukur setelah search, satu per satu supaya tidak
+  terganggu proses lain.
+
+Pemilihan model (`evaluate_finalists`, `pareto_front`, `select_fastest`):
+finalis (kandidat teratas + baseline) dievaluasi ulang dengan data dan
+tree penuh, lalu dibentuk Pareto front recall kelas Preeklampsia vs p99
+latency vs memori. Yang dipilih adalah model tercepat yang recall-nya
+masih dalam toleransi dari recall terbaik.
+
+Retrain inkremental (`grow_forest`): forest yang sudah ada ditambah tree
+baru dengan warm_start, dilatih pada data CSV dasar + submission berlabel
+yang baru, tanpa fit ulang preprocessing maupun tree lama.
+"""
+import itertools
+import math
+import io
+import os
+import random
+import time
+
+from . import dataset, training_data
+
+TARGET_COL = dataset.LABEL_COLUMN
+POSITIVE_LABEL = "Preeklampsia"
+DEFAULT_CSV = os.path.join(os.path.dirname(__file__), "ml_models", "ALL_FINAL.csv")
+
+NUMERIC_FEATURES = [col for col, _, kind in dataset.CSV_COLUMNS if kind in ("int", "float")]
+CATEGORICAL_FEATURES = [col for col, _, kind in dataset.CSV_COLUMNS if kind in ("str", "bool")]
+
+SEARCH_SPACE = {
+    "n_estimators": [50, 100, 200, 400],
+    "max_depth": [None, 8, 12, 16],
+    "min_samples_leaf": [1, 2, 4],
+    "max_features": ["sqrt", "log2", 0.5],
+}
+# Parameter model yang sekarang dipakai (train_preeklampsia_rf.py), selalu
+# ikut sebagai kandidat pembanding
+BASELINE_PARAMS = {"n_estimators": 200, "max_depth": None, "min_samples_leaf": 1, "max_features": "sqrt"}
+LATENCY_BATCH = 128
+# (metrik, arah) untuk Pareto front
+PARETO_OBJECTIVES = (("recall_pree", "max"), ("single_p99_ms", "min"), ("engine_bytes", "min"))
+
+
+# ==============
+# DATA & PIPELINE
+# ==============
+
+def load_training_frame(path=DEFAULT_CSV, cache=True):
+    """
+    (X, y) dari `training_data.load_training_data`: header dinormalisasi
+    (termasuk alias "Perkerjaan" -> "Pekerjaan"), ejaan ganda kategori
+    digabung, nilai divalidasi terhadap schema, dan hasil parse di-cache per
+    hash file.
+    """
+    data = training_data.load_training_data(path, cache=cache)
+    return data.frame(), data.target()
+
+
+def build_preprocessor(columns):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder
+
+    numeric = [c for c in NUMERIC_FEATURES if c in columns]
+    categorical = [c for c in CATEGORICAL_FEATURES if c in columns]
+    return ColumnTransformer(
+        transformers=[
+            ("num", Pipeline(steps=[("imputer", SimpleImputer(strategy="median"))]), numeric),
+            ("cat", Pipeline(steps=[
+                ("imputer", SimpleImputer(strategy="most_frequent")),
+                ("onehot", OneHotEncoder(handle_unknown="ignore")),
+            ]), categorical),
+        ]
+    )
+
+
+def build_pipeline(columns, params=None, memory=None, n_jobs=None, random_state=42):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+
+    params = dict(params or {})
+    params.setdefault("n_estimators", 200)
+    clf = RandomForestClassifier(random_state=random_state, n_jobs=n_jobs, **params)
+    return Pipeline(steps=[("preprocess", build_preprocessor(columns)), ("clf", clf)], memory=memory)
+
+
+# ==============
+# SUCCESSIVE HALVING
+# ==============
+
+def candidate_grid(space=SEARCH_SPACE, n_candidates=None, seed=42):
+    keys = list(space)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+    if n_candidates and n_candidates < len(grid):
+        grid = random.Random(seed).sample(grid, n_candidates)
+        if BASELINE_PARAMS not in grid:
+            grid[0] = dict(BASELINE_PARAMS)
+    return grid
+
+
+def _subsample(y, n_samples, seed):
+    """Index stratified sebanyak n_samples (semua index jika n_samples >= len(y))."""
+    import numpy as np
+    from sklearn.model_selection import train_test_split
+
+    idx = np.arange(len(y))
+    if n_samples >= len(y):
+        return idx
+    sub, _ = train_test_split(idx, train_size=n_samples, stratify=y, random_state=seed)
+    return np.sort(sub)
+
+
+def _fit_score(cand_id, params, X_train, y_train, X_test, y_test, cache_dir):
+    from sklearn.metrics import accuracy_score, f1_score, recall_score
+
+    started = time.perf_counter()
+    model = build_pipeline(X_train.columns, params, memory=cache_dir, n_jobs=1)
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - started
+    y_pred = model.predict(X_test)
+    return cand_id, {
+        "f1_macro": f1_score(y_test, y_pred, average="macro", zero_division=0),
+        "accuracy": accuracy_score(y_test, y_pred),
+        "recall_pree": recall_score(y_test, y_pred, pos_label=POSITIVE_LABEL, average="binary", zero_division=0),
+        "fit_s": fit_s,
+    }
+
+
+def _aggregate(rows):
+    """Rata-rata skor per fold (+ std untuk f1_macro dan recall)."""
+    import numpy as np
+
+    out = {key: float(np.mean([r[key] for r in rows])) for key in rows[0]}
+    out["f1_macro_std"] = float(np.std([r["f1_macro"] for r in rows]))
+    out["recall_pree_std"] = float(np.std([r["recall_pree"] for r in rows]))
+    return out
+
+
+def _trees_at(params, fraction, min_trees):
+    return max(min(min_trees, params["n_estimators"]), int(round(params["n_estimators"] * fraction)))
+
+
+def successive_halving(X, y, candidates, factor=3, cv=5, n_jobs=None, cache_dir=None,
+                       min_samples=None, min_trees=10, seed=42, log=print):
+    """
+    Jalankan successive halving atas `candidates` (list dict parameter RF).
+
+    Return (rungs, results): `rungs` berisi ringkasan per rung, `results`
+    satu dict per kandidat dengan rung terakhir yang dicapai dan skornya.
+    """
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import StratifiedKFold
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    n_total = len(y)
+    # rung pertama yang terlalu kecil cenderung memenangkan tree dangkal
+    min_samples = min_samples or max(cv * 20, 100)
+    n_rungs = max(int(math.floor(math.log(max(len(candidates), 1), factor))), 0) + 1
+
+    results = [{"id": i, "params": params} for i, params in enumerate(candidates)]
+    alive = list(range(len(candidates)))
+    rungs = []
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for k in range(n_rungs):
+            fraction = float(factor) ** (k - (n_rungs - 1))
+            n_samples = min(n_total, max(min_samples, int(round(n_total * fraction))))
+            idx = _subsample(y, n_samples, seed)
+            Xs, ys = X.iloc[idx], y.iloc[idx]
+            folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed).split(Xs, ys))
+
+            started = time.perf_counter()
+            tasks = []
+            for cand_id in alive:
+                params = dict(candidates[cand_id], n_estimators=_trees_at(candidates[cand_id], fraction, min_trees))
+                for train_idx, test_idx in folds:
+                    tasks.append(delayed(_fit_score)(
+                        cand_id, params, Xs.iloc[train_idx], ys.iloc[train_idx],
+                        Xs.iloc[test_idx], ys.iloc[test_idx], cache_dir,
+                    ))
+            scores = {}
+            for cand_id, fold_scores in parallel(tasks):
+                scores.setdefault(cand_id, []).append(fold_scores)
+
+            for cand_id, rows in scores.items():
+                results[cand_id].update(
+                    rung=k,
+                    n_samples=n_samples,
+                    n_estimators_fit=_trees_at(candidates[cand_id], fraction, min_trees),
+                    **_aggregate(rows),
+                )
+            wall = time.perf_counter() - started
+            rungs.append({
+                "rung": k,
+                "fraction": fraction,
+                "n_samples": n_samples,
+                "candidates": len(alive),
+                "fits": len(tasks),
+                "wall_s": wall,
+            })
+            log(
+                f"rung {k}: {len(alive)} kandidat x {cv} fold, {n_samples} sampel, "
+                f"fraksi tree {fraction:.3f} ({wall:.1f} detik)"
+            )
+
+            if k < n_rungs - 1:
+                ranked = sorted(alive, key=lambda c: results[c]["f1_macro"], reverse=True)
+                alive = ranked[: max(1, int(math.ceil(len(alive) / factor)))]
+    return rungs, results
+
+
+# ==============
+# LATENCY INFERENSI
+# ==============
+
+def measure_latency(model, X, repeat=200, batch_size=LATENCY_BATCH):
+    """
+    Latency predict_proba jalur aplikasi (FeatureEncoder + CompiledForest)
+    untuk pipeline yang sudah di-fit, satu baris dan batch, beserta ukuran
+    engine di memori dan ukuran artefak joblib.
+    """
+    import joblib
+
+    from .inference import CompiledForest, FeatureEncoder
+
+    encoder = FeatureEncoder.from_estimator(model)
+    engine = CompiledForest.from_estimator(model)
+    artifact = io.BytesIO()
+    joblib.dump(model, artifact)
+    result = engine_latency(encoder, engine, X.to_dict("records"), repeat=repeat, batch_size=batch_size)
+    result["artifact_bytes"] = artifact.tell()
+    return result
+
+
+def engine_latency(encoder, engine, rows, repeat=200, batch_size=LATENCY_BATCH):
+    """Latency encode + predict_with_proba untuk satu baris dan satu batch (dict baris mentah)."""
+    import numpy as np
+
+    batch = [rows[i % len(rows)] for i in range(batch_size)]
+    samples = []
+    for i in range(repeat):
+        row = [rows[i % len(rows)]]
+        t0 = time.perf_counter()
+        engine.predict_with_proba(encoder.transform_rows(row))
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    batch_samples = []
+    for _ in range(max(repeat // 10, 5)):
+        t0 = time.perf_counter()
+        engine.predict_with_proba(encoder.transform_rows(batch))
+        batch_samples.append((time.perf_counter() - t0) * 1000.0)
+
+    return {
+        "single_p50_ms": float(np.percentile(samples, 50)),
+        "single_p95_ms": float(np.percentile(samples, 95)),
+        "single_p99_ms": float(np.percentile(samples, 99)),
+        "batch_p50_ms": float(np.percentile(batch_samples, 50)),
+        "batch_p99_ms": float(np.percentile(batch_samples, 99)),
+        "batch_per_row_us": float(np.median(batch_samples)) * 1000.0 / batch_size,
+        "node_count": int(engine.node_count),
+        "engine_bytes": int(engine.nbytes),
+    }
+
+
+def leaderboard(X, y, rungs, results, seed=42, repeat=200, log=print):
+    """
+    Urutkan kandidat (rung tertinggi dulu, lalu f1_macro) dan ukur latency
+    setiap kandidat dengan model yang di-fit pada sampel + jumlah tree dari
+    rung terakhir yang dicapainya.
+    """
+    ranked = sorted(
+        (r for r in results if "rung" in r),
+        key=lambda r: (r["rung"], r["f1_macro"], -r["fit_s"]),
+        reverse=True,
+    )
+    for rank, entry in enumerate(ranked, start=1):
+        idx = _subsample(y, entry["n_samples"], seed)
+        params = dict(entry["params"], n_estimators=entry["n_estimators_fit"])
+        model = build_pipeline(X.columns, params, n_jobs=1).fit(X.iloc[idx], y.iloc[idx])
+        entry["rank"] = rank
+        entry["latency"] = measure_latency(model, X, repeat=repeat)
+        if rank <= 10 or rank % 20 == 0:
+            log(f"latency #{rank}: {entry['latency']['single_p50_ms']:.3f} ms ({entry['params']})")
+    return ranked
+
+
+# ==============
+# PEMILIHAN MODEL (PARETO)
+# ==============
+
+def evaluate_finalists(X, y, candidates, cv=10, n_jobs=None, cache_dir=None, seed=42, repeat=500, log=print):
+    """
+    Evaluasi ulang `candidates` (list dict parameter) dengan seluruh data dan
+    n_estimators penuh: skor CV (termasuk recall kelas Preeklampsia) plus
+    latency/ukuran model yang di-fit pada seluruh data.
+    """
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import StratifiedKFold
+
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed).split(X, y))
+    tasks = [
+        delayed(_fit_score)(
+            i, params, X.iloc[train_idx], y.iloc[train_idx], X.iloc[test_idx], y.iloc[test_idx], cache_dir
+        )
+        for i, params in enumerate(candidates)
+        for train_idx, test_idx in folds
+    ]
+    scores = {}
+    for i, fold_scores in Parallel(n_jobs=n_jobs or os.cpu_count() or 1)(tasks):
+        scores.setdefault(i, []).append(fold_scores)
+
+    evaluated = []
+    for i, params in enumerate(candidates):
+        model = build_pipeline(X.columns, params, n_jobs=1).fit(X, y)
+        entry = {"id": i, "params": params, **_aggregate(scores[i])}
+        entry.update(measure_latency(model, X, repeat=repeat))
+        evaluated.append(entry)
+        log(
+            f"finalis {i}: recall {entry['recall_pree']:.4f}, p99 {entry['single_p99_ms']:.3f} ms, "
+            f"{entry['engine_bytes'] / 1024:.0f} KiB ({params})"
+        )
+    return evaluated
+
+
+def pareto_front(points, objectives=PARETO_OBJECTIVES):
+    """
+    Titik yang tidak didominasi titik lain: tidak ada titik lain yang sama
+    atau lebih baik di semua objektif dan lebih baik di salah satunya.
+    """
+    def better_or_equal(a, b, key, direction):
+        return a[key] >= b[key] if direction == "max" else a[key] <= b[key]
+
+    def strictly_better(a, b, key, direction):
+        return a[key] > b[key] if direction == "max" else a[key] < b[key]
+
+    front = []
+    for p in points:
+        dominated = any(
+            all(better_or_equal(q, p, key, d) for key, d in objectives)
+            and any(strictly_better(q, p, key, d) for key, d in objectives)
+            for q in points
+            if q is not p
+        )
+        if not dominated:
+            front.append(p)
+    return sorted(front, key=lambda p: p[objectives[1][0]])
+
+
+def select_fastest(points, recall_tolerance=0.01):
+    """
+    Model dengan p99 latency satu baris terkecil di antara yang recall
+    Preeklampsia-nya >= recall terbaik - recall_tolerance (seri: memori
+    terkecil).
+    """
+    best_recall = max(p["recall_pree"] for p in points)
+    eligible = [p for p in points if p["recall_pree"] >= best_recall - recall_tolerance]
+    return min(eligible, key=lambda p: (p["single_p99_ms"], p["engine_bytes"]))
+
+
+# ==============
+# RETRAIN INKREMENTAL (WARM START)
+# ==============
+
+def transform_features(pipeline, X):
+    """X -> matriks float32 input forest, memakai preprocessing pipeline yang sudah di-fit."""
+    import numpy as np
+
+    Xt = pipeline[:-1].transform(X)
+    if hasattr(Xt, "toarray"):
+        Xt = Xt.toarray()
+    return np.asarray(Xt, dtype=np.float32)
+
+
+def grow_forest(pipeline, Xt, y, n_new_trees, max_trees=None, n_jobs=None):
+    """
+    Tambah `n_new_trees` tree ke forest di pipeline dengan warm_start, dilatih
+    pada Xt (sudah lewat `transform_features`) dan y. Preprocessing tidak
+    di-fit ulang: tree lama bergantung pada layout fitur yang sama. Jika
+    `max_trees` diisi, tree paling lama dibuang sampai jumlahnya <= max_trees.
+    Pipeline diubah in-place; return (trees_before, trees_after).
+    """
+    import numpy as np
+
+    forest = pipeline.steps[-1][1]
+    before = len(forest.estimators_)
+    unknown = sorted(set(np.unique(y)) - {str(c) for c in forest.classes_})
+    if unknown:
+        raise ValueError(f"Label tidak dikenal model: {', '.join(unknown)}")
+    if len(np.unique(y)) < len(forest.classes_):
+        # warm_start menghitung ulang classes_ dari y; harus lengkap
+        raise ValueError("Data retrain harus berisi semua kelas model")
+
+    forest.set_params(warm_start=True, n_estimators=before + n_new_trees, n_jobs=n_jobs)
+    forest.fit(Xt, y)
+    forest.set_params(warm_start=False)
+    if max_trees and len(forest.estimators_) > max_trees:
+        forest.estimators_ = forest.estimators_[-max_trees:]
+        forest.n_estimators = max_trees
+    return before, len(forest.estimators_)
@@ -0,0 +1,288 @@
+"""
+Loader dataset training bersama (ALL_FINAL.csv) untuk script training,
+`tune_model`, `compress_model`, `retrain` dan rebuild_rf_model.py.
+
+CSV di-parse per chunk dengan operasi kolom pandas (bukan per sel),
+divalidasi terhadap schema di bawah, lalu disimpan sebagai array .npy
+(numerik float64 + kode kategori int16) yang bisa di-mmap. Run berikutnya
+dengan file yang sama (sha256 sama) langsung membuka cache tanpa mem-parse
+CSV.
+
+Normalisasi dilakukan eksplisit dan dicatat di `TrainingData.issues`:
+- header "Perkerjaan" dibaca sebagai kolom "Pekerjaan"
+  (`dataset.HEADER_ALIASES`), nama yang dipakai form dan `feature_row`;
+- ejaan ganda kategori (`dataset.CATEGORY_ALIASES`, mis. "Swastas" ->
+  "Swasta") digabung, sama seperti di `dataset.feature_row` saat inferensi.
+
+Modul terpisah dari dataset.py (yang di-import view) supaya NumPy/pandas
+tidak ikut ter-load saat startup web.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .dataset import (
+    CATEGORY_ALIASES,
+    CSV_COLUMNS,
+    CSV_DELIMITER,
+    HEADER_ALIASES,
+    LABEL_COLUMN,
+    normalize_header,
+)
+from .model_bundle import file_sha256
+
+logger = logging.getLogger(__name__)
+
+# Versi 2: kategori ganda Pekerjaan digabung (CATEGORY_ALIASES)
+TRAINING_SCHEMA_VERSION = 2
+TRAINING_CACHE_DIRNAME = ".dataset_cache"
+
+YES_NO = ["Tidak", "Ya"]
+LABELS = ["NonPreeklampsia", "Preeklampsia"]
+# Vocabulary kolom kategorikal (nilai di luar daftar tetap dipakai, tapi
+# dicatat di `TrainingData.issues` dan di-log)
+CATEGORIES = {
+    "Kabupaten/Kota": ["Bojonegoro", "Gresik", "Lamongan", "Surabaya"],
+    "Pendidikan": ["SD", "SMP", "SMA", "SMK", "SLTA", "D3", "D4", "S1", "S2", "S3"],
+    "Pekerjaan": [
+        "IRT", "Swasta", "Kary.Swasta", "Wiraswasta", "Pedagang",
+        "Jualan", "PNS", "Guru", "Dosen", "Bidan", "Perawat",
+    ],
+    "Status Nikah": ["Sah", "Siri", "Tidak"],
+    "Paritas": ["Primipara", "Multipara", "Grandemulti"],
+}
+_YES_NO_VALUES = {"ya": "Ya", "yes": "Ya", "1": "Ya", "true": "Ya", "tidak": "Tidak", "no": "Tidak", "0": "Tidak", "false": "Tidak"}
+
+
+class SchemaError(ValueError):
+    """CSV training tidak sesuai schema (kolom hilang, label tidak dikenal)."""
+
+
+def training_schema():
+    """[(kolom, "numeric" | "category", vocabulary)] sesuai urutan CSV_COLUMNS."""
+    schema = []
+    for col, _, kind in CSV_COLUMNS:
+        if kind in ("int", "float"):
+            schema.append((col, "numeric", None))
+        elif kind == "bool":
+            schema.append((col, "category", YES_NO))
+        else:
+            schema.append((col, "category", CATEGORIES[col]))
+    return schema
+
+
+def _schema_digest():
+    payload = json.dumps([TRAINING_SCHEMA_VERSION, training_schema(), LABELS, HEADER_ALIASES, CATEGORY_ALIASES])
+    return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+
+class TrainingData:
+    """
+    Dataset training yang sudah di-parse.
+
+    numeric: float64 (n_kolom_numerik, n_baris), satu baris array per kolom
+    codes: int16 (n_kolom_kategori, n_baris), -1 = kosong
+    labels: int8 (n_baris,), index ke LABELS
+    """
+
+    def __init__(self, numeric, codes, labels, numeric_columns, category_columns, vocab, sha256=None,
+                 issues=None, from_cache=False):
+        self.numeric = numeric
+        self.codes = codes
+        self.labels = labels
+        self.numeric_columns = list(numeric_columns)
+        self.category_columns = list(category_columns)
+        self.vocab = vocab
+        self.sha256 = sha256
+        self.issues = issues or {}
+        self.from_cache = from_cache
+
+    def __len__(self):
+        return len(self.labels)
+
+    def frame(self):
+        """X sebagai DataFrame (kolom urut CSV_COLUMNS), kategori sebagai string/NaN."""
+        columns = {}
+        for i, col in enumerate(self.numeric_columns):
+            columns[col] = np.asarray(self.numeric[i])
+        for i, col in enumerate(self.category_columns):
+            values = np.asarray(self.vocab[col] + [np.nan], dtype=object)
+            columns[col] = pd.Series(values[np.asarray(self.codes[i])], dtype=object)  # kode -1 -> NaN
+        order = [col for col, _, _ in CSV_COLUMNS if col in columns]
+        return pd.DataFrame({col: columns[col] for col in order})
+
+    def target(self):
+        return pd.Series(np.asarray(LABELS, dtype=object)[np.asarray(self.labels)], name=LABEL_COLUMN)
+
+
+def parse_training_csv(path, chunk_size=10000):
+    """Parse CSV format ALL_FINAL.csv menjadi TrainingData (tanpa cache)."""
+    schema = training_schema()
+    vocab = {col: list(v) for col, kind, v in schema if kind == "category"}
+    numeric_columns = [col for col, kind, _ in schema if kind == "numeric"]
+    category_columns = [col for col, kind, _ in schema if kind == "category"]
+    col_kind = {col: kind for col, _, kind in CSV_COLUMNS}
+    numeric_parts, code_parts, label_parts = [], [], []
+    issues = {"renamed_columns": {}, "normalized_categories": {}, "invalid_numeric": {}, "unknown_categories": {}}
+
+    reader = pd.read_csv(
+        path,
+        sep=CSV_DELIMITER,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=chunk_size,
+        encoding="utf-8-sig",
+        skip_blank_lines=True,
+    )
+    for chunk in reader:
+        raw_columns = [str(c).strip() for c in chunk.columns]
+        for name in raw_columns:
+            if name in HEADER_ALIASES:
+                issues["renamed_columns"][name] = HEADER_ALIASES[name]
+        chunk.columns = normalize_header(chunk.columns)
+        missing = [col for col, _, _ in schema if col not in chunk.columns] + (
+            [LABEL_COLUMN] if LABEL_COLUMN not in chunk.columns else []
+        )
+        if missing:
+            raise SchemaError(f"Kolom CSV tidak ditemukan: {', '.join(missing)}")
+
+        block = np.empty((len(numeric_columns), len(chunk)), dtype=np.float64)
+        for i, col in enumerate(numeric_columns):
+            raw = chunk[col].str.strip()
+            values = pd.to_numeric(raw.where(raw != ""), errors="coerce")
+            invalid = int((values.isna() & (raw != "")).sum())
+            if invalid:
+                issues["invalid_numeric"][col] = issues["invalid_numeric"].get(col, 0) + invalid
+            block[i] = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        numeric_parts.append(block)
+
+        codes = np.empty((len(category_columns), len(chunk)), dtype=np.int16)
+        for i, col in enumerate(category_columns):
+            raw = chunk[col].str.strip()
+            if col_kind[col] == "bool":
+                raw = raw.str.lower().map(_YES_NO_VALUES).fillna(raw)
+            raw = raw.where(raw != "")
+            aliases = CATEGORY_ALIASES.get(col)
+            if aliases:
+                merged = raw.isin(list(aliases))
+                if merged.any():
+                    counts = issues["normalized_categories"].setdefault(col, {})
+                    for value, count in raw[merged].value_counts().items():
+                        counts[value] = counts.get(value, 0) + int(count)
+                    raw = raw.where(~merged, raw.map(aliases))
+            unknown = sorted(set(raw.dropna().unique()) - set(vocab[col]))
+            if unknown:
+                vocab[col].extend(unknown)
+                issues["unknown_categories"].setdefault(col, []).extend(unknown)
+            codes[i] = pd.Categorical(raw, categories=vocab[col]).codes
+        code_parts.append(codes)
+
+        labels = pd.Categorical(chunk[LABEL_COLUMN].str.strip(), categories=LABELS)
+        if (labels.codes < 0).any():
+            bad = sorted(set(chunk[LABEL_COLUMN][labels.codes < 0].str.strip()))
+            raise SchemaError(f"Label tidak dikenal di kolom {LABEL_COLUMN}: {', '.join(bad[:10])}")
+        label_parts.append(labels.codes.astype(np.int8))
+
+    if not label_parts:
+        raise SchemaError(f"CSV kosong: {path}")
+
+    # Kode kategori chunk awal tetap valid karena vocabulary hanya ditambah di belakang
+    return TrainingData(
+        numeric=np.concatenate(numeric_parts, axis=1),
+        codes=np.concatenate(code_parts, axis=1),
+        labels=np.concatenate(label_parts),
+        numeric_columns=numeric_columns,
+        category_columns=category_columns,
+        vocab=vocab,
+        issues={k: v for k, v in issues.items() if v},
+    )
+
+
+def training_cache_path(path, sha256, cache_dir=None):
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), TRAINING_CACHE_DIRNAME)
+    return os.path.join(cache_dir, f"{sha256[:16]}-{_schema_digest()}")
+
+
+def _save_training_cache(data, cache_path):
+    parent = os.path.dirname(cache_path)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".cache-", dir=parent)
+    try:
+        for name in ("numeric", "codes", "labels"):
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(getattr(data, name)), allow_pickle=False)
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump({
+                "schema_version": TRAINING_SCHEMA_VERSION,
+                "sha256": data.sha256,
+                "rows": len(data),
+                "numeric_columns": data.numeric_columns,
+                "category_columns": data.category_columns,
+                "vocab": data.vocab,
+                "issues": data.issues,
+            }, fh, indent=2)
+        try:
+            os.rename(tmp_dir, cache_path)
+        except OSError:
+            # Proses lain sudah menulis cache yang sama lebih dulu
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def _load_training_cache(cache_path):
+    with open(os.path.join(cache_path, "meta.json"), encoding="utf-8") as fh:
+        meta = json.load(fh)
+    arrays = {
+        name: np.load(os.path.join(cache_path, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+        for name in ("numeric", "codes", "labels")
+    }
+    return TrainingData(
+        numeric_columns=meta["numeric_columns"],
+        category_columns=meta["category_columns"],
+        vocab=meta["vocab"],
+        sha256=meta["sha256"],
+        issues=meta.get("issues"),
+        from_cache=True,
+        **arrays,
+    )
+
+
+def load_training_data(path, cache=True, cache_dir=None, chunk_size=10000):
+    """
+    TrainingData untuk CSV `path`. Dengan cache=True hasil parse disimpan di
+    `<dir CSV>/.dataset_cache/` (atau cache_dir) dengan kunci sha256 file +
+    versi schema, dan dibuka lewat mmap pada pemanggilan berikutnya.
+    """
+    sha256 = file_sha256(path)
+    cache_path = training_cache_path(path, sha256, cache_dir) if cache else None
+    if cache_path and os.path.isdir(cache_path):
+        try:
+            return _load_training_cache(cache_path)
+        except Exception as e:
+            logger.warning("Training data cache %s unusable (%s), re-parsing CSV", cache_path, e)
+
+    data = parse_training_csv(path, chunk_size=chunk_size)
+    data.sha256 = sha256
+    for raw, name in data.issues.get("renamed_columns", {}).items():
+        logger.info("%s: column %r read as %r", path, raw, name)
+    for col, counts in data.issues.get("normalized_categories", {}).items():
+        for value, count in counts.items():
+            logger.info("%s: %d value(s) %r in column %r normalized to %r",
+                        path, count, value, col, CATEGORY_ALIASES[col][value])
+    for col, count in data.issues.get("invalid_numeric", {}).items():
+        logger.warning("%s: %d non-numeric value(s) in column %r treated as missing", path, count, col)
+    for col, values in data.issues.get("unknown_categories", {}).items():
+        logger.warning("%s: values outside the schema vocabulary in column %r: %s", path, col, values)
+    if cache_path:
+        try:
+            _save_training_cache(data, cache_path)
+        except OSError as e:
+            logger.warning("Could not write training data cache %s: %s", cache_path, e)
+    return data
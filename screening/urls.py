@@ -1,6 +1,14 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Deployment ASGI: submit, download PDF dan dashboard memakai view async
+# (lihat views_async.py dan settings.SCREENING_ASYNC_VIEWS)
+if getattr(settings, "SCREENING_ASYNC_VIEWS", {}).get("ENABLED"):
+    from . import views_async as heavy_views
+else:
+    heavy_views = views
+
 urlpatterns = [
     path('', views.home, name='home'),
     path('login/', views.login_view, name='login'),
@@ -9,9 +17,17 @@ urlpatterns = [
     path('admin-logout/', views.admin_logout_view, name='admin_logout'),
     path('logout/', views.logout_view, name='logout'),
     path('screening/', views.screening_view, name='screening'),
-    path('submit/', views.submit_screening, name='submit_screening'),
+    path('submit/', heavy_views.submit_screening, name='submit_screening'),
+    path('bulk-upload/', views.bulk_upload, name='bulk_upload'),
+    path('api/v1/predict', views.api_predict, name='api_predict'),
     path('result/', views.result_view, name='result'),
-    path('download/', views.download_result, name='download_result'),
+    path('download/', heavy_views.download_result, name='download_result'),
+    path('api/v1/submissions', views.submissions_page, name='submissions_page'),
     path('my-submissions/', views.my_submissions, name='my_submissions'),
-    path('dashboard/', views.admin_dashboard, name='admin_dashboard'),
+    path('dashboard/', heavy_views.admin_dashboard, name='admin_dashboard'),
+    path('dashboard/stats.json', views.dashboard_stats, name='dashboard_stats'),
+    path('dashboard/export', views.export_submissions, name='export_submissions'),
+    path('inference/stats/', views.inference_stats, name='inference_stats'),
+    path('healthz/ready', views.healthz_ready, name='healthz_ready'),
+    path('metrics', views.metrics_view, name='metrics'),
 ]
@@ -1,55 +1,39 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout, get_user_model
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.views.decorators.csrf import csrf_exempt
 
-import os
 import json
 import logging
 import traceback
 
-import joblib
-import numpy as np
-import pandas as pd
 import io
 
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
 # =========================
-# LOAD MODEL RANDOM FOREST
+# MODEL RANDOM FOREST
 # MODEL UTAMA: ml_models/rf_preeclampsia.joblib
 # Model ini adalah Pipeline yang terdiri dari:
 # - ColumnTransformer (preprocessing: imputation + onehot encoding)
 # - RandomForestClassifier
-# Hasil prediksi HANYA berasal dari model ini
+# Hasil prediksi HANYA berasal dari model ini.
+# Load, compile dan warm-up model diatur oleh predictor.py (lazy / background),
+# sehingga import views tidak ikut me-load library ML.
 # =========================
 
-MODEL_PATH = os.path.join(
-    os.path.dirname(__file__),  # folder yang sama dengan views.py
-    "ml_models",
-    "rf_preeclampsia.joblib",  # MODEL UTAMA untuk prediksi (Pipeline dengan preprocessing)
-)
-
-rf_model = None
-try:
-    # Load model Pipeline dari file rf_preeclampsia.joblib
-    # Model ini sudah include preprocessing, jadi langsung predict dengan DataFrame
-    rf_model = joblib.load(MODEL_PATH)
-    logger.info("Model Pipeline loaded successfully from %s", MODEL_PATH)
-    logger.info("Model type: %s", type(rf_model).__name__)
-except FileNotFoundError:
-    logger.error("Model file not found: %s", MODEL_PATH)
-    logger.error("Prediksi tidak dapat dilakukan tanpa model rf_preeclampsia.joblib")
-    rf_model = None
-except Exception as e:
-    logger.error("Failed to load RF model from %s: %s", MODEL_PATH, e)
-    logger.error("Traceback: %s", traceback.format_exc())
-    rf_model = None
+from . import dataset, export, metrics, predictor, search, stats
+from .pdf_render import render_pdf
+
+MODEL_PATH = predictor.MODEL_PATH
 
 
 # ==============
@@ -152,93 +136,51 @@ def screening_view(request):
     return render(request, "screening/screening_form.html")
 
 
-# ===========================
-# HELPER UNTUK KONVERSI DATA
-# ===========================
-
-def _to_float(val, default=0.0):
-    """
-    Ubah string/angka ke float, kalau gagal pakai default.
-    Jika default=None, return None untuk missing values (akan di-handle oleh imputer).
-    """
-    if val is None or val == "":
-        return default
-    try:
-        result = float(val)
-        # Return default jika hasilnya NaN atau inf
-        if np.isnan(result) or np.isinf(result):
-            return default
-        return result
-    except Exception:
-        return default
-
-
-def _clean_str(val):
-    """
-    Bersihkan string dari spasi depan/belakang.
-    """
-    if val is None:
-        return None
-    return str(val).strip()
-
-
 # ===========================
 # SUBMIT SCREENING + PREDIKSI
 # ===========================
 
-def submit_screening(request):
-    from .models import ScreeningSubmission  # import lokal
-
-    if request.method != "POST":
-        return redirect("screening")
-
-    def to_bool(val):
-        """
-        Form kirim "0"/"1". Di sini diubah ke bool atau None.
-        Bool akan diperlakukan sebagai 0/1 oleh OneHotEncoder/RandomForest.
-        """
-        if val in (None, ""):
-            return None
-        return True if str(val) in ("1", "True", "true", "on") else False
+def _form_data(post):
+    """Kumpulkan data mentah dari form dan konversi ke tipe field ScreeningSubmission."""
+    to_bool = dataset.to_bool
 
-    # Kumpulkan data mentah dari form
     data = {
-        "patient_name": request.POST.get("patient_name", ""),
-        "district_city": request.POST.get("district_city", ""),
-        "patient_age": request.POST.get("patient_age") or None,
-        "education_level": request.POST.get("education_level", ""),
-        "current_occupation": request.POST.get("current_occupation", ""),
-        "marital_status": request.POST.get("marital_status", ""),
-        "marriage_order": request.POST.get("marriage_order") or None,
-        "parity": request.POST.get("parity", ""),
-
-        "new_partner_pregnancy": to_bool(request.POST.get("new_partner_pregnancy")),
-        "child_spacing_over_10_years": to_bool(request.POST.get("child_spacing_over_10_years")),
-        "ivf_pregnancy": to_bool(request.POST.get("ivf_pregnancy")),
-        "multiple_pregnancy": to_bool(request.POST.get("multiple_pregnancy")),
-        "smoker": to_bool(request.POST.get("smoker")),
-        "planned_pregnancy": to_bool(request.POST.get("planned_pregnancy")),
-
-        "family_history_pe": to_bool(request.POST.get("family_history_pe")),
-        "personal_history_pe": to_bool(request.POST.get("personal_history_pe")),
-        "chronic_hypertension": to_bool(request.POST.get("chronic_hypertension")),
-        "diabetes_mellitus": to_bool(request.POST.get("diabetes_mellitus")),
-        "kidney_disease": to_bool(request.POST.get("kidney_disease")),
-        "autoimmune_disease": to_bool(request.POST.get("autoimmune_disease")),
-        "aps_history": to_bool(request.POST.get("aps_history")),
-
-        "pre_pregnancy_weight": request.POST.get("pre_pregnancy_weight") or None,
-        "height_cm": request.POST.get("height_cm") or None,
-        "bmi": request.POST.get("bmi") or None,
-        "lila_cm": request.POST.get("lila_cm") or None,
-        "systolic_bp": request.POST.get("systolic_bp") or None,
-        "diastolic_bp": request.POST.get("diastolic_bp") or None,
-        "map_mmhg": request.POST.get("map_mmhg") or None,
-        "hemoglobin": request.POST.get("hemoglobin") or None,
-
-        "family_history_hypertension": to_bool(request.POST.get("family_history_hypertension")),
-        "family_history_kidney": to_bool(request.POST.get("family_history_kidney")),
-        "family_history_heart": to_bool(request.POST.get("family_history_heart")),
+        "patient_name": post.get("patient_name", ""),
+        "district_city": post.get("district_city", ""),
+        "patient_age": post.get("patient_age") or None,
+        "education_level": post.get("education_level", ""),
+        "current_occupation": post.get("current_occupation", ""),
+        "marital_status": post.get("marital_status", ""),
+        "marriage_order": post.get("marriage_order") or None,
+        "parity": post.get("parity", ""),
+
+        "new_partner_pregnancy": to_bool(post.get("new_partner_pregnancy")),
+        "child_spacing_over_10_years": to_bool(post.get("child_spacing_over_10_years")),
+        "ivf_pregnancy": to_bool(post.get("ivf_pregnancy")),
+        "multiple_pregnancy": to_bool(post.get("multiple_pregnancy")),
+        "smoker": to_bool(post.get("smoker")),
+        "planned_pregnancy": to_bool(post.get("planned_pregnancy")),
+
+        "family_history_pe": to_bool(post.get("family_history_pe")),
+        "personal_history_pe": to_bool(post.get("personal_history_pe")),
+        "chronic_hypertension": to_bool(post.get("chronic_hypertension")),
+        "diabetes_mellitus": to_bool(post.get("diabetes_mellitus")),
+        "kidney_disease": to_bool(post.get("kidney_disease")),
+        "autoimmune_disease": to_bool(post.get("autoimmune_disease")),
+        "aps_history": to_bool(post.get("aps_history")),
+
+        "pre_pregnancy_weight": post.get("pre_pregnancy_weight") or None,
+        "height_cm": post.get("height_cm") or None,
+        "bmi": post.get("bmi") or None,
+        "lila_cm": post.get("lila_cm") or None,
+        "systolic_bp": post.get("systolic_bp") or None,
+        "diastolic_bp": post.get("diastolic_bp") or None,
+        "map_mmhg": post.get("map_mmhg") or None,
+        "hemoglobin": post.get("hemoglobin") or None,
+
+        "family_history_hypertension": to_bool(post.get("family_history_hypertension")),
+        "family_history_kidney": to_bool(post.get("family_history_kidney")),
+        "family_history_heart": to_bool(post.get("family_history_heart")),
     }
 
     # Konversi angka ke int/float
@@ -263,207 +205,64 @@ def submit_screening(request):
             except Exception:
                 data[key] = None
 
-    # Validasi minimal
-    if not data.get("patient_name") or data.get("patient_age") is None:
-        form_data_json = json.dumps(request.POST.dict())
-        return render(
-            request,
-            "screening/screening_form.html",
-            {
-                "error": "Nama pasien dan umur wajib diisi.",
-                "form_data": form_data_json,
-            },
-        )
+    return data
 
-    # ==============================
-    # PREDIKSI MENGGUNAKAN MODEL RF
-    # HASIL PREDIKSI HANYA BERASAL DARI: ml_models/rf_preeclampsia.joblib
-    # ==============================
 
-    is_pree = False
-    conf_val = 0.0
+def _form_error(request, message):
+    """Render ulang form screening dengan pesan error dan isian sebelumnya."""
+    return render(
+        request,
+        "screening/screening_form.html",
+        {
+            "error": message,
+            "form_data": json.dumps(request.POST.dict()),
+        },
+    )
 
-    # Validasi: Model HARUS tersedia untuk melakukan prediksi
-    if rf_model is None:
-        logger.error("Model rf_preeclampsia.joblib tidak tersedia! Prediksi tidak dapat dilakukan.")
-        form_data_json = json.dumps(request.POST.dict())
-        return render(
-            request,
-            "screening/screening_form.html",
-            {
-                "error": "Sistem prediksi sedang tidak tersedia. Silakan hubungi administrator.",
-                "form_data": form_data_json,
-            },
-        )
-
-    # Prediksi HANYA menggunakan model rf_preeclampsia.joblib
-    # Model ini adalah Pipeline dengan ColumnTransformer yang melakukan preprocessing otomatis
-    if rf_model is not None:
-        try:
-            # Helper function untuk mengkonversi boolean ke string Ya/Tidak
-            def _to_yesno(val):
-                """Konversi boolean/None ke string Ya/Tidak untuk categorical features"""
-                if val is None:
-                    return "Tidak"
-                if isinstance(val, bool):
-                    return "Ya" if val else "Tidak"
-                if isinstance(val, (int, float)):
-                    if np.isnan(val) or np.isinf(val):
-                        return "Tidak"
-                    return "Ya" if int(val) == 1 else "Tidak"
-                try:
-                    val_str = str(val).strip().lower()
-                    if val_str in ('1', 'true', 'ya', 'yes', 'on'):
-                        return "Ya"
-                    return "Tidak"
-                except Exception:
-                    return "Tidak"
-
-            # Bentuk DataFrame dengan nama kolom yang sama persis dengan training
-            # Model pipeline akan otomatis melakukan preprocessing (imputation + onehot encoding)
-            row = {
-                # Numeric features (akan di-impute dengan median jika missing)
-                'Umur (Tahun)': _to_float(data.get('patient_age'), default=None),
-                'Pernikahan Ke': _to_float(data.get('marriage_order'), default=None),
-                'BB Sebelum Hamil (Kg)': _to_float(data.get('pre_pregnancy_weight'), default=None),
-                'TB (Cm)': _to_float(data.get('height_cm'), default=None),
-                'Indeks Massa Tubuh (IMT)': _to_float(data.get('bmi'), default=None),
-                'Lingkar Lengan Atas (Cm)': _to_float(data.get('lila_cm'), default=None),
-                'TD Sistolik I': _to_float(data.get('systolic_bp'), default=None),
-                'TD Diastolik I': _to_float(data.get('diastolic_bp'), default=None),
-                'MAP (mmHg)': _to_float(data.get('map_mmhg'), default=None),
-                'Hb (gr/dl)': _to_float(data.get('hemoglobin'), default=None),
-                
-                # Categorical features (akan di-impute dengan most_frequent + onehot encoded)
-                'Kabupaten/Kota': _clean_str(data.get('district_city')) or None,
-                'Pendidikan': _clean_str(data.get('education_level')) or None,
-                'Pekerjaan': _clean_str(data.get('current_occupation')) or None,
-                'Status Nikah': _clean_str(data.get('marital_status')) or None,
-                'Paritas': _clean_str(data.get('parity')) or None,
-                'Hamil Pasangan Baru': _to_yesno(data.get('new_partner_pregnancy')),
-                'Jarak Anak >10 tahun': _to_yesno(data.get('child_spacing_over_10_years')),
-                'Bayi Tabung': _to_yesno(data.get('ivf_pregnancy')),
-                'Gemelli': _to_yesno(data.get('multiple_pregnancy')),
-                'Perokok': _to_yesno(data.get('smoker')),
-                'Hamil Direncanakan': _to_yesno(data.get('planned_pregnancy')),
-                'Riwayat Keluarga Preeklampsia': _to_yesno(data.get('family_history_pe')),
-                'Riwayat Preeklampsia': _to_yesno(data.get('personal_history_pe')),
-                'Hipertensi Kronis': _to_yesno(data.get('chronic_hypertension')),
-                'Diabetes Melitus': _to_yesno(data.get('diabetes_mellitus')),
-                'Riwayat Penyakit Ginjal': _to_yesno(data.get('kidney_disease')),
-                'Penyakit Autoimune': _to_yesno(data.get('autoimmune_disease')),
-                'APS': _to_yesno(data.get('aps_history')),
-                'Hipertensi Keluarga': _to_yesno(data.get('family_history_hypertension')),
-                'Riwayat Penyakit Ginjal Keluarga': _to_yesno(data.get('family_history_kidney')),
-                'Riwayat Penyakit Jantung Keluarga': _to_yesno(data.get('family_history_heart')),
-            }
-
-            # Buat DataFrame dengan nama kolom yang sama persis dengan training
-            X_input = pd.DataFrame([row])
-            
-            # Model pipeline akan otomatis melakukan:
-            # 1. Imputation (median untuk numeric, most_frequent untuk categorical)
-            # 2. OneHotEncoding untuk categorical features
-            # 3. Prediksi dengan RandomForest
-
-            # PREDIKSI UTAMA: Menggunakan model pipeline rf_preeclampsia.joblib
-            # Model ini sudah include preprocessing, jadi langsung predict dengan DataFrame
-            y_pred_raw = rf_model.predict(X_input)[0]
-
-            # Normalize predicted label to canonical string values used elsewhere
-            # ('Preeklampsia' or 'NonPreeklampsia')
-            def _normalize_label(raw):
-                try:
-                    # numeric types -> 1 means Preeklampsia
-                    if isinstance(raw, (int, float, np.integer)):
-                        return 'Preeklampsia' if int(raw) == 1 else 'NonPreeklampsia'
-                    s = str(raw).strip()
-                    key = s.lower().replace('-', '').replace(' ', '')
-                    if key in ('preeklampsia', 'preeclampsia'):
-                        return 'Preeklampsia'
-                    if key in ('nonpreeklampsia', 'nonpreeclampsia', 'nonpreeklampsia'):
-                        return 'NonPreeklampsia'
-                    # if it's a numeric string
-                    try:
-                        if int(s) == 1:
-                            return 'Preeklampsia'
-                        else:
-                            return 'NonPreeklampsia'
-                    except Exception:
-                        return s
-                except Exception:
-                    return str(raw)
-
-            y_pred = _normalize_label(y_pred_raw)
 
-            # Confidence calculation: try to use predict_proba and locate the Preeklampsia class index
-            if hasattr(rf_model, 'predict_proba'):
+def _predict_submission(model, data):
+    """
+    Prediksi satu pasien dari field ScreeningSubmission.
+    Return (is_pree, conf_val); exception diteruskan ke pemanggil.
+    """
+    # Bentuk baris dengan nama kolom yang sama persis dengan training
+    # (lihat dataset.feature_row; dipakai juga oleh upload CSV massal)
+    with metrics.timer("submit", "encode"):
+        row = dataset.feature_row(data)
+        X_encoded = model.encoder.transform_row(row) if model.engine is not None else None
+
+    # PREDIKSI UTAMA: Menggunakan model pipeline rf_preeclampsia.joblib
+    # model.encoder melakukan preprocessing yang sama dengan pipeline:
+    # 1. Imputation (median untuk numeric, most_frequent untuk categorical)
+    # 2. OneHotEncoding untuk categorical features
+    # lalu model.engine mengevaluasi RandomForest (label + probabilitas
+    # dari satu traversal).
+    probas = None
+    classes = None
+    if model.engine is not None:
+        # Cache hasil prediksi -> micro-batcher -> engine
+        with metrics.timer("submit", "predict"):
+            y_pred_raw, probas = predictor.predict_encoded(model, X_encoded, timeout=30)
+        classes = model.classes
+    else:
+        # Fallback: DataFrame dengan nama kolom yang sama persis dengan training
+        import pandas as pd
+
+        X_input = pd.DataFrame([row])
+        with metrics.timer("submit", "predict"), predictor.thread_budget().sklearn_context(len(X_input)):
+            y_pred_raw = model.pipeline.predict(X_input)[0]
+            if hasattr(model.pipeline, 'predict_proba'):
                 try:
-                    probas = rf_model.predict_proba(X_input)[0]
-                    classes = list(rf_model.classes_)
-
-                    # find index corresponding to Preeklampsia
-                    idx_pree = None
-                    for idx, c in enumerate(classes):
-                        try:
-                            if isinstance(c, (int, float, np.integer)) and int(c) == 1:
-                                idx_pree = idx
-                                break
-                            kc = str(c).lower().replace('-', '').replace(' ', '')
-                            if kc in ('preeklampsia', 'preeclampsia'):
-                                idx_pree = idx
-                                break
-                        except Exception:
-                            continue
-
-                    if idx_pree is not None:
-                        pree_proba = float(probas[idx_pree]) * 100.0
-                        conf_val = pree_proba if y_pred == 'Preeklampsia' else 100.0 - pree_proba
-                    else:
-                        conf_val = float(max(probas) * 100.0)
+                    probas = model.pipeline.predict_proba(X_input)[0]
+                    classes = model.classes
                 except Exception:
-                    conf_val = 75.0
-            else:
-                conf_val = 75.0
+                    probas = None
 
-            is_pree = (y_pred == 'Preeklampsia')
-
-        except Exception as e:
-            # Jika terjadi error saat prediksi dengan model, log error dan return error
-            logger.error("Error during RF prediction using rf_preeclampsia.joblib: %s", e)
-            logger.error("Traceback: %s", traceback.format_exc())
-            form_data_json = json.dumps(request.POST.dict())
-            return render(
-                request,
-                "screening/screening_form.html",
-                {
-                    "error": f"Terjadi kesalahan saat melakukan prediksi: {str(e)}. Silakan coba lagi atau hubungi administrator.",
-                    "form_data": form_data_json,
-                },
-            )
+    # Normalisasi label + confidence (probabilitas kelas yang diprediksi)
+    return dataset.interpret(y_pred_raw, probas, classes)
 
-    data["result"] = "Preeklampsia" if is_pree else "Non-Preeklampsia"
-    data["confidence"] = f"{conf_val:.1f}%"
-
-    # Attach user jika login
-    if request.user.is_authenticated:
-        data["user"] = request.user
-
-    # Simpan ke database
-    try:
-        submission = ScreeningSubmission.objects.create(**data)
-    except Exception:
-        logger.exception("Failed to save ScreeningSubmission")
-        form_data_json = json.dumps(request.POST.dict())
-        return render(
-            request,
-            "screening/screening_form.html",
-            {
-                "error": "Terjadi kesalahan saat menyimpan data. Silakan coba lagi.",
-                "form_data": form_data_json,
-            },
-        )
 
+def _result_context(data, submission, is_pree):
     # Rekomendasi sederhana
     recommendations = [
         "Konsultasikan ke dokter kandungan.",
@@ -472,7 +271,7 @@ def submit_screening(request):
     if is_pree:
         recommendations.insert(0, "Segera lakukan evaluasi klinis lebih lanjut.")
 
-    context = {
+    return {
         "result": data["result"],
         "confidence": data["confidence"],
         "patient_name": data.get("patient_name"),
@@ -483,69 +282,359 @@ def submit_screening(request):
         "submission_id": submission.id,
         "submission": submission,  # Tambahkan submission object untuk akses semua field
     }
-    return render(request, "screening/result.html", context)
 
 
-def result_view(request):
-    # Simple render of result page (used when visiting /result/ directly)
-    return render(request, "screening/result.html")
+def submit_screening(request):
+    with metrics.timer("submit", "total"):
+        return _submit_screening(request)
 
 
-def download_result(request):
-    from .models import ScreeningSubmission
-    from django.utils import timezone
+def _submit_screening(request):
+    from .models import ScreeningSubmission  # import lokal
 
-    submission_id = request.GET.get("submission_id") or request.POST.get("submission_id")
-    preview = request.GET.get("preview")
+    if request.method != "POST":
+        return redirect("screening")
 
-    if submission_id:
+    with metrics.timer("submit", "parse"):
+        data = _form_data(request.POST)
+
+    # Validasi minimal
+    if not data.get("patient_name") or data.get("patient_age") is None:
+        return _form_error(request, "Nama pasien dan umur wajib diisi.")
+
+    # ==============================
+    # PREDIKSI MENGGUNAKAN MODEL RF
+    # HASIL PREDIKSI HANYA BERASAL DARI: ml_models/rf_preeclampsia.joblib
+    # ==============================
+
+    # Validasi: Model HARUS tersedia untuk melakukan prediksi
+    # (menunggu warm-up background jika model masih di-load)
+    with metrics.timer("submit", "model"):
+        model = predictor.get_model(timeout=60)
+    if model is None:
+        logger.error("Model rf_preeclampsia.joblib tidak tersedia! Prediksi tidak dapat dilakukan.")
+        return _form_error(request, "Sistem prediksi sedang tidak tersedia. Silakan hubungi administrator.")
+
+    # Prediksi HANYA menggunakan model rf_preeclampsia.joblib
+    # (pipeline hasil compile / bundle mmap, atau pipeline sklearn sebagai fallback)
+    try:
+        is_pree, conf_val = _predict_submission(model, data)
+    except Exception as e:
+        # Jika terjadi error saat prediksi dengan model, log error dan return error
+        logger.error("Error during RF prediction using rf_preeclampsia.joblib: %s", e)
+        logger.error("Traceback: %s", traceback.format_exc())
+        return _form_error(
+            request,
+            f"Terjadi kesalahan saat melakukan prediksi: {str(e)}. Silakan coba lagi atau hubungi administrator.",
+        )
+
+    data.update(dataset.result_fields(is_pree, conf_val))
+    data["model_version"] = model.version
+
+    # Attach user jika login
+    if request.user.is_authenticated:
+        data["user"] = request.user
+
+    # Simpan ke database
+    try:
+        with metrics.timer("submit", "save"):
+            submission = ScreeningSubmission.objects.create(**data)
+    except Exception:
+        logger.exception("Failed to save ScreeningSubmission")
+        return _form_error(request, "Terjadi kesalahan saat menyimpan data. Silakan coba lagi.")
+
+    with metrics.timer("submit", "render"):
+        return render(request, "screening/result.html", _result_context(data, submission, is_pree))
+
+
+# ===========================
+# UPLOAD CSV MASSAL
+# ===========================
+
+@login_required
+def bulk_upload(request):
+    """
+    Upload CSV berformat ALL_FINAL.csv (separator ';', header kolom sama
+    dengan dataset training). File diproses streaming per chunk, dinilai
+    vectorized dan disimpan dengan bulk_create (lihat bulk.py).
+    """
+    from . import bulk
+
+    if request.method != "POST":
+        return render(request, "screening/bulk_upload.html")
+
+    upload = request.FILES.get("csv_file")
+    if upload is None:
+        return render(request, "screening/bulk_upload.html", {"error": "Pilih file CSV terlebih dahulu."})
+
+    conf = getattr(settings, "SCREENING_BULK_UPLOAD", {})
+    max_mb = conf.get("MAX_UPLOAD_MB")
+    if max_mb and upload.size > max_mb * 1024 * 1024:
+        return render(
+            request,
+            "screening/bulk_upload.html",
+            {"error": f"Ukuran file melebihi batas {max_mb} MB."},
+        )
+
+    model = predictor.get_model(timeout=60)
+    if model is None:
+        return render(
+            request,
+            "screening/bulk_upload.html",
+            {"error": "Sistem prediksi sedang tidak tersedia. Silakan hubungi administrator."},
+        )
+
+    # Django menyimpan upload besar di file sementara; dibaca sebagai teks
+    # secara streaming, bukan dimuat utuh ke memori.
+    fh = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        report = bulk.import_csv(
+            fh,
+            model,
+            user=request.user,
+            name_prefix=bulk.name_prefix_for(upload.name),
+            chunk_size=conf.get("CHUNK_SIZE", 500),
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        return render(request, "screening/bulk_upload.html", {"error": f"File CSV tidak valid: {e}"})
+    except Exception:
+        logger.exception("Bulk CSV upload failed")
+        return render(
+            request,
+            "screening/bulk_upload.html",
+            {"error": "Terjadi kesalahan saat memproses file. Silakan coba lagi."},
+        )
+    finally:
+        fh.detach()
+
+    return render(request, "screening/bulk_upload.html", {"report": report.as_dict(), "filename": upload.name})
+
+
+# ===========================
+# API JSON
+# ===========================
+
+_api_basic_auth_cache = None  # LocMemBackend: sha256(header Authorization) -> (user_id, hash password)
+
+
+def _basic_auth_cache():
+    """LRU kredensial Basic per proses (TTL dan jumlah entri dibatasi, lihat SCREENING_API)."""
+    global _api_basic_auth_cache
+    if _api_basic_auth_cache is None:
+        from .prediction_cache import LocMemBackend
+
+        conf = getattr(settings, "SCREENING_API", {})
+        _api_basic_auth_cache = LocMemBackend(max_entries=conf.get("BASIC_AUTH_CACHE_SIZE", 256))
+    return _api_basic_auth_cache
+
+
+def _api_json_error(message, status):
+    return JsonResponse({"error": message}, status=status)
+
+
+def _api_authenticate(request):
+    """
+    User untuk request API, atau (None, response error).
+
+    - HTTP Basic (klien server-ke-server, mis. SIMRS): tanpa CSRF. Hash
+      password mahal, jadi kredensial yang valid di-cache sebentar per proses
+      (LRU ber-TTL). Entri cache terikat ke hash password user, jadi
+      password yang diganti atau user yang dinonaktifkan langsung ditolak.
+    - Session login biasa: CSRF tetap diperiksa seperti form.
+    """
+    import base64
+    import hashlib
+
+    from django.contrib.auth import authenticate
+    from django.middleware.csrf import CsrfViewMiddleware
+
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    if header.startswith("Basic "):
+        cache = _basic_auth_cache()
+        key = hashlib.sha256(header.encode()).hexdigest()
+        cached = cache.get(key)
+        if cached is not None:
+            user = User.objects.filter(pk=cached[0], is_active=True).first()
+            if user is not None and user.password == cached[1]:
+                return user, None
         try:
-            sub = ScreeningSubmission.objects.get(id=int(submission_id))
+            username, password = base64.b64decode(header[6:]).decode("utf-8").split(":", 1)
         except Exception:
-            return HttpResponse("Submission not found", status=404)
+            return None, _api_json_error("Header Authorization tidak valid.", 401)
+        user = authenticate(request, username=username, password=password)
+        if user is None:
+            return None, _api_json_error("Username atau password salah.", 401)
+        ttl = getattr(settings, "SCREENING_API", {}).get("BASIC_AUTH_CACHE_TTL", 60)
+        cache.set(key, (user.pk, user.password), ttl)
+        return user, None
 
-        def yes_no(val):
-            if val is True or val == "True" or str(val) == "1":
-                return "Ya"
-            if val is False or val == "False" or str(val) == "0":
-                return "Tidak"
-            return "-"
+    if request.user.is_authenticated:
+        reason = CsrfViewMiddleware(lambda r: None).process_view(request, None, (), {})
+        if reason is not None:
+            return None, _api_json_error("CSRF token tidak valid.", 403)
+        return request.user, None
 
-        # Hitung IMT (sama seperti preview)
-        bmi_val = "-"
-        if sub.bmi:
-            try:
-                bmi_val = f"{float(sub.bmi):.1f}"
-            except:
-                pass
-        elif sub.pre_pregnancy_weight and sub.height_cm:
-            try:
-                bb = float(sub.pre_pregnancy_weight)
-                tb = float(sub.height_cm)
-                if tb > 0:
-                    bmi_calc = bb / ((tb / 100) ** 2)
-                    bmi_val = f"{bmi_calc:.1f}"
-            except:
-                pass
-
-        # Format tanggal sama seperti preview (toLocaleDateString("id-ID"))
-        if sub.created_at:
-            tanggal = sub.created_at.strftime("%d/%m/%Y")
+    response = _api_json_error("Autentikasi diperlukan.", 401)
+    response["WWW-Authenticate"] = 'Basic realm="screening-api"'
+    return None, response
+
+
+@csrf_exempt
+def api_predict(request):
+    """
+    POST /api/v1/predict
+
+    Body: satu object pasien, list pasien, atau {"patients": [...], "persist": true}.
+    Nama field sama dengan ScreeningSubmission (patient_age wajib). Semua
+    pasien valid dinilai dengan satu panggilan vectorized; jika persist=true
+    hasilnya juga disimpan (bulk_create). Tipe, rentang dan panjang nilai
+    dicek per pasien (dataset.submission_from_mapping): pasien yang tidak
+    valid dilaporkan di `errors` dan tidak dinilai maupun disimpan.
+
+    Response: {"model_version", "results": [{"index", "label", "result",
+    "probability", "confidence", "id"?}], "errors": [{"index", "error"}]}
+    """
+    from .models import ScreeningSubmission
+
+    if request.method != "POST":
+        return _api_json_error("Gunakan method POST.", 405)
+
+    user, error = _api_authenticate(request)
+    if error is not None:
+        return error
+
+    try:
+        payload = json.loads(request.body or b"null")
+    except ValueError:
+        return _api_json_error("Body bukan JSON yang valid.", 400)
+
+    persist = request.GET.get("persist", "").lower() in ("1", "true", "yes")
+    if isinstance(payload, dict) and "patients" in payload:
+        persist = persist or bool(payload.get("persist"))
+        payload = payload["patients"]
+    patients = payload if isinstance(payload, list) else [payload]
+
+    conf = getattr(settings, "SCREENING_API", {})
+    max_batch = conf.get("MAX_BATCH_SIZE", 1000)
+    if not patients:
+        return _api_json_error("Tidak ada data pasien.", 400)
+    if len(patients) > max_batch:
+        return _api_json_error(f"Maksimal {max_batch} pasien per request.", 413)
+
+    datas, indexes, errors = [], [], []
+    for i, obj in enumerate(patients):
+        try:
+            data = dataset.submission_from_mapping(obj)
+        except ValueError as e:
+            errors.append({"index": i, "error": str(e)})
+            continue
+        if persist and not data["patient_name"]:
+            errors.append({"index": i, "error": "patient_name wajib diisi jika persist=true"})
+            continue
+        datas.append(data)
+        indexes.append(i)
+    if not datas:
+        return JsonResponse({"results": [], "errors": errors}, status=400)
+
+    model = predictor.get_model(timeout=60)
+    if model is None:
+        return _api_json_error("Sistem prediksi sedang tidak tersedia.", 503)
+
+    try:
+        rows = [dataset.feature_row(d) for d in datas]
+        if len(rows) == 1 and model.engine is not None:
+            # Satu pasien: lewat cache prediksi + micro-batcher seperti form
+            label, proba_row = predictor.predict_encoded(model, model.encoder.transform_row(rows[0]))
+            labels, proba = [label], [proba_row]
         else:
-            tanggal = timezone.now().strftime("%d/%m/%Y")
-        
-        # Format prediksi (sama seperti preview)
+            labels, proba = predictor.predict_rows(model, rows)
+    except Exception as e:
+        logger.exception("API prediction failed (%d patients)", len(datas))
+        return _api_json_error(f"Terjadi kesalahan saat melakukan prediksi: {e}", 500)
+
+    classes = model.classes
+    idx_pree = dataset.preeclampsia_index(classes)
+    results = []
+    for i, data in enumerate(datas):
+        is_pree, conf_val = dataset.interpret(labels[i], proba[i], classes)
+        data.update(dataset.result_fields(is_pree, conf_val))
+        data["model_version"] = model.version
+        results.append({
+            "index": indexes[i],
+            "label": "Preeklampsia" if is_pree else "NonPreeklampsia",
+            "result": data["result"],
+            "probability": float(proba[i][idx_pree]) if idx_pree is not None else None,
+            "confidence": round(conf_val, 1),
+        })
+
+    if persist:
+        try:
+            with transaction.atomic():
+                objs = ScreeningSubmission.objects.bulk_create(
+                    [ScreeningSubmission(user=user, **data) for data in datas]
+                )
+                stats.record_created(objs)
+        except Exception:
+            logger.exception("Failed to save API submissions")
+            return _api_json_error("Terjadi kesalahan saat menyimpan data.", 500)
+        for result, obj in zip(results, objs):
+            result["id"] = obj.pk
+
+    return JsonResponse({"model_version": model.version, "results": results, "errors": errors})
+
+
+def result_view(request):
+    # Simple render of result page (used when visiting /result/ directly)
+    return render(request, "screening/result.html")
+
+
+def _report_html(sub):
+    """HTML laporan hasil prediksi (format sama dengan preview di result.html)."""
+    def yes_no(val):
+        if val is True or val == "True" or str(val) == "1":
+            return "Ya"
+        if val is False or val == "False" or str(val) == "0":
+            return "Tidak"
+        return "-"
+
+    # Hitung IMT (sama seperti preview)
+    bmi_val = "-"
+    if sub.bmi:
+        try:
+            bmi_val = f"{float(sub.bmi):.1f}"
+        except:
+            pass
+    elif sub.pre_pregnancy_weight and sub.height_cm:
+        try:
+            bb = float(sub.pre_pregnancy_weight)
+            tb = float(sub.height_cm)
+            if tb > 0:
+                bmi_calc = bb / ((tb / 100) ** 2)
+                bmi_val = f"{bmi_calc:.1f}"
+        except:
+            pass
+
+    # Format tanggal sama seperti preview (toLocaleDateString("id-ID"))
+    if sub.created_at:
+        tanggal = sub.created_at.strftime("%d/%m/%Y")
+    else:
+        tanggal = timezone.now().strftime("%d/%m/%Y")
+    
+    # Format prediksi (sama seperti preview)
+    if sub.is_preeclampsia is not None:
+        is_pree = sub.is_preeclampsia
+    else:
         result_lower = (sub.result or "").lower().replace("-", "").replace(" ", "")
         is_pree = result_lower in ("preeklampsia", "preeclampsia")
-        prediksi_text = "PREEKLAMPSIA" if is_pree else "NON-PREEKLAMPSIA"
-        
-        # Format confidence (pastikan ada % jika belum ada)
-        confidence_text = sub.confidence or "-"
-        if confidence_text != "-" and "%" not in str(confidence_text):
-            confidence_text = f"{confidence_text}%"
-
-        # Buat HTML dengan format yang sama persis seperti preview
-        html_content = f"""
+    prediksi_text = "PREEKLAMPSIA" if is_pree else "NON-PREEKLAMPSIA"
+    
+    # Format confidence (pastikan ada % jika belum ada)
+    confidence_text = sub.confidence or "-"
+    if confidence_text != "-" and "%" not in str(confidence_text):
+        confidence_text = f"{confidence_text}%"
+
+    # Buat HTML dengan format yang sama persis seperti preview
+    html_content = f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -634,36 +723,27 @@ def download_result(request):
     </p>
 </body>
 </html>
-        """
+    """
+    return html_content
 
-        # Try to convert HTML to PDF using xhtml2pdf
-        try:
-            from xhtml2pdf import pisa
-            
-            buffer = io.BytesIO()
-            pisa_status = pisa.CreatePDF(html_content, dest=buffer, encoding='utf-8')
-            
-            if pisa_status.err:
-                # Jika xhtml2pdf gagal, return HTML untuk preview/print
-                response = HttpResponse(html_content, content_type="text/html")
-                if preview:
-                    return response
-                response["Content-Disposition"] = f'inline; filename="report_{sub.id}.html"'
-                return response
-            
-            buffer.seek(0)
-            response = HttpResponse(buffer.getvalue(), content_type="application/pdf")
-            disp_type = "inline" if preview else "attachment"
-            response["Content-Disposition"] = f'{disp_type}; filename="report_{sub.id}.pdf"'
-            return response
-        except ImportError:
-            # Jika xhtml2pdf tidak terpasang, return HTML untuk preview/print
-            response = HttpResponse(html_content, content_type="text/html")
-            if preview:
-                return response
-            response["Content-Disposition"] = f'inline; filename="report_{sub.id}.html"'
+
+def _report_response(sub, html_content, pdf, preview):
+    metrics.observe_report("html" if pdf is None else "pdf", len(pdf if pdf is not None else html_content.encode()))
+    if pdf is None:
+        # Jika xhtml2pdf gagal / tidak terpasang, return HTML untuk preview/print
+        response = HttpResponse(html_content, content_type="text/html")
+        if preview:
             return response
+        response["Content-Disposition"] = f'inline; filename="report_{sub.id}.html"'
+        return response
 
+    response = HttpResponse(pdf, content_type="application/pdf")
+    disp_type = "inline" if preview else "attachment"
+    response["Content-Disposition"] = f'{disp_type}; filename="report_{sub.id}.pdf"'
+    return response
+
+
+def _report_fallback():
     # fallback tanpa submission_id
     content = "Laporan prediksi sederhana\nGunakan fitur ini untuk men-generate laporan nyata.\n"
     response = HttpResponse(content, content_type="text/plain")
@@ -671,28 +751,239 @@ def download_result(request):
     return response
 
 
+def download_result(request):
+    from .models import ScreeningSubmission
+
+    submission_id = request.GET.get("submission_id") or request.POST.get("submission_id")
+    preview = request.GET.get("preview")
+
+    if submission_id:
+        try:
+            with metrics.timer("download", "fetch"):
+                sub = ScreeningSubmission.objects.get(id=int(submission_id))
+        except Exception:
+            return HttpResponse("Submission not found", status=404)
+
+        with metrics.timer("download", "html"):
+            html_content = _report_html(sub)
+        with metrics.timer("download", "pdf"):
+            pdf = render_pdf(html_content)
+        return _report_response(sub, html_content, pdf, preview)
+
+    return _report_fallback()
+
+
 @login_required
 def my_submissions(request):
-    from .models import ScreeningSubmission
+    # Baris dimuat bertahap oleh app.js dari submissions_page (scope=mine)
+    return render(request, "screening/my_submissions.html")
+
 
-    subs = ScreeningSubmission.objects.filter(user=request.user).order_by("-created_at")
-    return render(request, "screening/my_submissions.html", {"submissions": subs})
+def _dashboard_context():
+    # Total dari rollup harian (stats.py): beberapa baris pre-agregasi,
+    # bukan scan tabel submission. Tabel riwayat dimuat bertahap oleh app.js
+    # dari submissions_page (scope=all).
+    return {
+        **stats.totals(),
+        "total_users": User.objects.count(),
+        "districts": stats.districts(),
+    }
 
 
 def admin_dashboard(request):
+    with metrics.timer("dashboard", "total"):
+        return render(request, "screening/dashboard.html", _dashboard_context())
+
+
+@user_passes_test(lambda u: u.is_staff or u.is_superuser, login_url="admin_login")
+def dashboard_stats(request):
+    """
+    Deret waktu harian untuk grafik dashboard, dari rollup stats.py.
+    Query: days (1-366, default 30), district (opsional).
+    """
+    try:
+        days = min(max(int(request.GET.get("days", 30)), 1), 366)
+    except ValueError:
+        return JsonResponse({"error": "days harus berupa angka"}, status=400)
+    district = request.GET.get("district") or None
+    return JsonResponse({
+        "days": days,
+        "district": district,
+        "totals": stats.totals(),
+        "series": stats.daily_series(days=days, district=district),
+        "districts": stats.districts(),
+    })
+
+
+# ==============
+# RIWAYAT SUBMISSION (KEYSET PAGINATION)
+# ==============
+
+SUBMISSIONS_PAGE_LIMIT = 50
+SUBMISSIONS_PAGE_MAX_LIMIT = 200
+
+# Kolom yang ditampilkan per scope; query memakai .only() kolom ini saja
+SUBMISSION_LIST_FIELDS = {
+    "all": ["id", "created_at", "patient_name"] + [field for _, field, _ in dataset.CSV_COLUMNS] + ["result", "confidence"],
+    "mine": ["id", "created_at", "patient_name", "patient_age", "result", "confidence"],
+}
+
+
+def _encode_cursor(sub):
+    import base64
+
+    raw = json.dumps([sub.created_at.isoformat(), sub.pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(value):
+    """(created_at, id) dari cursor; ValueError jika tidak valid."""
+    import base64
+    from datetime import datetime
+
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        created_at, pk = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(pk)
+    except Exception:
+        raise ValueError("cursor tidak valid")
+
+
+def _filter_submissions(qs, params):
+    """
+    Filter server-side: result, district, date_from, date_to (lihat
+    export.filter_submissions) dan q (nama pasien / kabupaten / user, lewat
+    index pencarian search.py).
+    """
+    qs = export.filter_submissions(
+        qs,
+        date_from=params.get("date_from"),
+        date_to=params.get("date_to"),
+        district=params.get("district"),
+        result=params.get("result"),
+    )
+    return search.search_submissions(qs, params.get("q"))
+
+
+def _submission_row(sub, fields, with_email):
+    row = {field: getattr(sub, field) for field in fields}
+    row["created_at"] = timezone.localtime(sub.created_at).strftime("%Y-%m-%d %H:%M")
+    if with_email:
+        row["email"] = sub.user.email if sub.user is not None else None
+    return row
+
+
+def submissions_page(request):
+    """
+    GET /api/v1/submissions
+
+    Riwayat submission urut terbaru dengan keyset pagination pada
+    (created_at, id): halaman berikutnya diminta dengan `cursor` dari
+    `next_cursor`, jadi biaya per halaman tetap walau tabel besar (tanpa
+    OFFSET). Query: scope (mine / all, all hanya untuk staff), limit
+    (default 50, maks 200), cursor, result, district, date_from, date_to, q.
+    """
+    from django.db.models import Q
+
     from .models import ScreeningSubmission
 
-    total_predictions = ScreeningSubmission.objects.count()
-    # Hitung persis sesuai label yang disimpan aplikasi
-    preeclampsia_count = ScreeningSubmission.objects.filter(result__iexact="Preeklampsia").count()
-    non_preeclampsia_count = ScreeningSubmission.objects.filter(result__iexact="Non-Preeklampsia").count()
-    submissions = ScreeningSubmission.objects.select_related("user").order_by("-created_at")[:200]
+    user, error = _api_authenticate(request)
+    if error is not None:
+        return error
+    scope = request.GET.get("scope", "mine")
+    if scope not in SUBMISSION_LIST_FIELDS:
+        return _api_json_error("scope harus mine atau all", 400)
+    if scope == "all" and not (user.is_staff or user.is_superuser):
+        return _api_json_error("scope=all hanya untuk admin", 403)
+    try:
+        limit = min(max(int(request.GET.get("limit", SUBMISSIONS_PAGE_LIMIT)), 1), SUBMISSIONS_PAGE_MAX_LIMIT)
+    except ValueError:
+        return _api_json_error("limit harus berupa angka", 400)
+
+    fields = SUBMISSION_LIST_FIELDS[scope]
+    qs = ScreeningSubmission.objects.order_by("-created_at", "-id")
+    if scope == "mine":
+        qs = qs.filter(user=user).only(*fields)
+    else:
+        qs = qs.select_related("user").only(*fields, "user__email")
+    try:
+        qs = _filter_submissions(qs, request.GET)
+        if request.GET.get("cursor"):
+            created_at, pk = _decode_cursor(request.GET["cursor"])
+            # created_at__lte redundan secara logika, tapi memberi batas range
+            # ke planner sehingga index di-seek langsung ke posisi cursor
+            # (tanpa itu SQLite men-scan index dari awal untuk predikat OR)
+            qs = qs.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk), created_at__lte=created_at
+            )
+    except ValueError as e:
+        return _api_json_error(str(e), 400)
 
-    context = {
-        "total_predictions": total_predictions,
-        "preeclampsia_count": preeclampsia_count,
-        "non_preeclampsia_count": non_preeclampsia_count,
-        "total_users": User.objects.count(),
-        "submissions": submissions,
-    }
-    return render(request, "screening/dashboard.html", context)
+    subs = list(qs[:limit + 1])
+    has_more = len(subs) > limit
+    subs = subs[:limit]
+    return JsonResponse({
+        "results": [_submission_row(sub, fields, with_email=(scope == "all")) for sub in subs],
+        "next_cursor": _encode_cursor(subs[-1]) if has_more else None,
+    })
+
+
+@user_passes_test(lambda u: u.is_staff or u.is_superuser, login_url="admin_login")
+def export_submissions(request):
+    """
+    GET /dashboard/export: semua submission (streaming, memori tetap) dalam
+    layout ALL_FINAL.csv. Query: format (csv / parquet), date_from, date_to,
+    district, result.
+    """
+    fmt = request.GET.get("format", "csv")
+    if fmt not in export.FORMATS:
+        return _api_json_error(f"format harus salah satu dari: {', '.join(export.FORMATS)}", 400)
+    try:
+        qs = export.export_queryset(
+            date_from=request.GET.get("date_from"),
+            date_to=request.GET.get("date_to"),
+            district=request.GET.get("district"),
+            result=request.GET.get("result"),
+        )
+        return export.streaming_response(qs, fmt)
+    except ValueError as e:
+        return _api_json_error(str(e), 400)
+    except ImportError:
+        return _api_json_error("Export parquet butuh pyarrow (pip install pyarrow)", 501)
+
+
+@user_passes_test(lambda u: u.is_staff or u.is_superuser, login_url="admin_login")
+def inference_stats(request):
+    """Metrik micro-batching (ukuran batch, waktu tunggu antrean) dan cache prediksi untuk tuning."""
+    model = predictor.get_model(timeout=0)
+    cache = predictor.prediction_cache()
+    engine = None
+    if model is not None:
+        engine = "compiled" if model.engine is not None else "sklearn"
+    return JsonResponse({
+        "engine": engine,
+        "storage": model.storage if model is not None else None,
+        "batching": model.batcher.stats() if model is not None and model.batcher is not None else None,
+        "prediction_cache": cache.stats() if cache is not None else None,
+    })
+
+
+def metrics_view(request):
+    """
+    Metrik per-proses dalam format teks Prometheus. Boleh diakses dari IP di
+    SCREENING_METRICS['ALLOWED_IPS'] (scraper) atau oleh staff yang login.
+    """
+    conf = getattr(settings, "SCREENING_METRICS", {})
+    allowed = request.META.get("REMOTE_ADDR") in conf.get("ALLOWED_IPS", ())
+    if not allowed and not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def healthz_ready(request):
+    """
+    Readiness probe untuk load balancer: 200 jika model sudah di-load dan
+    warm-up selesai, 503 jika belum (atau gagal).
+    """
+    status = predictor.readiness()
+    return JsonResponse(status, status=200 if status["ready"] else 503)
@@ -0,0 +1,137 @@
+"""
+View async untuk deployment ASGI (website/asgi.py, mis. uvicorn/daphne).
+
+Versi async dari `submit_screening`, `download_result` dan `admin_dashboard`.
+Logika form, prediksi dan laporan tetap di views.py; di sini hanya cara
+menjalankannya yang berbeda:
+
+- inferensi RF dan render PDF (CPU-bound) dijalankan di executor yang
+  ukurannya dibatasi (SCREENING_ASYNC_VIEWS), bukan di event loop;
+- akses database lewat ORM async / `sync_to_async`;
+- render template lewat `sync_to_async`, karena context processor
+  (user, messages) bisa membaca session dari database.
+
+Dengan begitu satu worker ASGI tetap bisa melayani banyak koneksi lambat
+dari klinik selama sebagian request menunggu PDF atau database.
+URL memakai view ini jika SCREENING_ASYNC_VIEWS['ENABLED'] aktif.
+"""
+import asyncio
+import logging
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.shortcuts import redirect, render
+
+from . import dataset, metrics, predictor, views
+from .pdf_render import render_pdf
+
+logger = logging.getLogger(__name__)
+
+_render = sync_to_async(render)
+_form_error = sync_to_async(views._form_error)
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _executor(kind):
+    """Executor terbatas per jenis pekerjaan ("inference" / "pdf"), dibuat sekali per proses."""
+    conf = getattr(settings, "SCREENING_ASYNC_VIEWS", {})
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            if kind == "pdf" and conf.get("PDF_EXECUTOR") == "process":
+                executor = ProcessPoolExecutor(max_workers=conf.get("PDF_WORKERS", 2))
+            else:
+                workers = conf.get("INFERENCE_WORKERS", 4) if kind == "inference" else conf.get("PDF_WORKERS", 2)
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"screening-{kind}")
+            _executors[kind] = executor
+    return executor
+
+
+async def _offload(kind, fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor(kind), fn, *args)
+
+
+async def submit_screening(request):
+    with metrics.timer("submit", "total"):
+        return await _submit_screening(request)
+
+
+async def _submit_screening(request):
+    from .models import ScreeningSubmission
+
+    if request.method != "POST":
+        return redirect("screening")
+
+    with metrics.timer("submit", "parse"):
+        data = views._form_data(request.POST)
+    if not data.get("patient_name") or data.get("patient_age") is None:
+        return await _form_error(request, "Nama pasien dan umur wajib diisi.")
+
+    # get_model bisa menunggu load/warm-up, jadi ikut dijalankan di executor
+    with metrics.timer("submit", "model"):
+        model = await _offload("inference", predictor.get_model, 60)
+    if model is None:
+        logger.error("Model rf_preeclampsia.joblib tidak tersedia! Prediksi tidak dapat dilakukan.")
+        return await _form_error(request, "Sistem prediksi sedang tidak tersedia. Silakan hubungi administrator.")
+
+    try:
+        is_pree, conf_val = await _offload("inference", views._predict_submission, model, data)
+    except Exception as e:
+        logger.error("Error during RF prediction using rf_preeclampsia.joblib: %s", e)
+        logger.error("Traceback: %s", traceback.format_exc())
+        return await _form_error(
+            request,
+            f"Terjadi kesalahan saat melakukan prediksi: {str(e)}. Silakan coba lagi atau hubungi administrator.",
+        )
+
+    data.update(dataset.result_fields(is_pree, conf_val))
+    data["model_version"] = model.version
+
+    user = await request.auser()
+    if user.is_authenticated:
+        data["user"] = user
+
+    try:
+        with metrics.timer("submit", "save"):
+            submission = await ScreeningSubmission.objects.acreate(**data)
+    except Exception:
+        logger.exception("Failed to save ScreeningSubmission")
+        return await _form_error(request, "Terjadi kesalahan saat menyimpan data. Silakan coba lagi.")
+
+    with metrics.timer("submit", "render"):
+        return await _render(request, "screening/result.html", views._result_context(data, submission, is_pree))
+
+
+async def download_result(request):
+    from .models import ScreeningSubmission
+
+    submission_id = request.GET.get("submission_id") or request.POST.get("submission_id")
+    preview = request.GET.get("preview")
+
+    if not submission_id:
+        return views._report_fallback()
+
+    try:
+        with metrics.timer("download", "fetch"):
+            sub = await ScreeningSubmission.objects.aget(id=int(submission_id))
+    except Exception:
+        return HttpResponse("Submission not found", status=404)
+
+    with metrics.timer("download", "html"):
+        html_content = views._report_html(sub)
+    with metrics.timer("download", "pdf"):
+        pdf = await _offload("pdf", render_pdf, html_content)
+    return views._report_response(sub, html_content, pdf, preview)
+
+
+async def admin_dashboard(request):
+    with metrics.timer("dashboard", "total"):
+        context = await sync_to_async(views._dashboard_context)()
+        return await _render(request, "screening/dashboard.html", context)
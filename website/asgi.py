@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'website.settings')
 
 application = get_asgi_application()
+
+# Load + warm-up model prediksi di background, supaya request pertama tidak
+# membayar biaya load model (lihat screening/predictor.py dan /healthz/ready).
+from screening import predictor  # noqa: E402
+
+predictor.start_background_warmup()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -122,3 +123,135 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Screening: micro-batching of RF inference (see screening/batching.py).
+# Concurrent /submit/ requests arriving within WINDOW_MS are scored together
+# in one vectorized call, up to MAX_BATCH_SIZE rows per batch.
+
+SCREENING_BATCHING = {
+    'ENABLED': True,
+    'WINDOW_MS': 2,
+    'MAX_BATCH_SIZE': 32,
+}
+
+# Screening: thread budget for RF inference (see screening/inference.py).
+# Single-row predictions always run serially. Batch and re-scoring calls use
+# up to BATCH_N_JOBS threads (-1 = all cores), capped at HOST_MAX_THREADS
+# (default: CPU count) divided by WORKERS (default: $WEB_CONCURRENCY or 1).
+
+SCREENING_INFERENCE_THREADS = {
+    'BATCH_N_JOBS': -1,
+    'HOST_MAX_THREADS': None,
+    'WORKERS': None,
+    'MIN_ROWS_PER_JOB': 256,
+}
+
+# Screening: model storage (see screening/model_bundle.py).
+# With MMAP_BUNDLE the compiled forest is loaded from <model>.bundle/ via
+# mmap, so all workers on a host share one read-only copy of the arrays.
+# AUTO_BUILD writes the bundle on first load when it is missing or stale;
+# it can also be built with `manage.py build_model_bundle`.
+
+SCREENING_MODEL_STORAGE = {
+    'MMAP_BUNDLE': True,
+    'AUTO_BUILD': True,
+}
+
+# Screening: background model warm-up (see screening/predictor.py).
+# The WSGI/ASGI entry points load the model in a background thread and run
+# ROWS synthetic predictions from ALL_FINAL.csv; /healthz/ready returns 200
+# only once this has finished. A failed load is retried with exponential
+# backoff (RETRY_SECONDS doubling up to RETRY_MAX_SECONDS), or as soon as the
+# registry manifest changes.
+
+SCREENING_WARMUP = {
+    'ENABLED': True,
+    'ROWS': 8,
+    'RETRY_SECONDS': 5,
+    'RETRY_MAX_SECONDS': 300,
+}
+
+# Screening: versioned model registry (see screening/registry.py).
+# Workers check the manifest at most every POLL_SECONDS and hot-swap to a
+# newly activated version after loading and warming it up in the background.
+
+SCREENING_MODEL_REGISTRY = {
+    'MANIFEST': BASE_DIR / 'screening' / 'ml_models' / 'registry.json',
+    'POLL_SECONDS': 10,
+}
+
+# Screening: prediction result cache (see screening/prediction_cache.py).
+# BACKEND 'locmem' keeps an LRU per worker process; 'django' stores entries
+# in CACHES[CACHE_ALIAS] so identical re-submissions hit across workers.
+# Keys include the active model version, so a model swap invalidates them.
+
+SCREENING_PREDICTION_CACHE = {
+    'ENABLED': True,
+    'BACKEND': 'locmem',
+    'MAX_ENTRIES': 4096,
+    'TTL_SECONDS': 3600,
+    'CACHE_ALIAS': 'default',
+}
+
+# Screening: bulk CSV upload (see screening/bulk.py). Files are parsed,
+# scored and saved CHUNK_SIZE rows at a time, so memory stays bounded
+# regardless of file size.
+
+SCREENING_BULK_UPLOAD = {
+    'CHUNK_SIZE': 500,
+    'MAX_UPLOAD_MB': 50,
+}
+
+# Screening: submission export (see screening/export.py). Rows are streamed
+# CHUNK_SIZE at a time as CSV (ALL_FINAL.csv layout) or Parquet (needs
+# pyarrow), so memory stays constant regardless of how many rows are exported.
+
+SCREENING_EXPORT = {
+    'CHUNK_SIZE': 2000,
+    'PARQUET_COMPRESSION': 'zstd',
+}
+
+# Screening: submission search index (see screening/search.py). 'auto' uses
+# SQLite FTS5 (trigram) or PostgreSQL pg_trgm indexes; 'none' falls back to
+# plain icontains lookups. Terms matching more than MAX_INDEX_MATCHES rows in
+# the FTS5 index use an ordered icontains scan instead, which finds a page of
+# such common matches faster than sorting every hit.
+
+SCREENING_SEARCH = {
+    'BACKEND': 'auto',  # 'auto' | 'fts5' | 'pg_trgm' | 'none'
+    'MAX_INDEX_MATCHES': 5000,
+}
+
+# Screening: JSON prediction API (/api/v1/predict). Clients authenticate
+# with HTTP Basic or a logged-in session (CSRF checked); all patients in a
+# request are scored in one vectorized call.
+
+SCREENING_API = {
+    'MAX_BATCH_SIZE': 1000,
+    # Per-process LRU of verified HTTP Basic credentials (entries, TTL seconds);
+    # entries are tied to the password hash, so a changed password is refused
+    # immediately.
+    'BASIC_AUTH_CACHE_SIZE': 256,
+    'BASIC_AUTH_CACHE_TTL': 60,
+}
+
+# Screening: async views for ASGI deployments (see screening/views_async.py).
+# Enable with SCREENING_ASYNC_VIEWS=1 when serving website.asgi:application;
+# inference and PDF rendering then run in bounded executors off the event loop.
+
+SCREENING_ASYNC_VIEWS = {
+    'ENABLED': os.environ.get('SCREENING_ASYNC_VIEWS', '') == '1',
+    'INFERENCE_WORKERS': 4,
+    'PDF_WORKERS': 2,
+    'PDF_EXECUTOR': 'thread',  # 'thread' | 'process'
+}
+
+# Screening: per-process latency histograms exposed at /metrics in the
+# Prometheus text format (see screening/metrics.py). Scrapers must connect
+# from ALLOWED_IPS; logged-in staff can also view it.
+
+SCREENING_METRICS = {
+    'ENABLED': True,
+    'ALLOWED_IPS': ['127.0.0.1', '::1'],
+}